@@ -7,12 +7,13 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import os
 from dotenv import load_dotenv
+from app.utils.session import RoutingSession
 
 # Load environment variables
 load_dotenv()
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
 socketio = SocketIO()
@@ -32,11 +33,6 @@ logging.basicConfig(
 )
 
 def create_app(config_class=None):
-    import datetime
-    import json
-    from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding
-
     app = Flask(__name__)
     
     # Load configuration
@@ -45,13 +41,54 @@ def create_app(config_class=None):
     else:
         app.config.from_object(config_class)
     
+    # Reports and exports read through their own engine: a replica if one is
+    # configured, otherwise a separate read-only pool on the primary database.
+    # An in-memory primary cannot be opened twice, so reads then stay on it.
+    from app.utils.session import READ_ONLY_BIND
+    from app.utils.sqlite import is_memory_database
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    reports_url = app.config.get('REPORTS_DATABASE_URL') or app.config['SQLALCHEMY_DATABASE_URI']
+    if not is_memory_database(reports_url):
+        binds.setdefault(READ_ONLY_BIND, reports_url)
+    app.config['SQLALCHEMY_BINDS'] = binds
+    
     # Initialize extensions with app
     db.init_app(app)
+    
+    # Apply the SQLite connection profile (journal mode, fsync level, busy timeout, caches)
+    from app.config import SQLITE_PROFILES
+    from app.utils.sqlite import configure_sqlite_engine
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if pragmas is None:
+        profile = app.config.get('SQLITE_PROFILE', 'default')
+        if profile not in SQLITE_PROFILES:
+            raise ValueError(f"Unknown SQLITE_PROFILE '{profile}', expected one of: {', '.join(SQLITE_PROFILES)}")
+        pragmas = SQLITE_PROFILES[profile]
+    with app.app_context():
+        configure_sqlite_engine(db.engine, pragmas)
+        if READ_ONLY_BIND in db.engines:
+            configure_sqlite_engine(db.engines[READ_ONLY_BIND], dict(pragmas, query_only='ON'))
+    
     migrate.init_app(app, db)
     login_manager.init_app(app)
     socketio.init_app(app, async_mode='threading')
     limiter.init_app(app)
     
+    from app.services.writer import write_queue
+    write_queue.init_app(app)
+    
+    from app.services.jobs import job_runner
+    job_runner.init_app(app)
+    
+    from app.services.webhooks import webhook_processor
+    webhook_processor.init_app(app)
+    
+    from app.services.platform_client import platform_clients
+    platform_clients.init_app(app)
+    
+    from app.services.status_sync import status_dispatcher
+    status_dispatcher.init_app(app)
+    
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
     
@@ -64,6 +101,7 @@ def create_app(config_class=None):
     from app.controllers.order import order_bp
     from app.controllers.billing import billing_bp
     from app.controllers.delivery import delivery_bp
+    from app.controllers.jobs import jobs_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(admin_bp)
@@ -73,6 +111,11 @@ def create_app(config_class=None):
     app.register_blueprint(order_bp)
     app.register_blueprint(billing_bp)
     app.register_blueprint(delivery_bp)
+    app.register_blueprint(jobs_bp)
+    
+    # Register CLI commands
+    from app.commands import rollups_cli
+    app.cli.add_command(rollups_cli)
     
     # Add root route
     @app.route('/')
@@ -88,55 +131,7 @@ def create_app(config_class=None):
     # ✅ Add license info context processor
     @app.context_processor
     def inject_license_info():
-        license_days_left = None
-        license_expiry_date = None
-        license_error = None
-        license_path = None
-
-        try:
-            # Automatically find license_*.lic file
-            for f in os.listdir('.'):
-                if f.startswith('license_') and f.endswith('.lic'):
-                    license_path = f
-                    break
-
-            if not license_path:
-                license_error = "License file not found."
-            else:
-                with open(license_path, 'r') as lic_file:
-                    license_data = json.load(lic_file)
-
-                with open('public.pem', 'rb') as key_file:
-                    public_key = serialization.load_pem_public_key(key_file.read())
-
-                license_json = json.dumps(license_data["license"], separators=(',', ':')).encode()
-                signature = bytes.fromhex(license_data["signature"])
-
-                # Verify signature
-                public_key.verify(
-                    signature,
-                    license_json,
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=padding.PSS.MAX_LENGTH,
-                    ),
-                    hashes.SHA256()
-                )
-
-                expiry_date = datetime.datetime.strptime(license_data["license"]["expiry_date"], "%Y-%m-%d").date()
-                license_expiry_date = expiry_date.strftime("%Y-%m-%d")
-                days_left = (expiry_date - datetime.date.today()).days
-                license_days_left = days_left
-
-                if days_left < 0:
-                    license_error = "License expired."
-        except Exception as e:
-            license_error = f"License verification failed: {str(e)}"
-
-        return dict(
-            license_days_left=license_days_left,
-            license_expiry_date=license_expiry_date,
-            license_error=license_error
-        )
+        from app.utils.license import get_license_info
+        return get_license_info()
 
     return app
@@ -0,0 +1,29 @@
+from flask.cli import AppGroup
+from app import db
+from datetime import datetime
+import click
+
+rollups_cli = AppGroup('rollups', help='Maintain the pre-aggregated report tables.')
+
+
+def parse_date(ctx, param, value):
+    """Click callback parsing an optional YYYY-MM-DD option."""
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise click.BadParameter('expected YYYY-MM-DD')
+
+
+@rollups_cli.command('rebuild')
+@click.option('--start', callback=parse_date, help='First day to rebuild (YYYY-MM-DD), default all history.')
+@click.option('--end', callback=parse_date, help='Last day to rebuild (YYYY-MM-DD), default all history.')
+def rebuild(start, end):
+    """Recompute the sales rollups from bills and orders."""
+    from app.models.sales import DailySales, ItemSales
+    
+    DailySales.rebuild(start, end)
+    ItemSales.rebuild(start, end)
+    db.session.commit()
+    click.echo(f"Rebuilt daily and item sales for {start or 'the beginning'} to {end or 'today'}")
@@ -3,6 +3,31 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# PRAGMA profiles applied to every new SQLite connection (ignored for other databases)
+SQLITE_PROFILES = {
+    # SQLite's own defaults: rollback journal, full fsync on every commit
+    'default': {},
+    # Concurrent readers alongside one writer, fsync only at checkpoints
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -20000,  # KiB, i.e. ~20 MB of page cache per connection
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,
+    },
+    # WAL, but fsync on every commit so power loss never drops a paid bill
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 10000,
+        'cache_size': -20000,
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,
+    },
+}
+
+
 class Config:
     """Base configuration class."""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_key_for_development')
@@ -10,6 +35,56 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///restaurant_pos.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # SQLite connection profile, one of SQLITE_PROFILES
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'wal')
+    # Explicit PRAGMAs, overriding the profile entirely when set
+    SQLITE_PRAGMAS = None
+    
+    # Hand order, billing and webhook writes to a single writer thread that
+    # groups them into shared commits (see app/services/writer.py)
+    WRITE_QUEUE_ENABLED = os.environ.get('WRITE_QUEUE_ENABLED', 'false').lower() == 'true'
+    WRITE_QUEUE_MAX_BATCH = int(os.environ.get('WRITE_QUEUE_MAX_BATCH', '32'))
+    WRITE_QUEUE_TIMEOUT = float(os.environ.get('WRITE_QUEUE_TIMEOUT', '30'))  # Seconds a job may wait before it is cancelled
+    
+    # Database that reports and exports read from, e.g. a replica. Defaults to
+    # the primary database opened with PRAGMA query_only on SQLite.
+    REPORTS_DATABASE_URL = os.environ.get('REPORTS_DATABASE_URL')
+    
+    # Background jobs (large exports); results are kept in JOBS_RESULT_DIR,
+    # instance/exports by default
+    JOBS_MAX_WORKERS = int(os.environ.get('JOBS_MAX_WORKERS', '2'))
+    JOBS_RESULT_DIR = os.environ.get('JOBS_RESULT_DIR')
+    JOBS_RETENTION_DAYS = int(os.environ.get('JOBS_RETENTION_DAYS', '7'))
+    JOBS_STALE_AFTER = int(os.environ.get('JOBS_STALE_AFTER', '900'))  # Seconds without progress
+    
+    # Delivery webhooks are stored and answered with 202, then processed by
+    # WEBHOOK_WORKERS threads (see app/services/webhooks.py)
+    WEBHOOK_RATE_LIMIT = os.environ.get('WEBHOOK_RATE_LIMIT', '600 per minute')
+    WEBHOOK_WORKERS = int(os.environ.get('WEBHOOK_WORKERS', '2'))
+    WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS', '5'))
+    WEBHOOK_RETRY_INTERVAL = int(os.environ.get('WEBHOOK_RETRY_INTERVAL', '30'))  # Seconds
+    
+    # Delivery platform APIs (see app/services/platform_client.py): pooled
+    # keep-alive connections per platform, retries with jittered backoff, and
+    # a circuit that stops calling a platform after repeated failures
+    ZOMATO_API_URL = os.environ.get('ZOMATO_API_URL', 'https://api.zomato.com/api/v1.1')
+    SWIGGY_API_URL = os.environ.get('SWIGGY_API_URL', 'https://partner-api.swiggy.com/v1')
+    PLATFORM_HTTP_POOL_SIZE = int(os.environ.get('PLATFORM_HTTP_POOL_SIZE', '10'))
+    PLATFORM_HTTP_TIMEOUT = float(os.environ.get('PLATFORM_HTTP_TIMEOUT', '10'))  # Seconds
+    PLATFORM_HTTP_RETRIES = int(os.environ.get('PLATFORM_HTTP_RETRIES', '3'))
+    PLATFORM_HTTP_BACKOFF = float(os.environ.get('PLATFORM_HTTP_BACKOFF', '0.5'))  # Seconds, doubled per retry
+    PLATFORM_CIRCUIT_THRESHOLD = int(os.environ.get('PLATFORM_CIRCUIT_THRESHOLD', '5'))  # Consecutive failures
+    PLATFORM_CIRCUIT_RESET = float(os.environ.get('PLATFORM_CIRCUIT_RESET', '30'))  # Seconds open before a trial call
+    
+    # Delivery status changes are written to an outbox in the same transaction
+    # and pushed to the platforms by STATUS_SYNC_WORKERS threads (see
+    # app/services/status_sync.py); failed pushes end up on the status sync page
+    STATUS_SYNC_WORKERS = int(os.environ.get('STATUS_SYNC_WORKERS', '4'))
+    STATUS_SYNC_MAX_ATTEMPTS = int(os.environ.get('STATUS_SYNC_MAX_ATTEMPTS', '8'))
+    STATUS_SYNC_RETRY_INTERVAL = int(os.environ.get('STATUS_SYNC_RETRY_INTERVAL', '15'))  # Seconds, doubled per retry
+    STATUS_SYNC_POLL_INTERVAL = float(os.environ.get('STATUS_SYNC_POLL_INTERVAL', '5'))  # Seconds
+    STATUS_SYNC_RETENTION_DAYS = int(os.environ.get('STATUS_SYNC_RETENTION_DAYS', '7'))
+    
     # Restaurant details for receipts
     RESTAURANT_NAME = os.environ.get('RESTAURANT_NAME', 'Restaurant Name')
     RESTAURANT_PHONE = os.environ.get('RESTAURANT_PHONE', '+1234567890')
@@ -9,11 +9,15 @@ from app.models.order import Order, OrderItem, OrderStatus
 from app.models.bill import Bill
 from app.models.delivery import DeliveryOrder, DeliveryStatus
 from app.models.settings import Settings
-from app.utils.decorators import admin_required
+from app.models.sales import DailySales, ItemSales
+from app.utils.decorators import admin_required, read_only
+from app.services.analytics import ANALYTICS, OrderHistory
+from app.services.reports import sales_report
+from app.utils.export import XLSXWRITER_AVAILABLE
+from app.utils.session import transaction
 from datetime import datetime, timedelta
 from sqlalchemy import func
-import io
-import csv
+from sqlalchemy.orm import joinedload
 
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -31,10 +35,7 @@ def dashboard():
     end_of_day = datetime.combine(today, datetime.max.time())
     
     # Get statistics
-    total_sales_today = db.session.query(db.func.sum(Bill.total_amount)).filter(
-        Bill.created_at.between(start_of_day, end_of_day),
-        Bill.payment_status == True
-    ).scalar() or 0
+    total_sales_today = DailySales.total_between(today, today)
     
     orders_today = Order.query.filter(
         Order.created_at.between(start_of_day, end_of_day)
@@ -43,7 +44,7 @@ def dashboard():
     active_tables = Table.query.filter_by(is_occupied=True).count()
     
     # Get recent orders
-    recent_orders = Order.query.filter(
+    recent_orders = Order.query.options(joinedload(Order.table)).filter(
         Order.status == OrderStatus.ACTIVE
     ).order_by(Order.created_at.desc()).limit(10).all()
     
@@ -137,9 +138,35 @@ def delete_user(user_id):
     return redirect(url_for('admin.users'))
 
 
+def report_dates():
+    """
+    Parse the sales report date range from the request, defaulting to the current month.
+
+    Returns:
+        tuple: (start_date, end_date) as datetimes
+    """
+    start_date = request.values.get('start_date')
+    end_date = request.values.get('end_date')
+
+    if start_date:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d')
+    else:
+        start_date = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    if end_date:
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+    else:
+        next_month = start_date.replace(month=start_date.month + 1 if start_date.month < 12 else 1,
+                                        year=start_date.year if start_date.month < 12 else start_date.year + 1)
+        end_date = next_month - timedelta(seconds=1)
+
+    return start_date, end_date
+
+
 @admin_bp.route('/reports')
 @login_required
 @admin_required
+@read_only
 def reports():
     """Admin reports route."""
     today = datetime.now().date()
@@ -155,30 +182,11 @@ def reports():
     else:
         end_of_month = datetime.combine(today.replace(month=today.month + 1, day=1) - timedelta(days=1), datetime.max.time())
 
-    sales_today = db.session.query(func.sum(Bill.total_amount)).filter(
-        Bill.created_at.between(start_of_day, end_of_day),
-        Bill.payment_status == True
-    ).scalar() or 0
-
-    sales_week = db.session.query(func.sum(Bill.total_amount)).filter(
-        Bill.created_at.between(start_of_week, end_of_week),
-        Bill.payment_status == True
-    ).scalar() or 0
-
-    sales_month = db.session.query(func.sum(Bill.total_amount)).filter(
-        Bill.created_at.between(start_of_month, end_of_month),
-        Bill.payment_status == True
-    ).scalar() or 0
-
-    popular_items = db.session.query(
-        MenuItem.name,
-        func.sum(OrderItem.quantity).label('total_quantity')
-    ).join(OrderItem, MenuItem.id == OrderItem.menu_item_id) \
-        .join(Order, OrderItem.order_id == Order.id) \
-        .filter(Order.created_at.between(start_of_month, end_of_month)) \
-        .group_by(MenuItem.name) \
-        .order_by(func.sum(OrderItem.quantity).desc()) \
-        .limit(5).all()
+    sales_today = DailySales.total_between(start_of_day.date(), end_of_day.date())
+    sales_week = DailySales.total_between(start_of_week.date(), end_of_week.date())
+    sales_month = DailySales.total_between(start_of_month.date(), end_of_month.date())
+
+    popular_items = ItemSales.top(start_of_month.date(), end_of_month.date(), limit=5)
 
     return render_template('admin/reports.html',
                            sales_today=sales_today,
@@ -187,84 +195,129 @@ def reports():
                            popular_items=popular_items)
 
 
-@admin_bp.route('/export-report/<string:format>')
-@login_required
-@admin_required
-def export_report(format):
-    """Export reports in different formats."""
+def api_dates():
+    """
+    Parse an API date range from the query string, defaulting to the month so far.
+    
+    Returns:
+        tuple: (start_date, end_date) as dates
+        
+    Raises:
+        ValueError: If a date is malformed
+    """
+    today = datetime.now().date()
     start_date = request.args.get('start_date')
+    start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else today.replace(day=1)
     end_date = request.args.get('end_date')
+    end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else today
+    return start_date, end_date
 
-    if start_date:
-        start_date = datetime.strptime(start_date, '%Y-%m-%d')
-    else:
-        start_date = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-    if end_date:
-        end_date = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
-    else:
-        next_month = start_date.replace(month=start_date.month + 1 if start_date.month < 12 else 1,
-                                        year=start_date.year if start_date.month < 12 else start_date.year + 1)
-        end_date = next_month - timedelta(seconds=1)
+@admin_bp.route('/api/top-items')
+@login_required
+@admin_required
+@read_only
+def api_top_items():
+    """API endpoint for the best-selling menu items over a date range."""
+    try:
+        start_date, end_date = api_dates()
+        limit = min(max(int(request.args.get('limit', 10)), 1), 100)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid date range or limit'}), 400
+
+    items = ItemSales.top(start_date, end_date, limit=limit)
+
+    return jsonify({
+        'success': True,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'items': [{
+            'menu_item_id': item.menu_item_id,
+            'name': item.name,
+            'quantity': int(item.total_quantity or 0),
+            'revenue': round(item.total_revenue or 0.0, 2)
+        } for item in items]
+    })
+
+
+@admin_bp.route('/api/analytics/<string:metric>')
+@login_required
+@admin_required
+@read_only
+def api_analytics(metric):
+    """API endpoint for order history analytics: basket, hourly or categories."""
+    if metric not in ANALYTICS:
+        return jsonify({'success': False, 'message': f'Unknown metric: {metric}'}), 404
+    
+    try:
+        start_date, end_date = api_dates()
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid date range'}), 400
+    if end_date < start_date:
+        return jsonify({'success': False, 'message': 'Invalid date range'}), 400
+    
+    history = OrderHistory.load(start_date, end_date)
+    
+    return jsonify({
+        'success': True,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        metric: ANALYTICS[metric](history)
+    })
 
-    bills = Bill.query.filter(
-        Bill.created_at.between(start_date, end_date),
-        Bill.payment_status == True
-    ).order_by(Bill.created_at).all()
+
+@admin_bp.route('/export-report/<string:format>')
+@login_required
+@admin_required
+@read_only
+def export_report(format):
+    """Export reports in different formats."""
+    report = sales_report(*report_dates())
 
     if format == 'csv':
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(['Bill Number', 'Order ID', 'Date', 'Subtotal', 'Tax', 'Discount', 'Total', 'Payment Method'])
-
-        for bill in bills:
-            writer.writerow([
-                bill.bill_number,
-                bill.order_id,
-                bill.created_at.strftime('%Y-%m-%d %H:%M'),
-                bill.subtotal,
-                bill.tax_amount,
-                bill.discount,
-                bill.total_amount,
-                bill.payment_method.value if bill.payment_method else 'N/A'
-            ])
-
-        output.seek(0)
-        return send_file(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'sales_report_{start_date.strftime("%Y%m%d")}-{end_date.strftime("%Y%m%d")}.csv'
-        )
+        return report.response('csv')
 
     elif format == 'pdf':
-        flash('PDF export is not implemented yet.', 'info')
-        return redirect(url_for('admin.reports'))
+        return report.response('pdf',
+                               back_url=url_for('admin.reports'),
+                               back_label='Back to Reports',
+                               now=datetime.now,
+                               standalone=True,
+                               print_friendly=True)
 
     elif format == 'excel':
-        flash('Excel export is not implemented yet.', 'info')
-        return redirect(url_for('admin.reports'))
+        if not XLSXWRITER_AVAILABLE:
+            flash('Excel export is not available. Please install xlsxwriter.', 'warning')
+            return redirect(url_for('admin.reports'))
+        return report.response('excel')
 
     else:
         flash('Invalid export format.', 'error')
         return redirect(url_for('admin.reports'))
 
 
+@admin_bp.route('/export-report/<string:format>/background', methods=['POST'])
+@login_required
+@admin_required
+def export_report_background(format):
+    """Generate a sales report export in the background."""
+    from app.controllers.jobs import queue_export
+    return queue_export('sales', format, *report_dates(), back_endpoint='admin.reports')
+
+
 @admin_bp.route('/settings')
 @login_required
 @admin_required
 def settings():
     """Admin settings route."""
-    tax_rate = Settings.get('tax_rate', '5')
-    restaurant_name = Settings.get('restaurant_name', 'Restaurant Name')
-    restaurant_phone = Settings.get('restaurant_phone', '+1234567890')
-    restaurant_address = Settings.get('restaurant_address', '123 Main St, City, Country')
+    settings = Settings.get_many({
+        'tax_rate': '5',
+        'restaurant_name': 'Restaurant Name',
+        'restaurant_phone': '+1234567890',
+        'restaurant_address': '123 Main St, City, Country'
+    })
 
-    return render_template('admin/settings.html',
-                           tax_rate=tax_rate,
-                           restaurant_name=restaurant_name,
-                           restaurant_phone=restaurant_phone,
-                           restaurant_address=restaurant_address)
+    return render_template('admin/settings.html', **settings)
 
 
 @admin_bp.route('/settings/restaurant-info', methods=['POST'])
@@ -276,9 +329,12 @@ def update_restaurant_info():
     restaurant_phone = request.form.get('restaurant_phone')
     restaurant_address = request.form.get('restaurant_address')
 
-    Settings.set('restaurant_name', restaurant_name)
-    Settings.set('restaurant_phone', restaurant_phone)
-    Settings.set('restaurant_address', restaurant_address)
+    with transaction():
+        Settings.set_many({
+            'restaurant_name': restaurant_name,
+            'restaurant_phone': restaurant_phone,
+            'restaurant_address': restaurant_address
+        })
 
     flash('Restaurant information has been updated!', 'success')
     return redirect(url_for('admin.settings'))
@@ -290,7 +346,8 @@ def update_restaurant_info():
 def update_tax_settings():
     """Update tax settings."""
     tax_rate = request.form.get('tax_rate')
-    Settings.set('tax_rate', tax_rate)
+    with transaction():
+        Settings.set('tax_rate', tax_rate)
     flash('Tax settings have been updated!', 'success')
     return redirect(url_for('admin.settings'))
 
@@ -302,8 +359,11 @@ def update_delivery_settings():
     """Update delivery settings."""
     zomato_api_key = request.form.get('zomato_api_key')
     swiggy_api_key = request.form.get('swiggy_api_key')
-    Settings.set('zomato_api_key', zomato_api_key)
-    Settings.set('swiggy_api_key', swiggy_api_key)
+    with transaction():
+        Settings.set_many({
+            'zomato_api_key': zomato_api_key,
+            'swiggy_api_key': swiggy_api_key
+        })
     flash('Delivery settings have been updated!', 'success')
     return redirect(url_for('admin.settings'))
 
@@ -1,14 +1,16 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, make_response
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, make_response, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models.order import Order, OrderStatus
 from app.models.bill import Bill, PaymentMethod
 from app.models.settings import Settings
-from app.utils.decorators import admin_required
+from app.services.writer import write_queue
+from app.utils.decorators import admin_required, read_only
+from app.services.reports import bills_report
+from app.utils.export import XLSXWRITER_AVAILABLE
+from app.utils.pagination import keyset_page, page_args
 from datetime import datetime
 import os
-import io
-import csv
 
 # Make pdfkit optional but provide fallback options
 try:
@@ -42,24 +44,135 @@ except ImportError:
     PDFKIT_AVAILABLE = False
     pdfkit_config = None
 
-# Make xlsxwriter optional
-try:
-    import xlsxwriter
-    XLSXWRITER_AVAILABLE = True
-except ImportError:
-    XLSXWRITER_AVAILABLE = False
-
 billing_bp = Blueprint('billing', __name__, url_prefix='/billing')
 
 
+def create_bill(order_id, tax_rate, discount):
+    """
+    Stage a bill for an order and mark the order as completed.
+    
+    Runs as a write_queue job.
+    
+    Args:
+        order_id (int): The order to bill
+        tax_rate (float): Tax rate as a fraction, e.g. 0.05
+        discount (float): Discount amount
+        
+    Returns:
+        int: The bill ID (the existing one if the order was already billed),
+            or None if the order is no longer active
+    """
+    existing_bill = Bill.query.filter_by(order_id=order_id).first()
+    if existing_bill:
+        return existing_bill.id
+    
+    order = db.session.get(Order, order_id)
+    if order.status != OrderStatus.ACTIVE:
+        return None
+    
+    # Calculate bill amounts
+    subtotal = order.total_amount
+    tax_amount = subtotal * tax_rate
+    total_amount = subtotal + tax_amount - discount
+    
+    bill = Bill(
+        order_id=order_id,
+        bill_number=Bill.generate_bill_number(),
+        subtotal=subtotal,
+        tax_amount=tax_amount,
+        discount=discount,
+        total_amount=total_amount
+    )
+    db.session.add(bill)
+    
+    # Mark order as completed in the same transaction as the bill
+    order.complete()
+    
+    db.session.flush()  # Get bill ID
+    return bill.id
+
+
+def settle_bill(bill_id, payment_method):
+    """
+    Stage a payment on a bill.
+    
+    Runs as a write_queue job.
+    
+    Returns:
+        bool: False if the bill was already paid
+    """
+    bill = db.session.get(Bill, bill_id)
+    if bill.payment_status:
+        return False
+    
+    bill.mark_as_paid(payment_method)
+    return True
+
+
+def export_dates():
+    """
+    Parse the optional start_date/end_date export filters from the request.
+    
+    Returns:
+        tuple: (start_date, end_date), each a datetime or None
+    """
+    start_date = request.values.get('start_date')
+    end_date = request.values.get('end_date')
+    
+    if start_date:
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d')
+        except ValueError:
+            start_date = None
+    
+    if end_date:
+        try:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d')
+        except ValueError:
+            end_date = None
+    
+    return start_date or None, end_date or None
+
+
 @billing_bp.route('/')
 @login_required
 @admin_required
 def index():
     """Billing management route."""
-    # Get recent bills (last 50)
-    recent_bills = Bill.query.order_by(Bill.created_at.desc()).limit(50).all()
-    return render_template('billing/index.html', recent_bills=recent_bills)
+    # Get recent bills, one page at a time
+    try:
+        page = keyset_page(Bill.query, Bill, *page_args(request.args))
+    except ValueError:
+        abort(400)
+    
+    return render_template('billing/index.html', recent_bills=page.items, page=page)
+
+
+@billing_bp.route('/api/bills')
+@login_required
+@admin_required
+def api_bills():
+    """API endpoint for bill history, newest first, paged by cursor."""
+    try:
+        page = keyset_page(Bill.query, Bill, *page_args(request.args))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid cursor or page size'}), 400
+    
+    return jsonify({
+        'bills': [{
+            'id': bill.id,
+            'bill_number': bill.bill_number,
+            'order_id': bill.order_id,
+            'subtotal': bill.subtotal,
+            'tax_amount': bill.tax_amount,
+            'discount': bill.discount,
+            'total_amount': bill.total_amount,
+            'payment_status': bill.payment_status,
+            'payment_method': bill.payment_method.value if bill.payment_method else None,
+            'created_at': bill.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        } for bill in page.items],
+        'next_cursor': page.next_cursor
+    })
 
 
 @billing_bp.route('/generate/<int:order_id>', methods=['GET', 'POST'])
@@ -87,29 +200,16 @@ def generate_bill(order_id):
         tax_rate = 0.05  # Default to 5% if the value is not a valid number
     
     if request.method == 'POST':
-        # Calculate bill amounts
-        subtotal = order.total_amount
-        tax_amount = subtotal * tax_rate
         discount = float(request.form.get('discount', 0))
-        total_amount = subtotal + tax_amount - discount
         
         # Generate bill
-        bill = Bill(
-            order_id=order_id,
-            bill_number=Bill.generate_bill_number(),
-            subtotal=subtotal,
-            tax_amount=tax_amount,
-            discount=discount,
-            total_amount=total_amount
-        )
-        db.session.add(bill)
-        
-        # Mark order as completed
-        order.complete()
+        bill_id = write_queue.run(create_bill, order.id, tax_rate, discount)
+        if bill_id is None:
+            flash('Cannot generate bill for a completed or cancelled order!', 'warning')
+            return redirect(url_for('order.view_order', order_id=order_id))
         
-        db.session.commit()
         flash('Bill has been generated successfully!', 'success')
-        return redirect(url_for('billing.view_bill', bill_id=bill.id))
+        return redirect(url_for('billing.view_bill', bill_id=bill_id))
     
     # For GET request, calculate tax amount based on settings
     subtotal = order.total_amount
@@ -147,7 +247,10 @@ def pay_bill(bill_id):
         flash('Please select a payment method!', 'danger')
         return redirect(url_for('billing.view_bill', bill_id=bill_id))
     
-    bill.mark_as_paid(payment_method)
+    if not write_queue.run(settle_bill, bill.id, payment_method):
+        flash('This bill is already paid!', 'warning')
+        return redirect(url_for('billing.view_bill', bill_id=bill_id))
+    
     flash('Bill has been marked as paid!', 'success')
     return redirect(url_for('billing.view_bill', bill_id=bill_id))
 
@@ -170,169 +273,46 @@ def print_bill(bill_id):
 @billing_bp.route('/export/pdf')
 @login_required
 @admin_required
+@read_only
 def export_pdf():
-    """Export bills as PDF."""
-    # Get filter parameters
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    
-    # Build query
-    query = Bill.query
-    
-    if start_date:
-        try:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-            query = query.filter(Bill.created_at >= start_date)
-        except ValueError:
-            pass
-    
-    if end_date:
-        try:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
-            query = query.filter(Bill.created_at <= end_date)
-        except ValueError:
-            pass
-    
-    # Get bills
-    bills = query.order_by(Bill.created_at.desc()).all()
+    """Export bills as a paginated HTML report that browsers can print or save as PDF."""
+    report = bills_report(*export_dates())
     
     # Return the HTML report directly - browsers can print/save as PDF
-    return render_template('billing/export_pdf.html', 
-                         bills=bills, 
-                         start_date=start_date, 
-                         end_date=end_date,
-                         now=datetime.now,
-                         Settings=Settings,
-                         standalone=True,
-                         print_friendly=True)
+    return report.response('pdf',
+                           back_url=url_for('billing.index'),
+                           back_label='Back to Billing',
+                           now=datetime.now,
+                           standalone=True,
+                           print_friendly=True)
 
 
 @billing_bp.route('/export/excel')
 @login_required
 @admin_required
+@read_only
 def export_excel():
     """Export bills as Excel."""
     if not XLSXWRITER_AVAILABLE:
         flash('Excel export is not available. Please install xlsxwriter.', 'warning')
         return redirect(url_for('billing.index'))
     
-    # Get filter parameters
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    
-    # Build query
-    query = Bill.query
-    
-    if start_date:
-        try:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-            query = query.filter(Bill.created_at >= start_date)
-        except ValueError:
-            pass
-    
-    if end_date:
-        try:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
-            query = query.filter(Bill.created_at <= end_date)
-        except ValueError:
-            pass
-    
-    # Get bills
-    bills = query.order_by(Bill.created_at.desc()).all()
-    
-    # Create an in-memory output file
-    output = io.BytesIO()
-    
-    # Create a workbook and add a worksheet
-    workbook = xlsxwriter.Workbook(output)
-    worksheet = workbook.add_worksheet('Bills')
-    
-    # Add headers
-    headers = ['Bill #', 'Date', 'Customer', 'Subtotal', 'Tax', 'Discount', 'Total', 'Payment Status', 'Payment Method']
-    for col, header in enumerate(headers):
-        worksheet.write(0, col, header)
-    
-    # Add data
-    for row, bill in enumerate(bills, 1):
-        worksheet.write(row, 0, bill.bill_number)
-        worksheet.write(row, 1, bill.created_at.strftime('%Y-%m-%d %H:%M'))
-        worksheet.write(row, 2, bill.order.customer_name if bill.order.customer_name else 'Walk-in Customer')
-        worksheet.write(row, 3, bill.subtotal)
-        worksheet.write(row, 4, bill.tax_amount)
-        worksheet.write(row, 5, bill.discount)
-        worksheet.write(row, 6, bill.total_amount)
-        worksheet.write(row, 7, 'Paid' if bill.payment_status else 'Unpaid')
-        worksheet.write(row, 8, bill.payment_method.value if bill.payment_method else '')
-    
-    # Close the workbook
-    workbook.close()
-    
-    # Seek to the beginning of the stream
-    output.seek(0)
-    
-    # Create response
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    response.headers['Content-Disposition'] = 'attachment; filename=bills_report.xlsx'
-    
-    return response
+    return bills_report(*export_dates()).response('excel')
+
+
+@billing_bp.route('/export/<string:format>/background', methods=['POST'])
+@login_required
+@admin_required
+def export_background(format):
+    """Generate a bills export in the background."""
+    from app.controllers.jobs import queue_export
+    return queue_export('bills', format, *export_dates(), back_endpoint='billing.index')
 
 
 @billing_bp.route('/export/csv')
 @login_required
 @admin_required
+@read_only
 def export_csv():
-    """Export bills as CSV."""
-    # Get filter parameters
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    
-    # Build query
-    query = Bill.query
-    
-    if start_date:
-        try:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-            query = query.filter(Bill.created_at >= start_date)
-        except ValueError:
-            pass
-    
-    if end_date:
-        try:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
-            query = query.filter(Bill.created_at <= end_date)
-        except ValueError:
-            pass
-    
-    # Get bills
-    bills = query.order_by(Bill.created_at.desc()).all()
-    
-    # Create an in-memory output file
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write headers
-    headers = ['Bill #', 'Date', 'Customer', 'Subtotal', 'Tax', 'Discount', 'Total', 'Payment Status', 'Payment Method']
-    writer.writerow(headers)
-    
-    # Write data
-    for bill in bills:
-        writer.writerow([
-            bill.bill_number,
-            bill.created_at.strftime('%Y-%m-%d %H:%M'),
-            bill.order.customer_name if bill.order.customer_name else 'Walk-in Customer',
-            bill.subtotal,
-            bill.tax_amount,
-            bill.discount,
-            bill.total_amount,
-            'Paid' if bill.payment_status else 'Unpaid',
-            bill.payment_method.value if bill.payment_method else ''
-        ])
-    
-    # Create response
-    output.seek(0)
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = 'attachment; filename=bills_report.csv'
-    
-    return response 
\ No newline at end of file
+    """Export bills as a streamed CSV."""
+    return bills_report(*export_dates()).response('csv')
@@ -1,15 +1,22 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort, current_app
 from flask_login import login_required, current_user
 from app import db, socketio, limiter
-from app.models.order import Order, OrderItem, OrderStatus, OrderType
-from app.models.delivery import DeliveryOrder, DeliveryStatus, DeliveryPlatform
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.delivery import DeliveryItemMapping, DeliveryOrder, DeliveryStatus
+from app.models.outbox import OutboxState, StatusUpdate
 from app.models.menu import MenuItem
 from app.models.settings import Settings
 from app.utils.decorators import admin_required
-from app.services.delivery import ZomatoService, SwiggyService
+from app.utils.pagination import keyset_page, page_args
+from app.utils.session import transaction
+from app.services.menu_matcher import FUZZY_METHODS, menu_matcher
+from app.services.status_sync import queue_status_update, status_dispatcher
+from app.services.webhooks import InvalidWebhook, enqueue_webhook, webhook_processor
+from app.services.writer import write_queue
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from app.utils.delivery import verify_signature
-from app.utils.delivery_data import standardize_delivery_data, extract_items_data, validate_delivery_data
+from app.utils.delivery_data import get_adapter, validate_delivery_data
 import json
 import logging
 
@@ -18,6 +25,58 @@ logger = logging.getLogger(__name__)
 delivery_bp = Blueprint('delivery', __name__, url_prefix='/delivery')
 
 
+def store_delivery_order(platform, standardized_data, standardized_items):
+    """
+    Stage a delivery order received from a platform webhook, unless it already exists.
+    
+    Runs as a write_queue job.
+    
+    Args:
+        platform (DeliveryPlatform): The platform the order came from
+        standardized_data (dict): Output of PlatformAdapter.standardize
+        standardized_items (list): Output of PlatformAdapter.extract_items, or None
+    
+    Returns:
+        dict: id, customer_name, created_at and whether the order was a duplicate
+    """
+    delivery_order = DeliveryOrder.query.filter_by(
+        platform=platform,
+        platform_order_id=standardized_data['order_id']
+    ).first()
+    duplicate = delivery_order is not None
+    
+    if not duplicate:
+        delivery_order = DeliveryOrder(
+            platform=platform,
+            platform_order_id=standardized_data['order_id'],
+            customer_name=standardized_data['customer']['name'],
+            customer_phone=standardized_data['customer']['phone'],
+            customer_address=standardized_data['address'],
+            delivery_fee=standardized_data['fees']['delivery_fee'],
+            platform_fee=standardized_data['fees']['platform_fee'],
+            # Store items data as proper JSON
+            items_data=json.dumps(standardized_items) if standardized_items is not None else None
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(delivery_order)
+                db.session.flush()  # Get ID and created_at
+        except IntegrityError:
+            # Another worker stored the same order in the meantime
+            delivery_order = DeliveryOrder.query.filter_by(
+                platform=platform,
+                platform_order_id=standardized_data['order_id']
+            ).one()
+            duplicate = True
+    
+    return {
+        'id': delivery_order.id,
+        'customer_name': delivery_order.customer_name,
+        'created_at': delivery_order.created_at,
+        'duplicate': duplicate
+    }
+
+
 @delivery_bp.route('/')
 @login_required
 @admin_required
@@ -29,13 +88,48 @@ def index():
         DeliveryOrder.status.in_(pending_status_list)
     ).order_by(DeliveryOrder.created_at.desc()).all()
     
-    # Get completed delivery orders (last 50)
-    completed_status_list = [DeliveryStatus.DELIVERED, DeliveryStatus.PICKED_UP]
-    completed_orders = DeliveryOrder.query.filter(
-        DeliveryOrder.status.in_(completed_status_list)
-    ).order_by(DeliveryOrder.updated_at.desc()).limit(50).all()
+    # Status updates the platforms never received
+    failed_syncs = StatusUpdate.query.filter(StatusUpdate.state == OutboxState.FAILED).count()
     
-    return render_template('delivery/index.html', pending_orders=pending_orders, completed_orders=completed_orders)
+    # Get completed delivery orders, one page at a time
+    try:
+        page = keyset_page(completed_deliveries_query(), DeliveryOrder, *page_args(request.args))
+    except ValueError:
+        abort(400)
+    
+    return render_template('delivery/index.html', pending_orders=pending_orders, completed_orders=page.items, page=page,
+                           failed_syncs=failed_syncs)
+
+
+def completed_deliveries_query():
+    """Query delivered and picked up delivery orders."""
+    return DeliveryOrder.query.filter(
+        DeliveryOrder.status.in_([DeliveryStatus.DELIVERED, DeliveryStatus.PICKED_UP])
+    )
+
+
+@delivery_bp.route('/api/completed')
+@login_required
+@admin_required
+def api_completed_deliveries():
+    """API endpoint for completed delivery orders, newest first, paged by cursor."""
+    try:
+        page = keyset_page(completed_deliveries_query(), DeliveryOrder, *page_args(request.args))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid cursor or page size'}), 400
+    
+    return jsonify({
+        'orders': [{
+            'id': order.id,
+            'platform': order.platform.value,
+            'platform_order_id': order.platform_order_id,
+            'customer_name': order.customer_name,
+            'status': order.status.value,
+            'created_at': order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'updated_at': order.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+        } for order in page.items],
+        'next_cursor': page.next_cursor
+    })
 
 
 # Update these functions
@@ -46,30 +140,21 @@ def index():
 def settings():
     """Delivery settings route."""
     # Load current settings from database
-    zomato_api_key = Settings.get('zomato_api_key', '')
-    swiggy_api_key = Settings.get('swiggy_api_key', '')
-    zomato_enabled = Settings.get('zomato_enabled', 'false')
-    swiggy_enabled = Settings.get('swiggy_enabled', 'false')
-    zomato_webhook_secret = Settings.get('zomato_webhook_secret', '')
-    swiggy_partner_id = Settings.get('swiggy_partner_id', '')
-    swiggy_webhook_secret = Settings.get('swiggy_webhook_secret', '')
-    base_delivery_fee = Settings.get('base_delivery_fee', '30')
-    distance_fee_per_km = Settings.get('distance_fee_per_km', '10')
-    max_delivery_radius = Settings.get('max_delivery_radius', '5')
-    enable_delivery_radius_check = Settings.get('enable_delivery_radius_check', 'true')
-    
-    return render_template('delivery/settings.html',
-                           zomato_api_key=zomato_api_key,
-                           swiggy_api_key=swiggy_api_key,
-                           zomato_enabled=zomato_enabled,
-                           swiggy_enabled=swiggy_enabled,
-                           zomato_webhook_secret=zomato_webhook_secret,
-                           swiggy_partner_id=swiggy_partner_id,
-                           swiggy_webhook_secret=swiggy_webhook_secret,
-                           base_delivery_fee=base_delivery_fee,
-                           distance_fee_per_km=distance_fee_per_km,
-                           max_delivery_radius=max_delivery_radius,
-                           enable_delivery_radius_check=enable_delivery_radius_check)
+    settings = Settings.get_many({
+        'zomato_api_key': '',
+        'swiggy_api_key': '',
+        'zomato_enabled': 'false',
+        'swiggy_enabled': 'false',
+        'zomato_webhook_secret': '',
+        'swiggy_partner_id': '',
+        'swiggy_webhook_secret': '',
+        'base_delivery_fee': '30',
+        'distance_fee_per_km': '10',
+        'max_delivery_radius': '5',
+        'enable_delivery_radius_check': 'true'
+    })
+    
+    return render_template('delivery/settings.html', **settings)
 
 
 @delivery_bp.route('/settings/zomato', methods=['POST'])
@@ -82,9 +167,12 @@ def update_zomato_settings():
     enabled = 'zomato_enabled' in request.form
     
     # Save settings to database
-    Settings.set('zomato_api_key', api_key)
-    Settings.set('zomato_webhook_secret', webhook_secret)
-    Settings.set('zomato_enabled', 'true' if enabled else 'false')
+    with transaction():
+        Settings.set_many({
+            'zomato_api_key': api_key,
+            'zomato_webhook_secret': webhook_secret,
+            'zomato_enabled': 'true' if enabled else 'false'
+        })
     
     flash('Zomato integration settings have been updated!', 'success')
     return redirect(url_for('delivery.settings'))
@@ -101,10 +189,13 @@ def update_swiggy_settings():
     enabled = 'swiggy_enabled' in request.form
     
     # Save settings to database
-    Settings.set('swiggy_api_key', api_key)
-    Settings.set('swiggy_partner_id', partner_id)
-    Settings.set('swiggy_webhook_secret', webhook_secret)
-    Settings.set('swiggy_enabled', 'true' if enabled else 'false')
+    with transaction():
+        Settings.set_many({
+            'swiggy_api_key': api_key,
+            'swiggy_partner_id': partner_id,
+            'swiggy_webhook_secret': webhook_secret,
+            'swiggy_enabled': 'true' if enabled else 'false'
+        })
     
     flash('Swiggy integration settings have been updated!', 'success')
     return redirect(url_for('delivery.settings'))
@@ -119,8 +210,11 @@ def update_delivery_fees():
     fee_per_km = request.form.get('distance_fee_per_km', type=float)
     
     # Save settings to database
-    Settings.set('base_delivery_fee', str(base_fee))
-    Settings.set('distance_fee_per_km', str(fee_per_km))
+    with transaction():
+        Settings.set_many({
+            'base_delivery_fee': str(base_fee),
+            'distance_fee_per_km': str(fee_per_km)
+        })
     
     flash('Delivery fee settings have been updated!', 'success')
     return redirect(url_for('delivery.settings'))
@@ -135,8 +229,11 @@ def update_delivery_radius():
     enforce_radius = 'enable_delivery_radius_check' in request.form
     
     # Save settings to database
-    Settings.set('max_delivery_radius', str(max_radius))
-    Settings.set('enable_delivery_radius_check', 'true' if enforce_radius else 'false')
+    with transaction():
+        Settings.set_many({
+            'max_delivery_radius': str(max_radius),
+            'enable_delivery_radius_check': 'true' if enforce_radius else 'false'
+        })
     
     flash('Delivery radius settings have been updated!', 'success')
     return redirect(url_for('delivery.settings'))
@@ -146,9 +243,72 @@ def update_delivery_radius():
 @login_required
 @admin_required
 def view_order(delivery_id):
-    """View delivery order details."""
+    """View delivery order details, with the menu item each of its items matches."""
+    delivery_order = DeliveryOrder.query.get_or_404(delivery_id)
+    
+    item_matches = []
+    if delivery_order.items_data:
+        index = menu_matcher.index()
+        for item_data in json.loads(delivery_order.items_data):
+            menu_item, method = index.match(delivery_order.platform, item_data.get('name', ''))
+            item_matches.append((item_data, menu_item, method))
+    
+    menu_items = db.session.query(MenuItem.id, MenuItem.name).order_by(MenuItem.name).all() if item_matches else []
+    return render_template('delivery/view_order.html', delivery_order=delivery_order,
+                           item_matches=item_matches, menu_items=menu_items, fuzzy_methods=FUZZY_METHODS)
+
+
+@delivery_bp.route('/order/<int:delivery_id>/map-item', methods=['POST'])
+@login_required
+@admin_required
+def map_item(delivery_id):
+    """Confirm or correct the menu item a delivery item name refers to, for later orders."""
     delivery_order = DeliveryOrder.query.get_or_404(delivery_id)
-    return render_template('delivery/view_order.html', delivery_order=delivery_order)
+    item_name = request.form.get('item_name', '')
+    menu_item = db.session.get(MenuItem, request.form.get('menu_item_id', type=int) or 0)
+    if menu_item is None:
+        flash('Please select a menu item!', 'danger')
+        return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
+    
+    if menu_matcher.remember(delivery_order.platform, item_name, menu_item.id) is None:
+        flash('This item has no name to match!', 'danger')
+        return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
+    
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request saved a mapping of the same name first
+        db.session.rollback()
+        flash(f"'{item_name}' was just mapped by someone else. Please check it and try again.", 'warning')
+        return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
+    
+    menu_matcher.invalidate()
+    flash(f"'{item_name}' will be matched to {menu_item.name} on later orders!", 'success')
+    return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
+
+
+@delivery_bp.route('/item-mappings')
+@login_required
+@admin_required
+def item_mappings():
+    """Delivery item names that staff matched to menu items."""
+    mappings = db.session.query(DeliveryItemMapping, MenuItem.name).join(
+        MenuItem, DeliveryItemMapping.menu_item_id == MenuItem.id
+    ).order_by(DeliveryItemMapping.platform, DeliveryItemMapping.item_name).all()
+    return render_template('delivery/item_mappings.html', mappings=mappings)
+
+
+@delivery_bp.route('/item-mappings/<int:mapping_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_item_mapping(mapping_id):
+    """Forget a delivery item mapping, so the name is matched from the menu again."""
+    mapping = DeliveryItemMapping.query.get_or_404(mapping_id)
+    db.session.delete(mapping)
+    db.session.commit()
+    menu_matcher.invalidate()
+    flash(f"The mapping of '{mapping.item_name}' has been deleted!", 'success')
+    return redirect(url_for('delivery.item_mappings'))
 
 
 @delivery_bp.route('/order/<int:delivery_id>/accept', methods=['POST'])
@@ -168,7 +328,7 @@ def accept_order(delivery_id):
         order = Order(
             user_id=current_user.id,
             status=OrderStatus.ACTIVE,
-            order_type=OrderType.ZOMATO if delivery_order.platform == DeliveryPlatform.ZOMATO else OrderType.SWIGGY,
+            order_type=get_adapter(delivery_order.platform).order_type,
             delivery_id=delivery_order.platform_order_id,
             customer_name=delivery_order.customer_name,
             customer_phone=delivery_order.customer_phone,
@@ -183,50 +343,52 @@ def accept_order(delivery_id):
                 # Parse the items_data as JSON
                 items = json.loads(delivery_order.items_data)
                 
-                # Process each item
+                # Resolve every line from the in-memory menu index, without a query per item
+                index = menu_matcher.index()
+                order_items = []
+                unmatched = []
+                guessed = []
+                
                 for item_data in items:
                     # Get item details from standardized format
                     item_name = item_data.get('name', '')
+                    menu_item, method = index.match(delivery_order.platform, item_name)
                     
-                    # Log the item being processed
-                    logger.info(f"Processing delivery item: {item_name}")
+                    # Leave unknown items for staff to add rather than guess a wrong dish
+                    if not menu_item:
+                        logger.warning(f"No menu item match found for '{item_name}'")
+                        unmatched.append(item_name)
+                        continue
                     
-                    # Try exact match first
-                    menu_item = MenuItem.query.filter(MenuItem.name == item_name).first()
+                    # Fuzzy matches are only reused once staff confirm them on the delivery order page
+                    if method in FUZZY_METHODS:
+                        guessed.append(f"{item_name} ({menu_item.name})")
                     
-                    # If no exact match, try partial match
-                    if not menu_item:
-                        menu_item = MenuItem.query.filter(MenuItem.name.ilike(f'%{item_name}%')).first()
+                    # Get quantity and price from standardized data
+                    quantity = item_data.get('quantity', 1)
+                    price = item_data.get('price', menu_item.full_price)
                     
-                    # If still no match, use the first menu item as fallback
-                    if not menu_item:
-                        menu_item = MenuItem.query.first()
-                        logger.warning(f"No menu item match found for '{item_name}', using fallback item: {menu_item.name if menu_item else 'None'}")
+                    # Create notes with additional details if available
+                    notes = f"Delivery item: {item_name}"
+                    if item_data.get('notes'):
+                        notes += f" | Notes: {item_data['notes']}"
+                    if item_data.get('variations') and item_data['variations']:
+                        notes += f" | Variations: {', '.join(item_data['variations'])}"
                     
-                    if menu_item:
-                        # Get quantity and price from standardized data
-                        quantity = item_data.get('quantity', 1)
-                        price = item_data.get('price', menu_item.full_price)
-                        
-                        # Create notes with additional details if available
-                        notes = f"Delivery item: {item_name}"
-                        if item_data.get('notes'):
-                            notes += f" | Notes: {item_data['notes']}"
-                        if item_data.get('variations') and item_data['variations']:
-                            notes += f" | Variations: {', '.join(item_data['variations'])}"
-                        
-                        # Create order item
-                        order_item = OrderItem(
-                            order_id=order.id,
-                            menu_item_id=menu_item.id,
-                            quantity=quantity,
-                            price=price,
-                            notes=notes
-                        )
-                        db.session.add(order_item)
-                        logger.info(f"Added order item: {quantity}x {menu_item.name} at price {price}")
-                    else:
-                        logger.error(f"No menu items found in the database")
+                    order_items.append({
+                        'menu_item_id': menu_item.id,
+                        'quantity': quantity,
+                        'price': price,
+                        'notes': notes
+                    })
+                    logger.info(f"Matched delivery item '{item_name}' to {menu_item.name} ({method}): {quantity}x at price {price}")
+                
+                if order_items:
+                    order.add_items(order_items)
+                if unmatched:
+                    flash(f"No menu item matches {', '.join(unmatched)}. Please add them to the order by hand.", 'warning')
+                if guessed:
+                    flash(f"Guessed menu items for {', '.join(guessed)}. Please confirm or correct them below.", 'warning')
             except Exception as e:
                 # Log the error but continue with order creation
                 logger.error(f"Error processing delivery order items: {str(e)}", exc_info=True)
@@ -237,13 +399,12 @@ def accept_order(delivery_id):
                     menu_item = MenuItem.query.first()
                     if menu_item:
                         order_item = OrderItem(
-                            order_id=order.id,
                             menu_item_id=menu_item.id,
                             quantity=1,
                             price=menu_item.full_price,
                             notes=f"Delivery order from {delivery_order.platform.value} (items parsing failed: {str(e)})"
                         )
-                        db.session.add(order_item)
+                        order.add_item(order_item)
                         logger.info(f"Added fallback item {menu_item.name} due to parsing error")
                     else:
                         logger.error("Cannot add fallback item: no menu items found in database")
@@ -257,13 +418,12 @@ def accept_order(delivery_id):
                 menu_item = MenuItem.query.first()
                 if menu_item:
                     order_item = OrderItem(
-                        order_id=order.id,
                         menu_item_id=menu_item.id,
                         quantity=1,
                         price=menu_item.full_price,
                         notes=f"Delivery order from {delivery_order.platform.value} (no items data)"
                     )
-                    db.session.add(order_item)
+                    order.add_item(order_item)
                     logger.info(f"Added fallback item {menu_item.name} due to missing items data")
                 else:
                     logger.error("Cannot add fallback item: no menu items found in database")
@@ -273,8 +433,11 @@ def accept_order(delivery_id):
         # Link delivery order to restaurant order
         delivery_order.order_id = order.id
     
-    # Accept the delivery order
-    delivery_order.accept()
+    # Accept the delivery order together with the restaurant order and its items
+    with transaction():
+        delivery_order.accept()
+        queue_status_update(delivery_order)
+    status_dispatcher.notify()
     flash('Delivery order has been accepted!', 'success')
     
     # Emit socket event to notify clients
@@ -300,7 +463,10 @@ def reject_order(delivery_id):
         return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
     
     # Reject the delivery order
-    delivery_order.reject()
+    with transaction():
+        delivery_order.reject()
+        queue_status_update(delivery_order)
+    status_dispatcher.notify()
     flash('Delivery order has been rejected!', 'success')
     
     # Emit socket event to notify clients
@@ -322,7 +488,10 @@ def update_status(delivery_id):
         return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
     
     # Update the delivery order status
-    delivery_order.update_status(status)
+    with transaction():
+        delivery_order.update_status(status)
+        queue_status_update(delivery_order)
+    status_dispatcher.notify()
     flash('Delivery order status has been updated!', 'success')
     
     # Emit socket event to notify clients
@@ -331,184 +500,146 @@ def update_status(delivery_id):
     return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
 
 
+@delivery_bp.route('/status-sync')
+@login_required
+@admin_required
+def status_sync():
+    """Status updates waiting to reach the platforms, and the dead letters given up on."""
+    counts = db.session.query(StatusUpdate.state, db.func.count(StatusUpdate.id)).filter(
+        StatusUpdate.state.in_([OutboxState.PENDING, OutboxState.SENDING, OutboxState.FAILED])
+    ).group_by(StatusUpdate.state).all()
+    counts = {state.value: count for state, count in counts}
+    
+    try:
+        page = keyset_page(StatusUpdate.query.filter(StatusUpdate.state == OutboxState.FAILED),
+                           StatusUpdate, *page_args(request.args))
+    except ValueError:
+        abort(400)
+    
+    return render_template('delivery/status_sync.html', counts=counts, failed_updates=page.items, page=page)
+
+
+@delivery_bp.route('/status-sync/<int:update_id>/retry', methods=['POST'])
+@login_required
+@admin_required
+def retry_status_update(update_id):
+    """Push a dead-letter status update again."""
+    if status_dispatcher.retry([update_id]):
+        flash('The status update has been queued again!', 'success')
+    else:
+        flash('This status update is no longer failed!', 'warning')
+    return redirect(url_for('delivery.status_sync'))
+
+
+@delivery_bp.route('/status-sync/retry', methods=['POST'])
+@login_required
+@admin_required
+def retry_status_updates():
+    """Push all dead-letter status updates again."""
+    count = status_dispatcher.retry()
+    flash(f'{count} status updates have been queued again!', 'success')
+    return redirect(url_for('delivery.status_sync'))
+
+
 # Update these webhook handlers
 
-@delivery_bp.route('/webhook/zomato', methods=['POST'])
-@limiter.limit("10 per minute")
-def zomato_webhook():
-    """Webhook for Zomato orders."""
-    # Verify the request is from Zomato using signature
-    signature = request.headers.get('X-Zomato-Signature', '')
-    webhook_secret = Settings.get('zomato_webhook_secret', '')
+def webhook_rate_limit():
+    """Rate limit for platform webhooks, from WEBHOOK_RATE_LIMIT."""
+    return current_app.config.get('WEBHOOK_RATE_LIMIT', '600 per minute')
+
+
+@delivery_bp.route('/webhook/<string:platform>', methods=['POST'])
+@limiter.limit(webhook_rate_limit)
+def webhook(platform):
+    """
+    Webhook for delivery platform orders: verify it and queue its raw payload for processing.
+    
+    Only the signature check and one insert happen here; the order is
+    stored and announced by process_delivery_webhook on a worker thread.
+    
+    Args:
+        platform (str): Value of a platform with a registered adapter
+    """
+    adapter = get_adapter(platform)
+    if adapter is None:
+        return jsonify({'error': 'Unknown platform'}), 404
+    name = adapter.name
+    
+    # Verify the request is from the platform using signature
+    signature = request.headers.get(adapter.signature_header, '')
+    webhook_secret = Settings.get(adapter.secret_key, '')
     
-    # Verify signature
     if not verify_signature(request.data, signature, webhook_secret):
-        logger.warning(f"Invalid Zomato webhook signature: {signature}")
+        logger.warning(f"Invalid {name} webhook signature: {signature}")
         return jsonify({'error': 'Invalid signature'}), 401
     
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        logger.error(f"Invalid {name} webhook payload: not a JSON object")
+        return jsonify({'error': 'Payload must be a JSON object'}), 400
     
-    # Standardize and validate the data
-    standardized_data = standardize_delivery_data('zomato', data)
-    is_valid, error_message = validate_delivery_data(standardized_data)
+    event_id = write_queue.run(enqueue_webhook, adapter.platform, request.get_data(as_text=True))
+    webhook_processor.submit(event_id, data)
     
-    if not is_valid:
-        logger.error(f"Invalid Zomato webhook payload: {error_message}")
-        return jsonify({'error': error_message}), 400
+    return jsonify({
+        'success': True,
+        'message': 'Order accepted for processing',
+        'event_id': event_id
+    }), 202
+
+
+@webhook_processor.handler
+def process_delivery_webhook(platform, data):
+    """
+    Standardize, store and announce a delivery order from a queued webhook.
     
-    # Process the order
-    try:
-        # Check if order already exists
-        existing_order = DeliveryOrder.query.filter_by(
-            platform=DeliveryPlatform.ZOMATO,
-            platform_order_id=data.get('order_id')
-        ).first()
-        
-        if existing_order:
-            logger.warning(f"Duplicate Zomato order received: {data.get('order_id')}")
-            return jsonify({
-                'success': True, 
-                'message': 'Order already exists',
-                'order_id': existing_order.id
-            }), 200
-        
-        # Use standardized data to create the delivery order
-        delivery_order = DeliveryOrder(
-            platform=DeliveryPlatform.ZOMATO,
-            platform_order_id=standardized_data['order_id'],
-            customer_name=standardized_data['customer']['name'],
-            customer_phone=standardized_data['customer']['phone'],
-            customer_address=standardized_data['address'],
-            delivery_fee=standardized_data['fees']['delivery_fee'],
-            platform_fee=standardized_data['fees']['platform_fee']
-        )
-        
-        # Process and store standardized items data
-        if standardized_data['items']:
-            # Extract and standardize items data
-            standardized_items = extract_items_data('zomato', standardized_data['items'])
-            # Store items data as proper JSON
-            delivery_order.items_data = json.dumps(standardized_items)
-            logger.info(f"Stored {len(standardized_items)} standardized items for Zomato order {standardized_data['order_id']}")
-        else:
-            logger.warning(f"No items found in Zomato order {standardized_data['order_id']}")
-        
-        db.session.add(delivery_order)
-        db.session.commit()
-        
-        # Log successful order creation
-        logger.info(f"Successfully processed Zomato order: {data.get('order_id')}")
-        
-        # Emit socket event to notify clients
-        socketio.emit('new_delivery_order', {
-            'delivery_id': delivery_order.id, 
-            'platform': 'zomato',
-            'customer_name': delivery_order.customer_name,
-            'order_time': delivery_order.created_at.strftime('%H:%M:%S')
-        })
-        
-        return jsonify({
-            'success': True, 
-            'message': 'Order received',
-            'order_id': delivery_order.id
-        })
-    except Exception as e:
-        db.session.rollback()
-        logger.error(f"Error processing Zomato webhook: {str(e)}", exc_info=True)
-        return jsonify({
-            'success': False, 
-            'message': 'Internal server error',
-            'error': str(e)
-        }), 500
-
-
-@delivery_bp.route('/webhook/swiggy', methods=['POST'])
-@limiter.limit("10 per minute")
-def swiggy_webhook():
-    """Webhook for Swiggy orders."""
-    # Verify the request is from Swiggy using signature
-    signature = request.headers.get('X-Swiggy-Signature', '')
-    webhook_secret = Settings.get('swiggy_webhook_secret', '')
-    
-    # Verify signature
-    if not verify_signature(request.data, signature, webhook_secret):
-        logger.warning(f"Invalid Swiggy webhook signature: {signature}")
-        return jsonify({'error': 'Invalid signature'}), 401
+    Args:
+        platform (DeliveryPlatform): The platform the webhook came from
+        data (dict): The decoded webhook payload
+    
+    Returns:
+        int: The delivery order ID
     
-    data = request.json
+    Raises:
+        InvalidWebhook: If the payload is not a valid order
+    """
+    adapter = get_adapter(platform)
+    name = adapter.name
     
     # Standardize and validate the data
-    standardized_data = standardize_delivery_data('swiggy', data)
+    standardized_data = adapter.standardize(data)
     is_valid, error_message = validate_delivery_data(standardized_data)
     
     if not is_valid:
-        logger.error(f"Invalid Swiggy webhook payload: {error_message}")
-        return jsonify({'error': error_message}), 400
+        raise InvalidWebhook(error_message)
     
-    # Process the order
-    try:
-        # Check if order already exists
-        existing_order = DeliveryOrder.query.filter_by(
-            platform=DeliveryPlatform.SWIGGY,
-            platform_order_id=data.get('order_id')
-        ).first()
-        
-        if existing_order:
-            logger.warning(f"Duplicate Swiggy order received: {data.get('order_id')}")
-            return jsonify({
-                'success': True, 
-                'message': 'Order already exists',
-                'order_id': existing_order.id
-            }), 200
-        
-        # Use standardized data to create the delivery order
-        delivery_order = DeliveryOrder(
-            platform=DeliveryPlatform.SWIGGY,
-            platform_order_id=standardized_data['order_id'],
-            customer_name=standardized_data['customer']['name'],
-            customer_phone=standardized_data['customer']['phone'],
-            customer_address=standardized_data['address'],
-            delivery_fee=standardized_data['fees']['delivery_fee'],
-            platform_fee=standardized_data['fees']['platform_fee']
-        )
-        
-        # Process and store standardized items data
-        if standardized_data['items']:
-            # Extract and standardize items data
-            standardized_items = extract_items_data('swiggy', standardized_data['items'])
-            # Store items data as proper JSON
-            delivery_order.items_data = json.dumps(standardized_items)
-            logger.info(f"Stored {len(standardized_items)} standardized items for Swiggy order {standardized_data['order_id']}")
-        else:
-            logger.warning(f"No items found in Swiggy order {standardized_data['order_id']}")
-        
-        db.session.add(delivery_order)
-        db.session.commit()
-        
-        # Log successful order creation
-        logger.info(f"Successfully processed Swiggy order: {data.get('order_id')}")
-        
-        # Emit socket event to notify clients
-        socketio.emit('new_delivery_order', {
-            'delivery_id': delivery_order.id, 
-            'platform': 'swiggy',
-            'customer_name': delivery_order.customer_name,
-            'order_time': delivery_order.created_at.strftime('%H:%M:%S')
-        })
-        
-        return jsonify({
-            'success': True, 
-            'message': 'Order received',
-            'order_id': delivery_order.id
-        })
-    except Exception as e:
-        db.session.rollback()
-        logger.error(f"Error processing Swiggy webhook: {str(e)}", exc_info=True)
-        return jsonify({
-            'success': False, 
-            'message': 'Internal server error',
-            'error': str(e)
-        }), 500
+    # Process and store standardized items data
+    standardized_items = None
+    if standardized_data['items']:
+        # Extract and standardize items data
+        standardized_items = adapter.extract_items(standardized_data['items'])
+        logger.info(f"Extracted {len(standardized_items)} standardized items for {name} order {standardized_data['order_id']}")
+    else:
+        logger.warning(f"No items found in {name} order {standardized_data['order_id']}")
+    
+    result = write_queue.run(store_delivery_order, platform, standardized_data, standardized_items)
+    
+    if result['duplicate']:
+        logger.warning(f"Duplicate {name} order received: {data.get('order_id')}")
+        return result['id']
+    
+    # Log successful order creation
+    logger.info(f"Successfully processed {name} order: {data.get('order_id')}")
+    
+    # Emit socket event to notify clients
+    socketio.emit('new_delivery_order', {
+        'delivery_id': result['id'], 
+        'platform': platform.value,
+        'customer_name': result['customer_name'],
+        'order_time': result['created_at'].strftime('%H:%M:%S')
+    })
+    
+    return result['id']
 
 
 @delivery_bp.route('/order/<int:delivery_id>/prepare', methods=['POST'])
@@ -523,9 +654,11 @@ def prepare_order(delivery_id):
         return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
     
     # Update the delivery order status
-    delivery_order.status = DeliveryStatus.PREPARING
-    delivery_order.updated_at = datetime.utcnow()
-    db.session.commit()
+    with transaction():
+        delivery_order.status = DeliveryStatus.PREPARING
+        delivery_order.updated_at = datetime.utcnow()
+        queue_status_update(delivery_order)
+    status_dispatcher.notify()
     
     # Emit socket event to notify clients
     socketio.emit('delivery_updated', {'delivery_id': delivery_order.id, 'status': 'preparing'})
@@ -546,9 +679,11 @@ def ready_order(delivery_id):
         return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
     
     # Update the delivery order status
-    delivery_order.status = DeliveryStatus.READY
-    delivery_order.updated_at = datetime.utcnow()
-    db.session.commit()
+    with transaction():
+        delivery_order.status = DeliveryStatus.READY
+        delivery_order.updated_at = datetime.utcnow()
+        queue_status_update(delivery_order)
+    status_dispatcher.notify()
     
     # Emit socket event to notify clients
     socketio.emit('delivery_updated', {'delivery_id': delivery_order.id, 'status': 'ready'})
@@ -569,9 +704,11 @@ def complete_order(delivery_id):
         return redirect(url_for('delivery.view_order', delivery_id=delivery_id))
     
     # Update the delivery order status
-    delivery_order.status = DeliveryStatus.PICKED_UP
-    delivery_order.updated_at = datetime.utcnow()
-    db.session.commit()
+    with transaction():
+        delivery_order.status = DeliveryStatus.PICKED_UP
+        delivery_order.updated_at = datetime.utcnow()
+        queue_status_update(delivery_order)
+    status_dispatcher.notify()
     
     # Emit socket event to notify clients
     socketio.emit('delivery_updated', {'delivery_id': delivery_order.id, 'status': 'picked_up'})
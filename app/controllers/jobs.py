@@ -0,0 +1,86 @@
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, send_file, abort
+from flask_login import login_required, current_user
+from app.models.job import Job, JobStatus
+from app.services.jobs import job_runner
+from app.services.reports import export_params
+from app.utils.decorators import admin_required
+from app.utils.export import Report, XLSXWRITER_AVAILABLE
+import os
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/jobs')
+
+
+def queue_export(report, format, start_date, end_date, back_endpoint):
+    """
+    Queue a report export as a background job and answer the request.
+    
+    JSON clients get 202 with the job; browsers are sent to the jobs page.
+    
+    Args:
+        report (str): The report name
+        format (str): The export format
+        start_date (datetime): Start of the range, or None
+        end_date (datetime): End of the range, or None
+        back_endpoint (str): Where browsers go if the export cannot be queued
+    """
+    error = None
+    if format not in Report.FORMATS:
+        error = 'Invalid export format.'
+    elif format == 'excel' and not XLSXWRITER_AVAILABLE:
+        error = 'Excel export is not available. Please install xlsxwriter.'
+    
+    if error:
+        if request.is_json:
+            return jsonify({'success': False, 'message': error}), 400
+        flash(error, 'warning')
+        return redirect(url_for(back_endpoint))
+    
+    job = job_runner.submit('export', export_params(report, format, start_date, end_date), current_user.id)
+    
+    if request.is_json:
+        return jsonify({
+            'success': True,
+            'job': job.to_dict(),
+            'status_url': url_for('jobs.job_status', job_id=job.id)
+        }), 202
+    
+    flash('Export started. It will be ready for download here when it finishes.', 'success')
+    return redirect(url_for('jobs.index'))
+
+
+def get_user_job_or_404(job_id):
+    """Get a job the current user may see, or abort with 404."""
+    job = Job.query.get_or_404(job_id)
+    if job.user_id != current_user.id and not current_user.is_admin():
+        abort(404)
+    return job
+
+
+@jobs_bp.route('/')
+@login_required
+@admin_required
+def index():
+    """Background jobs route."""
+    jobs = Job.query.filter_by(user_id=current_user.id).order_by(Job.created_at.desc()).limit(50).all()
+    return render_template('jobs/index.html', jobs=jobs, JobStatus=JobStatus)
+
+
+@jobs_bp.route('/<int:job_id>')
+@login_required
+def job_status(job_id):
+    """API endpoint for a job's status."""
+    job = get_user_job_or_404(job_id)
+    return jsonify(job.to_dict())
+
+
+@jobs_bp.route('/<int:job_id>/download')
+@login_required
+def download(job_id):
+    """Download a finished job's result."""
+    job = get_user_job_or_404(job_id)
+    
+    if job.status != JobStatus.COMPLETED or not job.result_path or not os.path.exists(job.result_path):
+        flash('This export is not available for download.', 'warning')
+        return redirect(url_for('jobs.index'))
+    
+    return send_file(job.result_path, as_attachment=True, download_name=job.result_name)
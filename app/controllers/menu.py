@@ -104,6 +104,7 @@ def add_item():
             description=form.description.data,
             half_price=form.half_price.data,
             full_price=form.full_price.data,
+            cost_price=form.cost_price.data,
             category_id=form.category_id.data,
             is_available=form.is_available.data,
             image_url=form.image_url.data
@@ -131,6 +132,7 @@ def edit_item(item_id):
         menu_item.description = form.description.data
         menu_item.half_price = form.half_price.data
         menu_item.full_price = form.full_price.data
+        menu_item.cost_price = form.cost_price.data
         menu_item.category_id = form.category_id.data
         menu_item.is_available = form.is_available.data
         menu_item.image_url = form.image_url.data
@@ -1,11 +1,14 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
 from flask_login import login_required, current_user
 from app import db, socketio
 from app.models.order import Order, OrderItem, OrderStatus, OrderType
 from app.models.table import Table
 from app.models.menu import MenuItem
 from app.utils.decorators import admin_required
+from app.utils.pagination import keyset_page, page_args
+from app.utils.session import transaction
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 
 order_bp = Blueprint('order', __name__, url_prefix='/orders')
 
@@ -15,12 +18,21 @@ order_bp = Blueprint('order', __name__, url_prefix='/orders')
 def index():
     """Order management route."""
     # Get active orders
-    active_orders = Order.query.filter_by(status=OrderStatus.ACTIVE).order_by(Order.created_at.desc()).all()
+    active_orders = Order.query.options(joinedload(Order.table)) \
+        .filter_by(status=OrderStatus.ACTIVE).order_by(Order.created_at.desc()).all()
     
-    # Get completed orders (last 50)
-    completed_orders = Order.query.filter_by(status=OrderStatus.COMPLETED).order_by(Order.completed_at.desc()).limit(50).all()
+    # Get completed orders, one page at a time
+    try:
+        page = keyset_page(completed_orders_query(), Order, *page_args(request.args))
+    except ValueError:
+        abort(400)
     
-    return render_template('order/index.html', active_orders=active_orders, completed_orders=completed_orders)
+    return render_template('order/index.html', active_orders=active_orders, completed_orders=page.items, page=page)
+
+
+def completed_orders_query():
+    """Query completed orders with their tables."""
+    return Order.query.options(joinedload(Order.table)).filter_by(status=OrderStatus.COMPLETED)
 
 
 @order_bp.route('/<int:order_id>')
@@ -41,7 +53,8 @@ def complete_order(order_id):
         flash('This order is already completed or cancelled!', 'warning')
         return redirect(url_for('order.view_order', order_id=order_id))
     
-    order.complete()
+    with transaction():
+        order.complete()
     flash('Order has been marked as completed!', 'success')
     
     # Emit socket event to notify clients
@@ -60,7 +73,8 @@ def cancel_order(order_id):
         flash('This order is already completed or cancelled!', 'warning')
         return redirect(url_for('order.view_order', order_id=order_id))
     
-    order.cancel()
+    with transaction():
+        order.cancel()
     flash('Order has been cancelled!', 'success')
     
     # Emit socket event to notify clients
@@ -73,7 +87,18 @@ def cancel_order(order_id):
 @login_required
 def api_active_orders():
     """API endpoint for active orders."""
-    active_orders = Order.query.filter_by(status=OrderStatus.ACTIVE).all()
+    # Two queries regardless of how many orders are active: the orders with
+    # their tables, then every item of those orders with its menu item.
+    active_orders = Order.query.options(joinedload(Order.table)) \
+        .filter_by(status=OrderStatus.ACTIVE).all()
+    
+    items_by_order = {order.id: [] for order in active_orders}
+    if items_by_order:
+        order_items = OrderItem.query.options(joinedload(OrderItem.menu_item)) \
+            .filter(OrderItem.order_id.in_(list(items_by_order))) \
+            .order_by(OrderItem.id).all()
+        for item in order_items:
+            items_by_order[item.order_id].append(item)
     
     orders_data = []
     for order in active_orders:
@@ -82,12 +107,12 @@ def api_active_orders():
             'table_name': order.table.name if order.table else 'Delivery',
             'order_type': order.order_type.value,
             'created_at': order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'items_count': order.items.count(),
+            'items_count': order.items_count,
             'total_amount': order.total_amount,
             'items': []
         }
         
-        for item in order.items:
+        for item in items_by_order[order.id]:
             item_data = {
                 'id': item.id,
                 'name': item.menu_item.name,
@@ -104,6 +129,28 @@ def api_active_orders():
     return jsonify({'orders': orders_data})
 
 
+@order_bp.route('/api/completed')
+@login_required
+def api_completed_orders():
+    """API endpoint for completed orders, newest first, paged by cursor."""
+    try:
+        page = keyset_page(completed_orders_query(), Order, *page_args(request.args))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid cursor or page size'}), 400
+    
+    return jsonify({
+        'orders': [{
+            'id': order.id,
+            'table_name': order.table.name if order.table else 'Delivery',
+            'order_type': order.order_type.value,
+            'total_amount': order.total_amount,
+            'created_at': order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'completed_at': order.completed_at.strftime('%Y-%m-%d %H:%M:%S') if order.completed_at else None
+        } for order in page.items],
+        'next_cursor': page.next_cursor
+    })
+
+
 @socketio.on('connect')
 def handle_connect():
     """Handle socket connection."""
@@ -4,17 +4,170 @@ from app import db
 from app.models.table import Table
 from app.models.menu import Category, MenuItem
 from app.models.order import Order, OrderItem, OrderStatus, OrderType
+from app.services.writer import write_queue
 from app.utils.decorators import staff_required
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 
 staff_bp = Blueprint('staff', __name__, url_prefix='/staff')
 
 
+def parse_quantity(value):
+    """
+    Coerce a requested item quantity to a positive int.
+    
+    Raises:
+        ValueError: If the quantity is not a positive whole number
+    """
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid quantity: {value}')
+    if quantity < 1:
+        raise ValueError('Quantity must be at least 1')
+    return quantity
+
+
+def parse_flag(value, name):
+    """
+    Coerce a requested yes/no option, e.g. is_half, to a bool.
+    
+    Accepts JSON booleans, 0/1 and the strings true/false, yes/no, on/off
+    and 1/0 in any case; a missing value is False.
+    
+    Raises:
+        ValueError: If the value is none of these
+    """
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        flag = value.strip().lower()
+        if flag in ('true', 'yes', 'on', '1'):
+            return True
+        if flag in ('false', 'no', 'off', '0', ''):
+            return False
+    raise ValueError(f'Invalid {name}: {value}')
+
+
+def build_order_items(items):
+    """
+    Validate and price a batch of requested order items.
+    
+    All referenced menu items are resolved with a single IN query.
+    
+    Args:
+        items (list): Item dicts with menu_item_id, quantity, is_half and notes
+        
+    Returns:
+        tuple: (list of OrderItem column dicts, error_message)
+        
+    Raises:
+        ValueError: If a quantity is not a positive whole number or is_half is not a yes/no value
+    """
+    try:
+        menu_item_ids = {int(item_data.get('menu_item_id')) for item_data in items}
+    except (TypeError, ValueError):
+        return None, 'Invalid menu item'
+    
+    menu_items = {
+        menu_item.id: menu_item
+        for menu_item in MenuItem.query.filter(MenuItem.id.in_(menu_item_ids)).all()
+    }
+    missing_ids = menu_item_ids - menu_items.keys()
+    if missing_ids:
+        return None, f"Menu item not found: {', '.join(str(i) for i in sorted(missing_ids))}"
+    
+    order_items = []
+    for item_data in items:
+        menu_item = menu_items[int(item_data.get('menu_item_id'))]
+        is_half = parse_flag(item_data.get('is_half'), 'is_half')
+        
+        # Determine price
+        price = menu_item.half_price if is_half and menu_item.half_price else menu_item.full_price
+        
+        order_items.append({
+            'menu_item_id': menu_item.id,
+            'quantity': parse_quantity(item_data.get('quantity', 1)),
+            'is_half': is_half,
+            'price': price,
+            'notes': item_data.get('notes', '')
+        })
+    
+    return order_items, None
+
+
+def place_order(table_id, user_id, order_items):
+    """
+    Stage order items for a table, opening a new order if it has no active one.
+    
+    Runs as a write_queue job.
+    
+    Args:
+        table_id (int): The table the order is for
+        user_id (int): The staff member placing the order
+        order_items (list): Item dicts from build_order_items
+        
+    Returns:
+        int: The ID of the order the items were added to
+    """
+    table = db.session.get(Table, table_id)
+    
+    # Check if table already has an active order
+    order = Order.query.filter_by(
+        table_id=table_id,
+        status=OrderStatus.ACTIVE
+    ).first()
+    
+    if not order:
+        # Create new order
+        order = Order(
+            table_id=table_id,
+            user_id=user_id,
+            status=OrderStatus.ACTIVE,
+            order_type=OrderType.DINE_IN
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(order)
+                db.session.flush()  # Check uq_orders_active_table now
+        except IntegrityError:
+            # Another worker opened the table's order in the meantime; add to it
+            order = Order.query.filter_by(
+                table_id=table_id,
+                status=OrderStatus.ACTIVE
+            ).one()
+        
+        # Mark table as occupied
+        table.is_occupied = True
+    
+    order.add_items(order_items)
+    return order.id
+
+
+def append_order_items(order_id, order_items):
+    """
+    Stage order items on an existing order if it is still active.
+    
+    Runs as a write_queue job.
+    
+    Returns:
+        bool: False if the order was completed or cancelled in the meantime
+    """
+    order = db.session.get(Order, order_id)
+    if order.status != OrderStatus.ACTIVE:
+        return False
+    
+    order.add_items(order_items)
+    return True
+
+
 @staff_bp.route('/')
 @login_required
 def dashboard():
     """Staff dashboard route."""
-    tables = Table.query.all()
+    tables = Table.all_with_active_orders()
     return render_template('staff/dashboard.html', tables=tables)
 
 
@@ -51,59 +204,21 @@ def create_order():
     # Check if table exists
     table = Table.query.get_or_404(table_id)
     
-    # Check if table already has an active order
-    existing_order = Order.query.filter_by(
-        table_id=table_id,
-        status=OrderStatus.ACTIVE
-    ).first()
-    
-    if existing_order:
-        # Add items to existing order
-        order = existing_order
-    else:
-        # Create new order
-        order = Order(
-            table_id=table_id,
-            user_id=current_user.id,
-            status=OrderStatus.ACTIVE,
-            order_type=OrderType.DINE_IN
-        )
-        db.session.add(order)
-        db.session.flush()  # Get order ID
-        
-        # Mark table as occupied
-        table.is_occupied = True
-    
-    # Add items to order
-    for item_data in items:
-        menu_item_id = item_data.get('menu_item_id')
-        quantity = item_data.get('quantity', 1)
-        is_half = item_data.get('is_half', False)
-        notes = item_data.get('notes', '')
-        
-        # Get menu item
-        menu_item = MenuItem.query.get_or_404(menu_item_id)
-        
-        # Determine price
-        price = menu_item.half_price if is_half and menu_item.half_price else menu_item.full_price
-        
-        # Create order item
-        order_item = OrderItem(
-            order_id=order.id,
-            menu_item_id=menu_item_id,
-            quantity=quantity,
-            is_half=is_half,
-            price=price,
-            notes=notes
-        )
-        db.session.add(order_item)
+    # Resolve all menu items up front
+    try:
+        order_items, error = build_order_items(items)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if error:
+        return jsonify({'success': False, 'message': error}), 404
     
-    db.session.commit()
+    # Create the order (or add to the table's active one) and commit
+    order_id = write_queue.run(place_order, table.id, current_user.id, order_items)
     
     return jsonify({
         'success': True, 
         'message': 'Order created successfully',
-        'order_id': order.id
+        'order_id': order_id
     })
 
 
@@ -120,6 +235,12 @@ def add_order_item(order_id):
     if not menu_item_id:
         return jsonify({'success': False, 'message': 'Missing required data'}), 400
     
+    try:
+        quantity = parse_quantity(quantity)
+        is_half = parse_flag(is_half, 'is_half')
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
     # Check if order exists
     order = Order.query.get_or_404(order_id)
     
@@ -135,14 +256,13 @@ def add_order_item(order_id):
     
     # Create order item
     order_item = OrderItem(
-        order_id=order.id,
         menu_item_id=menu_item_id,
         quantity=quantity,
         is_half=is_half,
         price=price,
         notes=notes
     )
-    db.session.add(order_item)
+    order.add_item(order_item)
     db.session.commit()
     
     return jsonify({
@@ -152,6 +272,40 @@ def add_order_item(order_id):
     })
 
 
+@staff_bp.route('/orders/<int:order_id>/add_items', methods=['POST'])
+@login_required
+def add_order_items(order_id):
+    """Add several items to an existing order in one request."""
+    data = request.json
+    items = data.get('items', [])
+    
+    if not items:
+        return jsonify({'success': False, 'message': 'Missing required data'}), 400
+    
+    # Check if order exists
+    order = Order.query.get_or_404(order_id)
+    
+    # Check if order is active
+    if order.status != OrderStatus.ACTIVE:
+        return jsonify({'success': False, 'message': 'Cannot add items to a completed or cancelled order'}), 400
+    
+    try:
+        order_items, error = build_order_items(items)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if error:
+        return jsonify({'success': False, 'message': error}), 404
+    
+    if not write_queue.run(append_order_items, order.id, order_items):
+        return jsonify({'success': False, 'message': 'Cannot add items to a completed or cancelled order'}), 400
+    
+    return jsonify({
+        'success': True, 
+        'message': 'Items added to order successfully',
+        'items_added': len(order_items)
+    })
+
+
 @staff_bp.route('/orders/<int:order_id>/remove_item/<int:item_id>', methods=['POST'])
 @login_required
 def remove_order_item(order_id, item_id):
@@ -171,7 +325,7 @@ def remove_order_item(order_id, item_id):
         return jsonify({'success': False, 'message': 'Item does not belong to this order'}), 400
     
     # Remove order item
-    db.session.delete(order_item)
+    order.remove_item(order_item)
     db.session.commit()
     
     return jsonify({
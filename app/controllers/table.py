@@ -81,7 +81,7 @@ def delete_table(table_id):
 @login_required
 def api_table_status():
     """API endpoint for table statuses."""
-    tables = Table.query.all()
+    tables = Table.all_with_active_orders()
     return jsonify({
         'tables': [{
             'id': table.id,
@@ -17,6 +17,7 @@ class MenuItemForm(FlaskForm):
     has_half_option = BooleanField('Has Half Option')
     half_price = FloatField('Half Price', validators=[DataRequired(), NumberRange(min=0)])
     full_price = FloatField('Full Price', validators=[DataRequired(), NumberRange(min=0)])
+    cost_price = FloatField('Cost Price (full portion)', validators=[Optional(), NumberRange(min=0)])
     category_id = SelectField('Category', coerce=int, validators=[DataRequired()])
     is_available = BooleanField('Available', default=True)
     image_url = StringField('Image URL', validators=[Optional(), Length(max=255)])
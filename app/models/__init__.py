@@ -3,8 +3,13 @@ from app.models.menu import Category, MenuItem
 from app.models.table import Table
 from app.models.order import Order, OrderItem, OrderStatus, OrderType
 from app.models.bill import Bill, PaymentMethod
-from app.models.delivery import DeliveryOrder, DeliveryPlatform, DeliveryStatus
+from app.models.delivery import DeliveryItemMapping, DeliveryOrder, DeliveryPlatform, DeliveryStatus
 from app.models.settings import Settings
+from app.models.sequence import Sequence
+from app.models.sales import DailySales, ItemSales
+from app.models.job import Job, JobStatus
+from app.models.webhook import WebhookEvent, WebhookStatus
+from app.models.outbox import OutboxState, StatusUpdate
 
 __all__ = [
     'User',
@@ -17,7 +22,18 @@ __all__ = [
     'OrderType',
     'Bill',
     'PaymentMethod',
+    'DeliveryItemMapping',
     'DeliveryOrder',
     'DeliveryPlatform',
-    'DeliveryStatus'
+    'DeliveryStatus',
+    'Settings',
+    'Sequence',
+    'DailySales',
+    'ItemSales',
+    'Job',
+    'JobStatus',
+    'WebhookEvent',
+    'WebhookStatus',
+    'OutboxState',
+    'StatusUpdate'
 ]
@@ -1,7 +1,11 @@
 from app import db
+from app.models.sequence import Sequence
 from datetime import datetime
 import enum
 
+# Native sequence used for bill numbers on PostgreSQL (ignored by other dialects)
+bill_number_seq = db.Sequence('bill_number_seq', metadata=db.metadata)
+
 class PaymentMethod(enum.Enum):
     """Enum for payment methods."""
     CASH = "cash"
@@ -14,6 +18,10 @@ class PaymentMethod(enum.Enum):
 class Bill(db.Model):
     """Bill model for restaurant bills."""
     __tablename__ = 'bills'
+    __table_args__ = (
+        db.Index('ix_bills_created_at_payment_status', 'created_at', 'payment_status'),
+        db.Index('ix_bills_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), unique=True, nullable=False)
@@ -24,7 +32,7 @@ class Bill(db.Model):
     total_amount = db.Column(db.Float, nullable=False)
     payment_method = db.Column(db.Enum(PaymentMethod), nullable=True)
     payment_status = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     paid_at = db.Column(db.DateTime, nullable=True)
     
     # Relationships
@@ -35,22 +43,35 @@ class Bill(db.Model):
     
     @classmethod
     def generate_bill_number(cls):
-        """Generate a unique bill number."""
-        last_bill = cls.query.order_by(cls.id.desc()).first()
-        if last_bill:
-            last_number = int(last_bill.bill_number[4:])
-            new_number = last_number + 1
+        """Generate a unique bill number.
+        
+        Numbers come from a native sequence on PostgreSQL and from the
+        'bill_number' counter elsewhere, so concurrent checkouts never
+        collide. Numbers may have gaps but are never reused.
+        """
+        if db.engine.dialect.name == 'postgresql':
+            new_number = db.session.execute(bill_number_seq.next_value()).scalar()
         else:
-            new_number = 1
+            new_number = Sequence.allocate('bill_number', cls._first_bill_number)
         
         return f"BILL{new_number:06d}"
     
+    @classmethod
+    def _first_bill_number(cls):
+        """Return the number after the highest existing bill, used to seed the counter."""
+        last_number = db.session.query(
+            db.func.max(db.cast(db.func.substr(cls.bill_number, 5), db.Integer))
+        ).scalar()
+        return (last_number or 0) + 1
+    
     def mark_as_paid(self, payment_method):
-        """Mark the bill as paid."""
+        """Mark the bill as paid and add it to the daily sales rollup. The caller commits the session."""
+        from app.models.sales import DailySales
+        
         if isinstance(payment_method, str):
             payment_method = PaymentMethod(payment_method)
         
         self.payment_method = payment_method
         self.payment_status = True
         self.paid_at = datetime.utcnow()
-        db.session.commit() 
\ No newline at end of file
+        DailySales.record(self) 
\ No newline at end of file
@@ -22,6 +22,11 @@ class DeliveryStatus(enum.Enum):
 class DeliveryOrder(db.Model):
     """DeliveryOrder model for delivery orders."""
     __tablename__ = 'delivery_orders'
+    __table_args__ = (
+        db.Index('ix_delivery_orders_status_created_at', 'status', 'created_at'),
+        db.Index('ix_delivery_orders_status_updated_at', 'status', 'updated_at'),
+        db.Index('ix_delivery_orders_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     platform = db.Column(db.Enum(DeliveryPlatform), nullable=False)
@@ -37,25 +42,38 @@ class DeliveryOrder(db.Model):
     driver_name = db.Column(db.String(100), nullable=True)
     driver_phone = db.Column(db.String(20), nullable=True)
     items_data = db.Column(db.Text, nullable=True)  # JSON string of order items from delivery platform
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def __repr__(self):
         return f'<DeliveryOrder {self.platform.value} #{self.platform_order_id}>'
     
     def accept(self):
-        """Accept the delivery order."""
+        """Accept the delivery order. The caller commits the session."""
         self.status = DeliveryStatus.ACCEPTED
-        db.session.commit()
     
     def reject(self):
-        """Reject/cancel the delivery order."""
+        """Reject/cancel the delivery order. The caller commits the session."""
         self.status = DeliveryStatus.CANCELLED
-        db.session.commit()
     
     def update_status(self, status):
-        """Update the delivery order status."""
+        """Update the delivery order status. The caller commits the session."""
         if isinstance(status, str):
             status = DeliveryStatus(status)
         self.status = status
-        db.session.commit()
\ No newline at end of file
+
+class DeliveryItemMapping(db.Model):
+    """DeliveryItemMapping model for platform item names that staff matched to menu items."""
+    __tablename__ = 'delivery_item_mappings'
+    __table_args__ = (
+        db.UniqueConstraint('platform', 'item_name', name='uq_delivery_item_mappings_platform_item_name'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    platform = db.Column(db.Enum(DeliveryPlatform), nullable=False)
+    item_name = db.Column(db.String(200), nullable=False)  # Normalized, see menu_matcher.normalize
+    menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_items.id', ondelete='CASCADE'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DeliveryItemMapping {self.platform.value} {self.item_name!r} -> {self.menu_item_id}>'
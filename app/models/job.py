@@ -0,0 +1,55 @@
+from app import db
+from datetime import datetime
+import enum
+import json
+
+
+class JobStatus(enum.Enum):
+    """Enum for background job status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job(db.Model):
+    """Job model for work run in the background, such as large exports."""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_jobs_status_updated_at', 'status', 'updated_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    params = db.Column(db.Text, nullable=True)  # JSON
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    progress = db.Column(db.Integer, nullable=False, default=0)  # Percent
+    result_path = db.Column(db.String(255), nullable=True)
+    result_name = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<Job #{self.id} {self.kind} {self.status}>'
+    
+    def get_params(self):
+        """Get the job parameters as a dictionary."""
+        return json.loads(self.params) if self.params else {}
+    
+    def to_dict(self):
+        """Convert the job to a dictionary for API responses."""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.get_params(),
+            'status': self.status.value,
+            'progress': self.progress,
+            'result_name': self.result_name,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -26,6 +26,7 @@ class MenuItem(db.Model):
     description = db.Column(db.Text, nullable=True)
     half_price = db.Column(db.Float, nullable=True)  # Price for half quantity
     full_price = db.Column(db.Float, nullable=False)  # Price for full quantity
+    cost_price = db.Column(db.Float, nullable=True)  # Cost of a full portion, for margin reports
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
     is_available = db.Column(db.Boolean, default=True)
     image_url = db.Column(db.String(255), nullable=True)
@@ -20,6 +20,16 @@ class OrderType(enum.Enum):
 class Order(db.Model):
     """Order model for restaurant orders."""
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('ix_orders_table_id_status', 'table_id', 'status'),
+        # At most one active order per table (partial indexes are SQLite/PostgreSQL only)
+        db.Index(
+            'uq_orders_active_table', 'table_id', unique=True,
+            sqlite_where=db.text("status = 'ACTIVE'"),
+            postgresql_where=db.text("status = 'ACTIVE'")
+        ).ddl_if(dialect=('sqlite', 'postgresql')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     table_id = db.Column(db.Integer, db.ForeignKey('tables.id'), nullable=True)  # Nullable for delivery orders
@@ -31,7 +41,9 @@ class Order(db.Model):
     customer_phone = db.Column(db.String(20), nullable=True)  # For delivery orders
     customer_address = db.Column(db.Text, nullable=True)  # For delivery orders
     notes = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    items_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Maintained by add_item/remove_item
+    total_amount = db.Column(db.Float, nullable=False, default=0.0, server_default='0')  # Maintained by add_item/remove_item
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
     
     # Relationships
@@ -40,25 +52,78 @@ class Order(db.Model):
     def __repr__(self):
         return f'<Order #{self.id}>'
     
-    @property
-    def total_amount(self):
-        """Calculate the total amount for the order."""
-        return sum(item.subtotal for item in self.items)
+    def add_item(self, order_item):
+        """Add an item to the order and update the stored totals."""
+        self.items.append(order_item)
+        self._add_to_totals(1, order_item.subtotal)
+    
+    def add_items(self, items):
+        """
+        Bulk-insert several items into the order, updating the stored totals once.
+        
+        Args:
+            items (list): Dicts of OrderItem column values (without order_id)
+        """
+        self._add_to_totals(len(items), sum(item['price'] * item['quantity'] for item in items))
+        
+        if self.id is None:
+            db.session.flush()  # Get order ID
+        
+        db.session.execute(db.insert(OrderItem), [dict(item, order_id=self.id) for item in items])
+    
+    def remove_item(self, order_item):
+        """Remove an item from the order and update the stored totals."""
+        db.session.delete(order_item)
+        self._add_to_totals(-1, -order_item.subtotal)
+    
+    def _add_to_totals(self, count, amount):
+        """
+        Add to the stored item count and total, never taking them below zero.
+        
+        A saved order is updated in SQL (items_count = items_count + count)
+        rather than from the values loaded in Python, so concurrent changes to
+        the same order are not lost. Its totals are reloaded on next access.
+        """
+        if self.id is None:
+            self.items_count = max((self.items_count or 0) + count, 0)
+            self.total_amount = max((self.total_amount or 0.0) + amount, 0.0)
+            return
+        
+        items_count = Order.items_count + count
+        total_amount = Order.total_amount + amount
+        db.session.execute(
+            db.update(Order).where(Order.id == self.id).values(
+                items_count=db.case((items_count > 0, items_count), else_=0),
+                total_amount=db.case((total_amount > 0, total_amount), else_=0.0)
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.expire(self, ['items_count', 'total_amount'])
+    
+    def recalculate_totals(self):
+        """Recompute the stored item count and total from the order items."""
+        count, total = db.session.query(
+            db.func.count(OrderItem.id),
+            db.func.coalesce(db.func.sum(OrderItem.price * OrderItem.quantity), 0.0)
+        ).filter(OrderItem.order_id == self.id).one()
+        self.items_count = count
+        self.total_amount = total
     
     def complete(self):
-        """Mark the order as completed."""
+        """Mark the order as completed and add it to the item sales rollup. The caller commits the session."""
+        from app.models.sales import ItemSales
+        
+        if self.status != OrderStatus.COMPLETED:
+            ItemSales.record(self)
         self.status = OrderStatus.COMPLETED
         self.completed_at = datetime.utcnow()
         if self.table:
             self.table.is_occupied = False
-        db.session.commit()
     
     def cancel(self):
-        """Cancel the order."""
+        """Cancel the order. The caller commits the session."""
         self.status = OrderStatus.CANCELLED
         if self.table:
             self.table.is_occupied = False
-        db.session.commit()
 
 
 class OrderItem(db.Model):
@@ -66,8 +131,8 @@ class OrderItem(db.Model):
     __tablename__ = 'order_items'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
-    menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_items.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_items.id'), nullable=False, index=True)
     quantity = db.Column(db.Integer, default=1)
     is_half = db.Column(db.Boolean, default=False)  # Whether it's half quantity
     price = db.Column(db.Float, nullable=False)  # Price at the time of order
@@ -0,0 +1,38 @@
+from app import db
+from app.models.delivery import DeliveryPlatform, DeliveryStatus
+from datetime import datetime
+import enum
+
+
+class OutboxState(enum.Enum):
+    """Enum for outbound status update state."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    SUPERSEDED = "superseded"  # A newer status of the same order replaced it
+    FAILED = "failed"  # Dead letter, until retried by hand
+
+
+class StatusUpdate(db.Model):
+    """StatusUpdate model for delivery order status changes waiting to be pushed to the platform."""
+    __tablename__ = 'status_outbox'
+    __table_args__ = (
+        db.Index('ix_status_outbox_state_next_attempt_at', 'state', 'next_attempt_at'),
+        db.Index('ix_status_outbox_delivery_order_id_id', 'delivery_order_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    delivery_order_id = db.Column(db.Integer, db.ForeignKey('delivery_orders.id', ondelete='CASCADE'), nullable=False)
+    platform = db.Column(db.Enum(DeliveryPlatform), nullable=False)
+    platform_order_id = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.Enum(DeliveryStatus), nullable=False)  # The status to push
+    state = db.Column(db.Enum(OutboxState), nullable=False, default=OutboxState.PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<StatusUpdate #{self.id} {self.platform_order_id} {self.status} {self.state}>'
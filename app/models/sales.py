@@ -0,0 +1,231 @@
+from app import db
+from app.models.bill import Bill, PaymentMethod
+from app.models.menu import MenuItem
+from app.models.order import Order, OrderItem, OrderStatus
+from datetime import datetime, time, timedelta
+from sqlalchemy.exc import IntegrityError
+
+
+def day_of(column):
+    """Return a SQL expression truncating a datetime column to its date."""
+    if db.engine.dialect.name == 'sqlite':
+        return db.func.date(column)
+    return db.cast(column, db.Date)
+
+
+def increment(model, key, values):
+    """
+    Add values to the counters of a rollup row, creating the row if needed.
+
+    Args:
+        model: The rollup model
+        key (dict): Primary key column values of the row
+        values (dict): Counter column names mapped to the amounts to add
+    """
+    table = model.__table__
+    where = [table.c[name] == value for name, value in key.items()]
+    update = table.update().where(*where).values({
+        name: table.c[name] + amount for name, amount in values.items()
+    })
+    if db.session.execute(update).rowcount:
+        return
+
+    insert = table.insert().values(**key, **values)
+    if db.engine.dialect.name == 'sqlite':
+        # The UPDATE above already holds SQLite's write lock, so nobody can race us
+        db.session.execute(insert)
+        return
+
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert)
+    except IntegrityError:
+        # Another worker created the row first; add to it instead
+        db.session.execute(update)
+
+
+def date_bounds(column, start=None, end=None):
+    """Build filters restricting a datetime column to whole days from start to end inclusive."""
+    filters = []
+    if start:
+        filters.append(column >= datetime.combine(start, time.min))
+    if end:
+        filters.append(column < datetime.combine(end + timedelta(days=1), time.min))
+    return filters
+
+
+class DailySales(db.Model):
+    """Paid bill totals per day and payment method, maintained as bills are paid."""
+    __tablename__ = 'daily_sales'
+
+    date = db.Column(db.Date, primary_key=True)
+    payment_method = db.Column(db.Enum(PaymentMethod), primary_key=True)
+    bills_count = db.Column(db.Integer, nullable=False, default=0)
+    subtotal = db.Column(db.Float, nullable=False, default=0.0)
+    tax_amount = db.Column(db.Float, nullable=False, default=0.0)
+    discount = db.Column(db.Float, nullable=False, default=0.0)
+    total_amount = db.Column(db.Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f'<DailySales {self.date} {self.payment_method}>'
+
+    @classmethod
+    def record(cls, bill):
+        """Add a newly paid bill to its day's totals. The caller commits the session."""
+        increment(cls, {
+            'date': (bill.created_at or datetime.utcnow()).date(),
+            'payment_method': bill.payment_method
+        }, {
+            'bills_count': 1,
+            'subtotal': bill.subtotal,
+            'tax_amount': bill.tax_amount,
+            'discount': bill.discount or 0.0,
+            'total_amount': bill.total_amount
+        })
+
+    @classmethod
+    def total_between(cls, start, end):
+        """
+        Get the total paid bill amount for a range of days.
+
+        Args:
+            start (date): First day of the range
+            end (date): Last day of the range, inclusive
+
+        Returns:
+            float: The summed bill totals
+        """
+        return db.session.query(db.func.sum(cls.total_amount)).filter(
+            cls.date.between(start, end)
+        ).scalar() or 0
+
+    @classmethod
+    def rebuild(cls, start=None, end=None):
+        """
+        Recompute the rollup from the bills table. The caller commits the session.
+
+        Args:
+            start (date): First day to rebuild, or None for all history
+            end (date): Last day to rebuild, inclusive, or None for all history
+        """
+        delete = db.delete(cls)
+        if start:
+            delete = delete.where(cls.date >= start)
+        if end:
+            delete = delete.where(cls.date <= end)
+        db.session.execute(delete)
+
+        day = day_of(Bill.created_at)
+        totals = db.select(
+            day,
+            Bill.payment_method,
+            db.func.count(Bill.id),
+            db.func.sum(Bill.subtotal),
+            db.func.sum(Bill.tax_amount),
+            db.func.sum(db.func.coalesce(Bill.discount, 0.0)),
+            db.func.sum(Bill.total_amount)
+        ).where(
+            Bill.payment_status == True,
+            Bill.payment_method.isnot(None),
+            *date_bounds(Bill.created_at, start, end)
+        ).group_by(day, Bill.payment_method)
+
+        db.session.execute(db.insert(cls).from_select(
+            ['date', 'payment_method', 'bills_count', 'subtotal', 'tax_amount', 'discount', 'total_amount'],
+            totals
+        ))
+
+
+class ItemSales(db.Model):
+    """Quantity and revenue per day and menu item, maintained as orders complete."""
+    __tablename__ = 'item_sales'
+    # Store rows in primary key order so date range scans read contiguous pages
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    date = db.Column(db.Date, primary_key=True)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey('menu_items.id'), primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f'<ItemSales {self.date} {self.menu_item_id}>'
+
+    @classmethod
+    def record(cls, order):
+        """Add a newly completed order's items to its day's totals. The caller commits the session."""
+        day = (order.created_at or datetime.utcnow()).date()
+        totals = db.session.query(
+            OrderItem.menu_item_id,
+            db.func.sum(OrderItem.quantity),
+            db.func.sum(OrderItem.price * OrderItem.quantity)
+        ).filter(OrderItem.order_id == order.id).group_by(OrderItem.menu_item_id).all()
+
+        for menu_item_id, quantity, revenue in totals:
+            increment(cls, {'date': day, 'menu_item_id': menu_item_id}, {
+                'quantity': quantity or 0,
+                'revenue': revenue or 0.0
+            })
+
+    @classmethod
+    def top(cls, start, end, limit=5):
+        """
+        Get the best-selling menu items for a range of days.
+
+        Args:
+            start (date): First day of the range
+            end (date): Last day of the range, inclusive
+            limit (int): Number of items to return
+
+        Returns:
+            list: Rows with menu_item_id, name, total_quantity and total_revenue
+        """
+        # Rank on the rollup alone, then look up names for the top rows only
+        total_quantity = db.func.sum(cls.quantity).label('total_quantity')
+        ranked = db.session.query(
+            cls.menu_item_id,
+            total_quantity,
+            db.func.sum(cls.revenue).label('total_revenue')
+        ).filter(cls.date.between(start, end)) \
+            .group_by(cls.menu_item_id) \
+            .order_by(total_quantity.desc()) \
+            .limit(limit).subquery()
+
+        return db.session.query(
+            ranked.c.menu_item_id,
+            MenuItem.name,
+            ranked.c.total_quantity,
+            ranked.c.total_revenue
+        ).join(MenuItem, MenuItem.id == ranked.c.menu_item_id) \
+            .order_by(ranked.c.total_quantity.desc()).all()
+
+    @classmethod
+    def rebuild(cls, start=None, end=None):
+        """
+        Recompute the rollup from completed orders. The caller commits the session.
+
+        Args:
+            start (date): First day to rebuild, or None for all history
+            end (date): Last day to rebuild, inclusive, or None for all history
+        """
+        delete = db.delete(cls)
+        if start:
+            delete = delete.where(cls.date >= start)
+        if end:
+            delete = delete.where(cls.date <= end)
+        db.session.execute(delete)
+
+        day = day_of(Order.created_at)
+        totals = db.select(
+            day,
+            OrderItem.menu_item_id,
+            db.func.sum(OrderItem.quantity),
+            db.func.sum(OrderItem.price * OrderItem.quantity)
+        ).join(Order, OrderItem.order_id == Order.id).where(
+            Order.status == OrderStatus.COMPLETED,
+            *date_bounds(Order.created_at, start, end)
+        ).group_by(day, OrderItem.menu_item_id)
+
+        db.session.execute(db.insert(cls).from_select(
+            ['date', 'menu_item_id', 'quantity', 'revenue'],
+            totals
+        ))
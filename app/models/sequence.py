@@ -0,0 +1,84 @@
+from app import db
+from sqlalchemy.exc import IntegrityError
+import threading
+
+# Numbers reserved per round trip; unused numbers are lost when a worker exits
+BLOCK_SIZE = 20
+
+_blocks = {}
+_blocks_lock = threading.Lock()
+
+
+class Sequence(db.Model):
+    """Named counter that hands out numbers to workers in blocks."""
+    __tablename__ = 'sequences'
+
+    name = db.Column(db.String(64), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f'<Sequence {self.name}={self.next_value}>'
+
+    @classmethod
+    def _reserve(cls, conn, name, count, initial_value):
+        """Bump the counter row by count with a single UPDATE and return the first reserved number."""
+        table = cls.__table__
+        updated = conn.execute(
+            table.update()
+            .where(table.c.name == name)
+            .values(next_value=table.c.next_value + count)
+        ).rowcount
+        if updated:
+            end = conn.execute(
+                db.select(table.c.next_value).where(table.c.name == name)
+            ).scalar()
+            return end - count
+
+        start = initial_value()
+        conn.execute(table.insert().values(name=name, next_value=start + count))
+        return start
+
+    @classmethod
+    def _reserve_block(cls, name, initial_value):
+        """Reserve the next block of numbers in a short transaction of its own.
+
+        Concurrent workers always receive disjoint blocks and never need to
+        read the table the numbers are used in.
+        """
+        for attempt in range(2):
+            try:
+                with db.engine.begin() as conn:
+                    return cls._reserve(conn, name, BLOCK_SIZE, initial_value)
+            except IntegrityError:
+                # Another worker created the counter row first; bump it instead
+                if attempt:
+                    raise
+
+    @classmethod
+    def allocate(cls, name, initial_value=lambda: 1):
+        """
+        Allocate the next number from a named sequence.
+
+        SQLite allows a single writer, so there the counter is bumped inside
+        the caller's transaction: the write lock serializes allocations and a
+        rollback returns the number. Other databases reserve blocks of
+        numbers on a separate connection and hand them out from memory.
+
+        Args:
+            name (str): The sequence name
+            initial_value (callable): Returns the first number if the sequence does not exist yet
+
+        Returns:
+            int: A number never handed out before by this sequence
+        """
+        if db.engine.dialect.name == 'sqlite':
+            return cls._reserve(db.session.connection(), name, 1, initial_value)
+
+        key = (str(db.engine.url), name)
+        with _blocks_lock:
+            next_value, end = _blocks.get(key, (0, 0))
+            if next_value >= end:
+                next_value = cls._reserve_block(name, initial_value)
+                end = next_value + BLOCK_SIZE
+            _blocks[key] = (next_value + 1, end)
+        return next_value
@@ -1,5 +1,23 @@
 from app import db
 from datetime import datetime
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import threading
+
+# Reserved key whose value is bumped on every write, so each worker can tell
+# whether its in-process copy of the settings table is still current.
+VERSION_KEY = '_settings_version'
+
+# Session.info key set while a session holds uncommitted settings changes
+CHANGED_KEY = 'settings_changed'
+
+_UNLOADED = object()
+
+_cache = {}
+_cache_version = _UNLOADED
+_cache_lock = threading.Lock()
+
 
 class Settings(db.Model):
     """Settings model for restaurant configuration."""
@@ -13,22 +31,114 @@ class Settings(db.Model):
     def __repr__(self):
         return f'<Setting {self.key}>'
     
+    @classmethod
+    def _load(cls):
+        """Return the cached settings, reloading them if another worker changed them.
+        
+        The version row is checked at most once per app context (i.e. once per
+        request), so repeated reads within a request never touch the database.
+        While the session holds uncommitted changes, they are read straight
+        from the database and never published to the shared cache.
+        """
+        global _cache, _cache_version
+        
+        if db.session.info.get(CHANGED_KEY):
+            return {key: value for key, value in db.session.query(cls.key, cls.value)}
+        
+        if has_app_context() and g.get('_settings_checked'):
+            return _cache
+        
+        version = db.session.query(cls.value).filter_by(key=VERSION_KEY).scalar()
+        if version != _cache_version:
+            with _cache_lock:
+                rows = db.session.query(cls.key, cls.value).all()
+                _cache = {key: value for key, value in rows}
+                _cache_version = _cache.get(VERSION_KEY)
+        
+        if has_app_context():
+            g._settings_checked = True
+        return _cache
+    
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop the in-process settings cache so the next read reloads it."""
+        global _cache_version
+        with _cache_lock:
+            _cache_version = _UNLOADED
+        if has_app_context():
+            g.pop('_settings_checked', None)
+    
+    @classmethod
+    def _bump_version(cls):
+        """Increment the settings version so every worker reloads its cache once the change is committed."""
+        updated = cls.query.filter_by(key=VERSION_KEY).update(
+            {cls.value: db.cast(db.cast(cls.value, db.Integer) + 1, db.Text)},
+            synchronize_session=False
+        )
+        if not updated:
+            db.session.add(cls(key=VERSION_KEY, value='1'))
+        db.session.info[CHANGED_KEY] = True
+    
     @classmethod
     def get(cls, key, default=None):
         """Get a setting value by key."""
-        setting = cls.query.filter_by(key=key).first()
-        if setting:
-            return setting.value
+        settings = cls._load()
+        if key in settings:
+            return settings[key]
         return default
     
+    @classmethod
+    def get_many(cls, defaults):
+        """Get several setting values at once.
+        
+        Args:
+            defaults (dict): Mapping of setting keys to their default values
+        
+        Returns:
+            dict: Mapping of each requested key to its value or default
+        """
+        settings = cls._load()
+        return {key: settings.get(key, default) for key, default in defaults.items()}
+    
     @classmethod
     def set(cls, key, value):
-        """Set a setting value."""
+        """Set a setting value. The caller commits the session."""
         setting = cls.query.filter_by(key=key).first()
         if setting:
             setting.value = value
         else:
             setting = cls(key=key, value=value)
             db.session.add(setting)
-        db.session.commit()
-        return setting 
\ No newline at end of file
+        cls._bump_version()
+        return setting
+    
+    @classmethod
+    def set_many(cls, values):
+        """Upsert several setting values in one query. The caller commits the session.
+        
+        Args:
+            values (dict): Mapping of setting keys to their new values
+        """
+        existing = {
+            setting.key: setting
+            for setting in cls.query.filter(cls.key.in_(list(values))).all()
+        }
+        for key, value in values.items():
+            if key in existing:
+                existing[key].value = value
+            else:
+                db.session.add(cls(key=key, value=value))
+        cls._bump_version()
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    """Drop this worker's settings cache once staged settings changes are committed."""
+    if session.info.pop(CHANGED_KEY, False):
+        Settings.invalidate_cache()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_changes(session):
+    """Rolled back settings changes leave the cache as it was."""
+    session.info.pop(CHANGED_KEY, None)
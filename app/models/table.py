@@ -1,6 +1,8 @@
 from app import db
 from datetime import datetime
 
+_NOT_LOADED = object()
+
 class Table(db.Model):
     """Table model for restaurant tables."""
     __tablename__ = 'tables'
@@ -21,12 +23,41 @@ class Table(db.Model):
     def status(self):
         """Return the status of the table."""
         if self.is_occupied:
-            active_order = self.get_active_order()
-            if active_order:
-                return f"Occupied - Order #{active_order.id}"
+            active_order_id = getattr(self, '_active_order_id', _NOT_LOADED)
+            if active_order_id is _NOT_LOADED:
+                active_order = self.get_active_order()
+                active_order_id = active_order.id if active_order else None
+            if active_order_id:
+                return f"Occupied - Order #{active_order_id}"
             return "Occupied"
         return "Available"
     
+    @classmethod
+    def all_with_active_orders(cls):
+        """
+        Get all tables with their active order preloaded in a single query.
+        
+        Returns:
+            list: Tables whose status can be rendered without further queries
+        """
+        from app.models.order import Order, OrderStatus
+        rows = db.session.query(cls, Order.id).outerjoin(
+            Order,
+            db.and_(Order.table_id == cls.id, Order.status == OrderStatus.ACTIVE)
+        ).order_by(cls.id, Order.id).all()
+        
+        tables = []
+        seen = set()
+        for table, active_order_id in rows:
+            # Keep the oldest active order if a table somehow has several. The
+            # instances come from the identity map, so a value set by an
+            # earlier call in the session is overwritten, not trusted.
+            if table.id not in seen:
+                seen.add(table.id)
+                table._active_order_id = active_order_id
+                tables.append(table)
+        return tables
+    
     def get_active_order(self):
         """Get the active order for this table, if any."""
         from app.models.order import Order, OrderStatus
@@ -0,0 +1,34 @@
+from app import db
+from app.models.delivery import DeliveryPlatform
+from datetime import datetime
+import enum
+
+
+class WebhookStatus(enum.Enum):
+    """Enum for received webhook status."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    FAILED = "failed"
+
+
+class WebhookEvent(db.Model):
+    """WebhookEvent model for raw delivery platform webhooks awaiting processing."""
+    __tablename__ = 'webhook_events'
+    __table_args__ = (
+        db.Index('ix_webhook_events_status_updated_at', 'status', 'updated_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    platform = db.Column(db.Enum(DeliveryPlatform), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # Raw request body
+    status = db.Column(db.Enum(WebhookStatus), nullable=False, default=WebhookStatus.PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    delivery_order_id = db.Column(db.Integer, db.ForeignKey('delivery_orders.id'), nullable=True)
+    received_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<WebhookEvent #{self.id} {self.platform} {self.status}>'
@@ -0,0 +1,263 @@
+from app import db
+from app.models.bill import Bill
+from app.models.menu import Category, MenuItem
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.sales import date_bounds
+import numpy as np
+
+# Rows fetched and converted per round trip while loading history
+CHUNK_SIZE = 50000
+
+# Loaded columns and the dtypes they are stored in
+ORDER_COLUMNS = (
+    ('id', np.int64),
+    ('hour', np.int8),
+    ('weekday', np.int8),  # 0 is Sunday
+)
+ITEM_COLUMNS = (
+    ('order_id', np.int64),
+    ('menu_item_id', np.int64),
+    ('quantity', np.int32),
+    ('price', np.float64),
+    ('is_half', np.bool_),
+)
+MENU_COLUMNS = (
+    ('id', np.int64),
+    ('category_id', np.int64),
+    ('cost_price', np.float64),  # NaN when unknown
+)
+BILL_COLUMNS = (
+    ('subtotal', np.float64),
+    ('discount', np.float64),
+    ('tax_amount', np.float64),
+    ('total_amount', np.float64),
+)
+
+
+def load_columns(statement, columns):
+    """
+    Run a select of numeric columns and return each column as a NumPy array.
+
+    Rows are fetched CHUNK_SIZE at a time straight from the DB-API cursor of
+    the session's connection (so reads still go to the read-only bind) and
+    converted per chunk: building SQLAlchemy rows would cost more than the
+    query itself. NULLs become NaN.
+
+    Args:
+        statement: Select whose columns match columns, in order
+        columns (tuple): (name, dtype) pairs
+
+    Returns:
+        dict: Column name mapped to its array
+    """
+    connection = db.session.connection()
+    # Parameters are dates, enums and constants, so they are safe to inline
+    sql = str(statement.compile(connection, compile_kwargs={'literal_binds': True}))
+
+    chunks = {name: [] for name, _ in columns}
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(sql)
+        while True:
+            rows = cursor.fetchmany(CHUNK_SIZE)
+            if not rows:
+                break
+            data = np.array(rows, dtype=np.float64).reshape(-1, len(columns))
+            for index, (name, dtype) in enumerate(columns):
+                chunks[name].append(data[:, index].astype(dtype))
+    finally:
+        cursor.close()
+
+    return {
+        name: np.concatenate(chunks[name]) if chunks[name] else np.empty(0, dtype=dtype)
+        for name, dtype in columns
+    }
+
+
+def summarize(values):
+    """Mean, median and 90th percentile of an array, rounded to two places."""
+    if not len(values):
+        return {'mean': 0.0, 'median': 0.0, 'p90': 0.0}
+    median, p90 = np.percentile(values, [50, 90])
+    return {'mean': round(float(values.mean()), 2), 'median': round(float(median), 2), 'p90': round(float(p90), 2)}
+
+
+class OrderHistory:
+    """
+    Completed orders, their items and paid bills for a range of days, held as NumPy columns.
+
+    Every metric is computed with vectorized array operations over one load
+    instead of a SQL aggregate per metric. Hours and weekdays are those of
+    the stored order times.
+    """
+
+    def __init__(self, start, end, orders, items, menu, bills):
+        self.start = start
+        self.end = end
+        self.items = items
+        self.menu = menu
+        self.bills = bills
+
+        # Position of each item's order and menu item in the sorted id columns
+        order_sort = np.argsort(orders['id'])
+        self.orders = {name: values[order_sort] for name, values in orders.items()}
+        self.item_order = np.searchsorted(self.orders['id'], items['order_id'])
+        # Items of deleted menu items have no position; searchsorted would give a neighbour's
+        self.item_has_menu = np.isin(items['menu_item_id'], menu['id'])
+        self.item_menu = np.searchsorted(menu['id'], items['menu_item_id'][self.item_has_menu])
+        self.revenue = items['price'] * items['quantity']
+
+    @classmethod
+    def load(cls, start, end):
+        """
+        Load the history of a range of days.
+
+        Args:
+            start (date): First day of the range
+            end (date): Last day of the range, inclusive
+
+        Returns:
+            OrderHistory: The loaded history
+        """
+        in_range = [Order.status == OrderStatus.COMPLETED, *date_bounds(Order.created_at, start, end)]
+
+        orders = db.select(
+            Order.id,
+            db.extract('hour', Order.created_at),
+            db.extract('dow', Order.created_at)
+        ).where(*in_range)
+
+        items = db.select(
+            OrderItem.order_id,
+            OrderItem.menu_item_id,
+            OrderItem.quantity,
+            OrderItem.price,
+            db.func.coalesce(OrderItem.is_half, False)
+        ).join(Order, OrderItem.order_id == Order.id).where(*in_range)
+
+        menu = db.select(MenuItem.id, MenuItem.category_id, MenuItem.cost_price).order_by(MenuItem.id)
+
+        bills = db.select(
+            Bill.subtotal,
+            db.func.coalesce(Bill.discount, 0.0),
+            Bill.tax_amount,
+            Bill.total_amount
+        ).where(Bill.payment_status == True, *date_bounds(Bill.created_at, start, end))
+
+        return cls(start, end,
+                   load_columns(orders, ORDER_COLUMNS),
+                   load_columns(items, ITEM_COLUMNS),
+                   load_columns(menu, MENU_COLUMNS),
+                   load_columns(bills, BILL_COLUMNS))
+
+    @property
+    def days(self):
+        """Number of days in the range."""
+        return (self.end - self.start).days + 1
+
+    def _baskets(self):
+        """Return the value and item count of each order that has items."""
+        count = len(self.orders['id'])
+        value = np.bincount(self.item_order, weights=self.revenue, minlength=count)
+        size = np.bincount(self.item_order, weights=self.items['quantity'], minlength=count)
+        has_items = size > 0
+        return value[has_items], size[has_items], has_items
+
+    def basket(self):
+        """
+        Basket metrics: how much and how many items each completed order holds.
+
+        Returns:
+            dict: Order count, revenue, basket value and size statistics, and
+                average bill, discount and tax figures from paid bills
+        """
+        value, size, _ = self._baskets()
+
+        bills_count = len(self.bills['total_amount'])
+        subtotal = float(self.bills['subtotal'].sum())
+        return {
+            'orders': len(value),
+            'orders_per_day': round(len(value) / self.days, 2),
+            'revenue': round(float(value.sum()), 2),
+            'basket_value': summarize(value),
+            'basket_size': summarize(size),
+            'bills': bills_count,
+            'average_bill': round(float(self.bills['total_amount'].mean()), 2) if bills_count else 0.0,
+            'discount_rate': round(float(self.bills['discount'].sum()) / subtotal, 4) if subtotal else 0.0,
+            'tax_collected': round(float(self.bills['tax_amount'].sum()), 2)
+        }
+
+    def hourly(self):
+        """
+        Revenue and order curves by hour of day, plus a weekday by hour revenue grid.
+
+        Returns:
+            dict: Per-hour revenue, average daily revenue and order counts, and
+                'weekday_hour' with seven rows (Sunday first) of 24 hours
+        """
+        hour = self.orders['hour'][self.item_order]
+        weekday = self.orders['weekday'][self.item_order].astype(np.int64)
+        revenue = np.bincount(hour, weights=self.revenue, minlength=24)
+        _, _, has_items = self._baskets()
+        orders = np.bincount(self.orders['hour'][has_items], minlength=24)
+        grid = np.bincount(weekday * 24 + hour, weights=self.revenue, minlength=7 * 24).reshape(7, 24)
+
+        return {
+            'hours': list(range(24)),
+            'revenue': np.round(revenue, 2).tolist(),
+            'average_daily_revenue': np.round(revenue / self.days, 2).tolist(),
+            'orders': orders.tolist(),
+            'weekday_hour': np.round(grid, 2).tolist()
+        }
+
+    def categories(self):
+        """
+        Revenue, quantity and margin per menu category.
+
+        Margins only cover items with a cost price; a half portion costs half
+        of it. 'costed_revenue' is the revenue the margin was computed on.
+        Items whose menu item was deleted belong to no category and are left out.
+
+        Returns:
+            list: One dict per category, highest revenue first
+        """
+        quantity = self.items['quantity'][self.item_has_menu]
+        revenue = self.revenue[self.item_has_menu]
+        is_half = self.items['is_half'][self.item_has_menu]
+
+        category_ids, inverse = np.unique(self.menu['category_id'][self.item_menu], return_inverse=True)
+        cost_price = self.menu['cost_price'][self.item_menu]
+        has_cost = ~np.isnan(cost_price)
+        cost = np.where(has_cost, cost_price, 0.0) * quantity * np.where(is_half, 0.5, 1.0)
+
+        def per_category(weights):
+            return np.bincount(inverse, weights=weights, minlength=len(category_ids))
+
+        totals = per_category(revenue)
+        quantities = per_category(quantity)
+        costed_revenue = per_category(np.where(has_cost, revenue, 0.0))
+        margins = costed_revenue - per_category(cost)
+        revenue_total = totals.sum() or 1.0
+
+        names = dict(db.session.query(Category.id, Category.name)
+                     .filter(Category.id.in_(category_ids.tolist())).all())
+
+        rows = [{
+            'category_id': int(category_id),
+            'name': names.get(int(category_id)),
+            'revenue': round(float(totals[i]), 2),
+            'quantity': int(quantities[i]),
+            'revenue_share': round(float(totals[i] / revenue_total), 4),
+            'costed_revenue': round(float(costed_revenue[i]), 2),
+            'margin': round(float(margins[i]), 2),
+            'margin_rate': round(float(margins[i] / costed_revenue[i]), 4) if costed_revenue[i] else None
+        } for i, category_id in enumerate(category_ids)]
+        return sorted(rows, key=lambda row: row['revenue'], reverse=True)
+
+
+# Metrics served by the analytics report endpoint
+ANALYTICS = {
+    'basket': OrderHistory.basket,
+    'hourly': OrderHistory.hourly,
+    'categories': OrderHistory.categories,
+}
@@ -0,0 +1,171 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import g
+from app import db, socketio
+from app.models.job import Job, JobStatus
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Runs slow work, such as large exports, on a local thread pool.
+    
+    Jobs are persisted in the jobs table, so their status and results can be
+    polled from any worker and survive restarts, and progress is pushed to
+    browsers over socketio as 'job_progress' events. No broker is needed.
+    
+    A handler is a function ``handler(job_id, params, progress, result_dir)``
+    that writes its result into result_dir and returns ``(path, name)``. It
+    runs in its own app context with reads routed to the read-only bind, and
+    calls ``progress(percent)`` as it goes.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self._handlers = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Configure the runner. Worker threads start with the first job."""
+        self.app = app
+        self.max_workers = app.config.get('JOBS_MAX_WORKERS', 2)
+        self.result_dir = app.config.get('JOBS_RESULT_DIR') or os.path.join(app.instance_path, 'exports')
+        self.retention = timedelta(days=app.config.get('JOBS_RETENTION_DAYS', 7))
+        self.stale_after = timedelta(seconds=app.config.get('JOBS_STALE_AFTER', 900))
+    
+    def handler(self, kind):
+        """Decorator registering the handler for a kind of job."""
+        def decorator(fn):
+            self._handlers[kind] = fn
+            return fn
+        return decorator
+    
+    def submit(self, kind, params, user_id=None):
+        """
+        Persist a job and queue it. Commits the session.
+        
+        Args:
+            kind (str): A registered job kind
+            params (dict): JSON-serializable handler parameters
+            user_id (int): The user the job belongs to
+            
+        Returns:
+            Job: The pending job
+        """
+        if kind not in self._handlers:
+            raise ValueError(f'Unknown job kind: {kind}')
+        
+        self._sweep()
+        
+        job = Job(kind=kind, params=json.dumps(params), user_id=user_id)
+        db.session.add(job)
+        db.session.commit()
+        
+        self._pool().submit(self._run, job.id)
+        return job
+    
+    def _pool(self):
+        """Return the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+            return self._executor
+    
+    def _sweep(self):
+        """
+        Clean up after dead processes and expired results.
+        
+        Running jobs whose heartbeat stopped are marked failed, pending jobs
+        nobody picked up are queued again, and results past the retention
+        period are deleted. Stages changes on the session.
+        """
+        now = datetime.utcnow()
+        
+        for job in Job.query.filter(
+            Job.status == JobStatus.RUNNING,
+            Job.updated_at < now - self.stale_after
+        ).all():
+            job.status = JobStatus.FAILED
+            job.error = 'Interrupted before it finished'
+            job.finished_at = now
+        
+        for job in Job.query.filter(
+            Job.status == JobStatus.PENDING,
+            Job.created_at < now - self.stale_after
+        ).all():
+            # Only one worker can claim a job, so requeueing twice is harmless
+            self._pool().submit(self._run, job.id)
+        
+        for job in Job.query.filter(
+            Job.status == JobStatus.COMPLETED,
+            Job.finished_at < now - self.retention
+        ).all():
+            if job.result_path and os.path.exists(job.result_path):
+                os.remove(job.result_path)
+            db.session.delete(job)
+    
+    def _update(self, job_id, *where, **values):
+        """
+        Write job fields in a short transaction of their own, outside the handler's session.
+        
+        Returns:
+            int: 1 if the job was updated, 0 if it is missing or did not match where
+        """
+        table = Job.__table__
+        with db.engine.begin() as conn:
+            return conn.execute(
+                table.update()
+                .where(table.c.id == job_id, *where)
+                .values(updated_at=datetime.utcnow(), **values)
+            ).rowcount
+    
+    def _emit(self, job_id, status, progress, **data):
+        """Notify clients about a job's progress."""
+        socketio.emit('job_progress', dict(job_id=job_id, status=status.value, progress=progress, **data))
+    
+    def _run(self, job_id):
+        """Worker thread: claim a job, run its handler and record the outcome."""
+        with self.app.app_context():
+            # Claim the job atomically, so a requeued job never runs twice
+            if not self._update(job_id, Job.__table__.c.status == JobStatus.PENDING, status=JobStatus.RUNNING):
+                return
+            
+            job = db.session.get(Job, job_id)
+            kind, params = job.kind, job.get_params()
+            
+            # Handlers only read; job updates go through _update on the primary
+            g.read_only = True
+            self._emit(job_id, JobStatus.RUNNING, 0)
+            
+            last_percent = [0]
+            
+            def progress(percent):
+                percent = int(min(max(percent, 0), 99))
+                if percent > last_percent[0]:
+                    last_percent[0] = percent
+                    self._update(job_id, progress=percent)
+                    self._emit(job_id, JobStatus.RUNNING, percent)
+            
+            try:
+                path, name = self._handlers[kind](job_id, params, progress, self.result_dir)
+            except Exception as e:
+                logger.error(f"Job #{job_id} ({kind}) failed: {str(e)}", exc_info=True)
+                self._update(job_id, status=JobStatus.FAILED, error=str(e), finished_at=datetime.utcnow())
+                self._emit(job_id, JobStatus.FAILED, last_percent[0], error=str(e))
+                return
+            
+            self._update(job_id, status=JobStatus.COMPLETED, progress=100,
+                         result_path=path, result_name=name, finished_at=datetime.utcnow())
+            self._emit(job_id, JobStatus.COMPLETED, 100, result_name=name)
+            logger.info(f"Job #{job_id} ({kind}) completed: {name}")
+
+
+job_runner = JobRunner()
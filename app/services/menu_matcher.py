@@ -0,0 +1,216 @@
+from collections import Counter, namedtuple
+from flask import g, has_app_context
+from app import db
+from app.models.delivery import DeliveryItemMapping
+from app.models.menu import MenuItem
+import logging
+import re
+import threading
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Minimum share of words a delivery item name must have in common with a menu item name
+TOKEN_THRESHOLD = 0.5
+
+# Minimum trigram similarity, as pg_trgm computes it, for a fuzzy match
+TRIGRAM_THRESHOLD = 0.4
+
+# How a name was matched; fuzzy matches are guesses for staff to confirm or correct
+EXACT, MAPPED, TOKEN, TRIGRAM = 'exact', 'mapped', 'token', 'trigram'
+FUZZY_METHODS = (TOKEN, TRIGRAM)
+
+MenuEntry = namedtuple('MenuEntry', ['id', 'name', 'full_price', 'is_available'])
+
+
+def normalize(name):
+    """Lowercase a name, strip accents and punctuation and collapse whitespace."""
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name.lower()).split())
+
+
+def trigrams(normalized):
+    """Set of the three-letter sequences of each word, padded like pg_trgm does."""
+    result = set()
+    for word in normalized.split():
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class MenuIndex:
+    """
+    A snapshot of the menu and the confirmed delivery item mappings, indexed for name lookups.
+    
+    Built once per menu change and never modified, so it is shared by all
+    threads without locking.
+    """
+    
+    def __init__(self, items, mappings, signature=None):
+        self.signature = signature
+        self.items = {item.id: item for item in items}
+        self.names = {}
+        self.tokens = {}
+        self.grams = {}
+        self.item_tokens = {}
+        self.item_grams = {}
+        
+        # Available items first, so they win the exact name lookup
+        for item in sorted(items, key=lambda item: not item.is_available):
+            normalized = normalize(item.name)
+            self.names.setdefault(normalized, item)
+            self.item_tokens[item.id] = set(normalized.split())
+            self.item_grams[item.id] = trigrams(normalized)
+            for token in self.item_tokens[item.id]:
+                self.tokens.setdefault(token, []).append(item.id)
+            for gram in self.item_grams[item.id]:
+                self.grams.setdefault(gram, []).append(item.id)
+        
+        self.mappings = {
+            (platform, item_name): self.items[menu_item_id]
+            for platform, item_name, menu_item_id in mappings
+            if menu_item_id in self.items
+        }
+    
+    def match(self, platform, name):
+        """
+        Find the menu item a delivery platform item name refers to.
+        
+        Tries the exact normalized name, then a mapping confirmed by staff,
+        then the best word overlap, then the best trigram similarity. A menu
+        item's own name always wins over a mapping, so a stale mapping never
+        hides it.
+        
+        Args:
+            platform (DeliveryPlatform): The platform the item comes from
+            name (str): The item name on the platform
+        
+        Returns:
+            tuple: (MenuEntry, method), or (None, None) if nothing is close enough
+        """
+        normalized = normalize(name)
+        if not normalized:
+            return None, None
+        
+        entry = self.names.get(normalized)
+        if entry is not None:
+            return entry, EXACT
+        
+        entry = self.mappings.get((platform, normalized))
+        if entry is not None:
+            return entry, MAPPED
+        
+        entry = self._best(set(normalized.split()), self.tokens, self.item_tokens, TOKEN_THRESHOLD)
+        if entry is not None:
+            return entry, TOKEN
+        
+        entry = self._best(trigrams(normalized), self.grams, self.item_grams, TRIGRAM_THRESHOLD)
+        if entry is not None:
+            return entry, TRIGRAM
+        
+        return None, None
+    
+    def _best(self, keys, postings, item_keys, threshold):
+        """Item whose key set has the highest Jaccard similarity with keys, if it reaches threshold."""
+        shared = Counter(item_id for key in keys for item_id in postings.get(key, ()))
+        best, best_rank = None, None
+        for item_id, count in shared.items():
+            item = self.items[item_id]
+            score = count / (len(keys) + len(item_keys[item_id]) - count)
+            # On equal scores, prefer an available item
+            rank = (score, bool(item.is_available))
+            if score >= threshold and (best_rank is None or rank > best_rank):
+                best, best_rank = item, rank
+        return best
+
+
+class MenuMatcher:
+    """
+    Resolves delivery platform item names to menu items from an in-memory MenuIndex.
+    
+    The index is rebuilt when menu items or mappings change, in
+    this or another worker: one aggregate query per app context compares
+    their counts, highest IDs and latest update with those the index was
+    built from, so resolving the lines of an order queries nothing per item.
+    """
+    
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+    
+    def _signature(self):
+        """Counts, highest IDs and latest update of the menu items and mappings."""
+        def scalar(*columns):
+            return db.select(*columns).scalar_subquery()
+        
+        return tuple(db.session.execute(db.select(
+            scalar(db.func.count(MenuItem.id)),
+            scalar(db.func.max(MenuItem.id)),
+            scalar(db.func.max(MenuItem.updated_at)),
+            scalar(db.func.count(DeliveryItemMapping.id)),
+            scalar(db.func.max(DeliveryItemMapping.id))
+        )).one())
+    
+    def index(self):
+        """Return the current menu index, rebuilding it if the menu or the mappings changed."""
+        index = self._index
+        if index is not None and has_app_context() and g.get('_menu_index_checked'):
+            return index
+        
+        signature = self._signature()
+        if index is None or index.signature != signature:
+            with self._lock:
+                items = db.session.query(
+                    MenuItem.id, MenuItem.name, MenuItem.full_price, MenuItem.is_available
+                ).all()
+                mappings = db.session.query(
+                    DeliveryItemMapping.platform, DeliveryItemMapping.item_name, DeliveryItemMapping.menu_item_id
+                ).all()
+                index = MenuIndex([MenuEntry(*item) for item in items], mappings, signature)
+                self._index = index
+            logger.info(f"Built menu index of {len(index.items)} items and {len(index.mappings)} mappings")
+        
+        if has_app_context():
+            g._menu_index_checked = True
+        return index
+    
+    def invalidate(self):
+        """Drop the index so the next lookup rebuilds it."""
+        with self._lock:
+            self._index = None
+        if has_app_context():
+            g.pop('_menu_index_checked', None)
+    
+    def remember(self, platform, item_name, menu_item_id):
+        """
+        Stage a mapping from a platform item name to a menu item, as confirmed or corrected by staff.
+        
+        A different earlier mapping of the name is replaced by a new row
+        rather than updated, so other workers see the change in the index
+        signature. The caller commits the session.
+        
+        Args:
+            platform (DeliveryPlatform): The platform the item comes from
+            item_name (str): The item name on the platform
+            menu_item_id (int): The menu item it refers to
+        
+        Returns:
+            DeliveryItemMapping: The mapping, or None if the name is empty
+        """
+        normalized = normalize(item_name)[:200]
+        if not normalized:
+            return None
+        
+        mapping = DeliveryItemMapping.query.filter_by(platform=platform, item_name=normalized).first()
+        if mapping is not None:
+            if mapping.menu_item_id == menu_item_id:
+                return mapping
+            db.session.delete(mapping)
+            db.session.flush()
+        
+        mapping = DeliveryItemMapping(platform=platform, item_name=normalized, menu_item_id=menu_item_id)
+        db.session.add(mapping)
+        return mapping
+
+
+menu_matcher = MenuMatcher()
@@ -0,0 +1,210 @@
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+import requests
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a platform whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing platform for a while instead of letting every caller wait for timeouts.
+    
+    After threshold consecutive failures the circuit opens and calls fail
+    at once. Once reset_timeout seconds have passed, one trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self):
+        """'closed', 'open' or 'half-open'."""
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+    
+    def allow(self):
+        """Whether a call may go ahead; in half-open state only one trial call at a time does."""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial:
+                self._trial = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class PlatformClient:
+    """
+    HTTP client for one delivery platform's API.
+    
+    Requests share a session whose connection pool keeps connections alive
+    between calls, so repeated calls skip TCP and TLS setup. Connection
+    errors and retryable statuses are retried with jittered exponential
+    backoff on idempotent methods, and a CircuitBreaker fails calls fast
+    while the platform is down.
+    
+    Args:
+        name (str): Platform name, for logs
+        base_url (str): API root that request paths are appended to
+        pool_size (int): Connections kept alive to the platform
+        timeout (float): Seconds to wait for a connection or a response
+        retries (int): Retries of a failed call
+        backoff (float): Delay before the first retry, doubled for each next one
+        circuit (CircuitBreaker): The platform's circuit breaker
+    """
+    
+    def __init__(self, name, base_url, pool_size=10, timeout=10, retries=3, backoff=0.5, circuit=None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.circuit = circuit or CircuitBreaker(5, 30)
+        
+        retry = Retry(
+            total=retries,
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=backoff,
+            backoff_jitter=backoff,
+            raise_on_status=False  # Return the last response once retries are exhausted
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def request(self, method, path, **kwargs):
+        """
+        Call the platform API.
+        
+        Args:
+            method (str): HTTP method
+            path (str): Path below the base URL, starting with a slash
+            **kwargs: Passed on to requests, e.g. json or headers
+        
+        Returns:
+            Response: The response, whatever its status
+        
+        Raises:
+            CircuitOpenError: If the platform's circuit is open
+            requests.exceptions.RequestException: If the call failed after retries
+        """
+        if not self.circuit.allow():
+            raise CircuitOpenError(f"{self.name} API circuit is open after {self.circuit.failures} failures")
+        
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', **kwargs)
+        except Exception:
+            # Any error counts, so a failed half-open trial always reopens the circuit
+            self._failed()
+            raise
+        
+        if response.status_code >= 500:
+            self._failed()
+        else:
+            self.circuit.record_success()
+        return response
+    
+    def _failed(self):
+        self.circuit.record_failure()
+        if self.circuit.state == 'open':
+            logger.warning(f"{self.name} API circuit open after {self.circuit.failures} consecutive failures")
+    
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+
+class PlatformClients:
+    """
+    The PlatformClient of each delivery platform, created on first use and shared by all threads.
+    
+    Base URLs, pool sizes, retry and circuit settings come from the
+    ZOMATO_API_URL, SWIGGY_API_URL and PLATFORM_* configuration.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self._clients = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Configure the clients, dropping any created for a previous configuration."""
+        self.app = app
+        self.base_urls = {
+            'zomato': app.config.get('ZOMATO_API_URL', 'https://api.zomato.com/api/v1.1'),
+            'swiggy': app.config.get('SWIGGY_API_URL', 'https://partner-api.swiggy.com/v1')
+        }
+        self.pool_size = app.config.get('PLATFORM_HTTP_POOL_SIZE', 10)
+        self.timeout = app.config.get('PLATFORM_HTTP_TIMEOUT', 10)
+        self.retries = app.config.get('PLATFORM_HTTP_RETRIES', 3)
+        self.backoff = app.config.get('PLATFORM_HTTP_BACKOFF', 0.5)
+        self.circuit_threshold = app.config.get('PLATFORM_CIRCUIT_THRESHOLD', 5)
+        self.circuit_reset = app.config.get('PLATFORM_CIRCUIT_RESET', 30)
+        self.close()
+    
+    def get(self, platform):
+        """
+        Return the client of a platform.
+        
+        Args:
+            platform (str): Platform value, e.g. 'zomato'
+        """
+        with self._lock:
+            client = self._clients.get(platform)
+            if client is None:
+                client = PlatformClient(
+                    platform.title(),
+                    self.base_urls[platform],
+                    pool_size=self.pool_size,
+                    timeout=self.timeout,
+                    retries=self.retries,
+                    backoff=self.backoff,
+                    circuit=CircuitBreaker(self.circuit_threshold, self.circuit_reset)
+                )
+                self._clients[platform] = client
+            return client
+    
+    def close(self):
+        """Close and drop every client."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients = {}
+
+
+platform_clients = PlatformClients()
@@ -0,0 +1,211 @@
+from app import db
+from app.models.bill import Bill
+from app.models.order import Order
+from app.services.jobs import job_runner
+from app.utils.export import Report
+from datetime import datetime
+import os
+
+
+def bills_report(start_date=None, end_date=None):
+    """
+    Build the export of all bills, optionally limited to a date range.
+    
+    Args:
+        start_date (datetime): Earliest bill time, or None
+        end_date (datetime): Latest bill time, or None
+        
+    Returns:
+        Report: The bills report, newest first
+    """
+    filters = []
+    if start_date:
+        filters.append(Bill.created_at >= start_date)
+    if end_date:
+        filters.append(Bill.created_at <= end_date)
+    
+    # Select plain columns with the customer pre-joined, so rows can be streamed
+    query = db.session.query(
+        Bill.bill_number,
+        Bill.created_at,
+        Order.customer_name,
+        Bill.subtotal,
+        Bill.tax_amount,
+        Bill.discount,
+        Bill.total_amount,
+        Bill.payment_status,
+        Bill.payment_method
+    ).join(Order, Bill.order_id == Order.id).filter(*filters).order_by(Bill.created_at.desc())
+    
+    def summarize():
+        # Totals come from one aggregate query, so rows never need to be held in memory
+        bills_count, revenue, tax, discount, paid = db.session.query(
+            db.func.count(Bill.id),
+            db.func.sum(Bill.total_amount),
+            db.func.sum(Bill.tax_amount),
+            db.func.sum(Bill.discount),
+            db.func.sum(db.case((Bill.payment_status == True, 1), else_=0))
+        ).filter(*filters).one()
+        
+        details = []
+        if start_date:
+            details.append(('From', start_date.strftime('%Y-%m-%d')))
+        if end_date:
+            details.append(('To', end_date.strftime('%Y-%m-%d')))
+        details.append(('Total Bills', bills_count))
+        
+        summary = [
+            ('Total Revenue', f"₹{revenue or 0:.2f}"),
+            ('Total Tax Collected', f"₹{tax or 0:.2f}"),
+            ('Total Discounts Given', f"₹{discount or 0:.2f}"),
+            ('Paid Bills', paid or 0),
+            ('Unpaid Bills', bills_count - (paid or 0)),
+        ] if bills_count else []
+        
+        return {'details': details, 'summary': summary}
+    
+    return Report(
+        'Bills Report',
+        'bills_report',
+        ['Bill #', 'Date', 'Customer', 'Subtotal', 'Tax', 'Discount', 'Total', 'Payment Status', 'Payment Method'],
+        query,
+        lambda bill: [
+            bill.bill_number,
+            bill.created_at.strftime('%Y-%m-%d %H:%M'),
+            bill.customer_name if bill.customer_name else 'Walk-in Customer',
+            bill.subtotal,
+            bill.tax_amount,
+            bill.discount,
+            bill.total_amount,
+            'Paid' if bill.payment_status else 'Unpaid',
+            bill.payment_method.value if bill.payment_method else ''
+        ],
+        money_columns=(3, 4, 5, 6),
+        summarize=summarize
+    )
+
+
+def sales_report(start_date, end_date):
+    """
+    Build the export of paid bills in a date range.
+    
+    Args:
+        start_date (datetime): Earliest bill time
+        end_date (datetime): Latest bill time
+        
+    Returns:
+        Report: The sales report, oldest first
+    """
+    filters = [
+        Bill.created_at.between(start_date, end_date),
+        Bill.payment_status == True
+    ]
+    query = db.session.query(
+        Bill.bill_number,
+        Bill.order_id,
+        Bill.created_at,
+        Bill.subtotal,
+        Bill.tax_amount,
+        Bill.discount,
+        Bill.total_amount,
+        Bill.payment_method
+    ).filter(*filters).order_by(Bill.created_at)
+    
+    def summarize():
+        bills_count, subtotal, tax, discount, total = db.session.query(
+            db.func.count(Bill.id),
+            db.func.sum(Bill.subtotal),
+            db.func.sum(Bill.tax_amount),
+            db.func.sum(Bill.discount),
+            db.func.sum(Bill.total_amount)
+        ).filter(*filters).one()
+        
+        details = [
+            ('From', start_date.strftime('%Y-%m-%d')),
+            ('To', end_date.strftime('%Y-%m-%d')),
+            ('Paid Bills', bills_count),
+        ]
+        summary = [
+            ('Subtotal', f"₹{subtotal or 0:.2f}"),
+            ('Total Tax Collected', f"₹{tax or 0:.2f}"),
+            ('Total Discounts Given', f"₹{discount or 0:.2f}"),
+            ('Total Revenue', f"₹{total or 0:.2f}"),
+        ] if bills_count else []
+        
+        return {'details': details, 'summary': summary}
+    
+    return Report(
+        'Sales Report',
+        f'sales_report_{start_date.strftime("%Y%m%d")}-{end_date.strftime("%Y%m%d")}',
+        ['Bill Number', 'Order ID', 'Date', 'Subtotal', 'Tax', 'Discount', 'Total', 'Payment Method'],
+        query,
+        lambda bill: [
+            bill.bill_number,
+            bill.order_id,
+            bill.created_at.strftime('%Y-%m-%d %H:%M'),
+            bill.subtotal,
+            bill.tax_amount,
+            bill.discount,
+            bill.total_amount,
+            bill.payment_method.value if bill.payment_method else 'N/A'
+        ],
+        money_columns=(3, 4, 5, 6),
+        summarize=summarize
+    )
+
+
+# Reports that can be exported in the background, by name
+REPORTS = {
+    'bills': bills_report,
+    'sales': sales_report,
+}
+
+
+def export_params(report, format, start_date, end_date):
+    """
+    Build the parameters of a background export job.
+    
+    Args:
+        report (str): One of REPORTS
+        format (str): One of Report.FORMATS
+        start_date (datetime): Start of the range, or None
+        end_date (datetime): End of the range, or None
+        
+    Returns:
+        dict: JSON-serializable job parameters
+    """
+    return {
+        'report': report,
+        'format': format,
+        'start_date': start_date.isoformat() if start_date else None,
+        'end_date': end_date.isoformat() if end_date else None
+    }
+
+
+@job_runner.handler('export')
+def run_export(job_id, params, progress, result_dir):
+    """Write a report export to a file, reporting progress by rows written."""
+    start_date = datetime.fromisoformat(params['start_date']) if params.get('start_date') else None
+    end_date = datetime.fromisoformat(params['end_date']) if params.get('end_date') else None
+    report = REPORTS[params['report']](start_date, end_date)
+    format = params['format']
+    
+    total = report.count()
+    on_progress = (lambda rows: progress(rows * 100 / total)) if total else None
+    
+    name = report.download_name(format)
+    os.makedirs(result_dir, exist_ok=True)
+    path = os.path.join(result_dir, f'job_{job_id}_{name}')
+    
+    # Opened before the try, so a file that could not be created is never removed
+    output = open(path, 'wb')
+    try:
+        with output:
+            for chunk in report.chunks(format, on_progress=on_progress, now=datetime.now, print_friendly=True):
+                output.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+    except Exception:
+        # Never leave a truncated file behind
+        os.remove(path)
+        raise
+    
+    return path, name
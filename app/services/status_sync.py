@@ -0,0 +1,258 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app import db
+from app.models.outbox import OutboxState, StatusUpdate
+from app.services.delivery import delivery_services
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Status updates claimed per dispatch at most
+DISPATCH_BATCH = 100
+
+# Longest wait before retrying a failed push, in seconds
+MAX_RETRY_DELAY = 3600
+
+# Seconds after which an update still marked sending belongs to a dispatcher that died
+SENDING_TIMEOUT = 300
+
+# Seconds between deletions of sent and superseded updates past the retention period
+PRUNE_INTERVAL = 3600
+
+
+def queue_status_update(delivery_order):
+    """
+    Stage an outbox entry that pushes the delivery order's current status to its platform.
+    
+    Call it in the transaction that changes the status, so the entry is
+    committed exactly when the change is, and call status_dispatcher.notify()
+    after the commit. The caller commits the session. Nothing is queued while
+    the platform's integration is disabled, or for a status the platform has
+    no code for, such as pending.
+    
+    Args:
+        delivery_order (DeliveryOrder): The order whose status changed
+    
+    Returns:
+        StatusUpdate: The staged entry, or None
+    """
+    service = delivery_services[delivery_order.platform]
+    if not service.enabled or not service.syncs_status(delivery_order.status.value):
+        return None
+    
+    update = StatusUpdate(
+        delivery_order_id=delivery_order.id,
+        platform=delivery_order.platform,
+        platform_order_id=delivery_order.platform_order_id,
+        status=delivery_order.status,
+        state=OutboxState.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.session.add(update)
+    return update
+
+
+class StatusDispatcher:
+    """
+    Pushes delivery order status updates from the outbox to the platforms in the background.
+    
+    Status changes only stage a StatusUpdate with the order (see
+    queue_status_update), so the admin's click never waits on a platform
+    API. A dispatcher thread wakes when notified, or every
+    STATUS_SYNC_POLL_INTERVAL seconds for updates queued by other processes
+    and retries that are due, and pushes them on STATUS_SYNC_WORKERS threads.
+    
+    Only the latest status of an order is pushed: older pending and failed
+    updates of the same order are marked superseded, and an update waits
+    while an older one of its order is still being sent, so platforms never
+    see statuses out of order. Failed pushes are retried with exponential
+    backoff from STATUS_SYNC_RETRY_INTERVAL seconds. After
+    STATUS_SYNC_MAX_ATTEMPTS attempts, or at once for errors a retry cannot
+    fix (a disabled integration or a 4xx response), an update becomes a dead
+    letter until it is retried from the status sync page.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._thread = None
+        self._pruned_at = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Configure the dispatcher and start its thread."""
+        self.app = app
+        self.max_workers = app.config.get('STATUS_SYNC_WORKERS', 4)
+        self.max_attempts = app.config.get('STATUS_SYNC_MAX_ATTEMPTS', 8)
+        self.retry_interval = app.config.get('STATUS_SYNC_RETRY_INTERVAL', 15)
+        self.poll_interval = app.config.get('STATUS_SYNC_POLL_INTERVAL', 5)
+        self.retention = timedelta(days=app.config.get('STATUS_SYNC_RETENTION_DAYS', 7))
+        
+        if self.poll_interval and not app.testing and self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch_loop, name='status-dispatcher', daemon=True)
+            self._thread.start()
+    
+    def notify(self):
+        """Wake the dispatcher thread, e.g. after committing status updates."""
+        self._wake.set()
+    
+    def dispatch(self):
+        """
+        Coalesce the outbox and push the status updates that are due.
+        
+        Returns:
+            int: The number of updates picked for pushing
+        """
+        table = StatusUpdate.__table__
+        newer = table.alias('newer')
+        older = table.alias('older')
+        now = datetime.utcnow()
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(
+                    table.update()
+                    .where(table.c.state.in_([OutboxState.PENDING, OutboxState.FAILED]),
+                           db.exists().where(newer.c.delivery_order_id == table.c.delivery_order_id,
+                                             newer.c.id > table.c.id))
+                    .values(state=OutboxState.SUPERSEDED, updated_at=now)
+                )
+                conn.execute(
+                    table.update()
+                    .where(table.c.state == OutboxState.SENDING,
+                           table.c.updated_at < now - timedelta(seconds=SENDING_TIMEOUT))
+                    .values(state=OutboxState.PENDING, next_attempt_at=now, updated_at=now)
+                )
+                due = conn.execute(
+                    db.select(table.c.id)
+                    .where(table.c.state == OutboxState.PENDING,
+                           table.c.next_attempt_at <= now,
+                           ~db.exists().where(older.c.delivery_order_id == table.c.delivery_order_id,
+                                              older.c.id < table.c.id,
+                                              older.c.state == OutboxState.SENDING))
+                    .order_by(table.c.id)
+                    .limit(DISPATCH_BATCH)
+                ).scalars().all()
+        
+        # Each order appears at most once, so its pushes never race each other
+        if due:
+            list(self._pool().map(self._send, due))
+        return len(due)
+    
+    def retry(self, update_ids=None):
+        """
+        Requeue dead-letter status updates.
+        
+        Args:
+            update_ids (list): IDs of the updates to retry, all failed ones by default
+        
+        Returns:
+            int: The number of updates requeued
+        """
+        table = StatusUpdate.__table__
+        now = datetime.utcnow()
+        query = table.update().where(table.c.state == OutboxState.FAILED)
+        if update_ids is not None:
+            query = query.where(table.c.id.in_(update_ids))
+        with db.engine.begin() as conn:
+            count = conn.execute(
+                query.values(state=OutboxState.PENDING, attempts=0, error=None, next_attempt_at=now, updated_at=now)
+            ).rowcount
+        
+        if count:
+            self.notify()
+        return count
+    
+    def _pool(self):
+        """Return the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='status-sync')
+            return self._executor
+    
+    def _update(self, update_id, *where, **values):
+        """
+        Write status update fields in a short transaction of their own.
+        
+        Returns:
+            int: 1 if the update was changed, 0 if it is missing or did not match where
+        """
+        table = StatusUpdate.__table__
+        with db.engine.begin() as conn:
+            return conn.execute(
+                table.update()
+                .where(table.c.id == update_id, *where)
+                .values(updated_at=datetime.utcnow(), **values)
+            ).rowcount
+    
+    def _send(self, update_id):
+        """Worker thread: claim a status update, push it and record the outcome."""
+        table = StatusUpdate.__table__
+        with self.app.app_context():
+            # Claim the update atomically, so another process never pushes it too
+            if not self._update(update_id, table.c.state == OutboxState.PENDING,
+                                state=OutboxState.SENDING, attempts=table.c.attempts + 1):
+                return
+            
+            update = db.session.get(StatusUpdate, update_id)
+            platform, platform_order_id, status, attempts = (
+                update.platform, update.platform_order_id, update.status, update.attempts
+            )
+            
+            try:
+                result = delivery_services[platform].update_order_status(platform_order_id, status.value)
+            except Exception as e:
+                logger.error(f"Error pushing {platform.value} order {platform_order_id} status: {str(e)}", exc_info=True)
+                result = {'error': "Unexpected error", 'details': str(e)}
+            
+            if result is None:
+                error, retryable = "Integration disabled or missing API key", False
+            elif 'error' in result:
+                status_code = result.get('status_code') or 0
+                error = f"{result['error']}: {result.get('details', '')}"
+                retryable = not 400 <= status_code < 500 or status_code == 429
+            else:
+                self._update(update_id, state=OutboxState.SENT, error=None, sent_at=datetime.utcnow())
+                return
+            
+            if not retryable or attempts >= self.max_attempts:
+                logger.error(f"Gave up pushing {platform.value} order {platform_order_id} status "
+                             f"{status.value} after {attempts} attempts: {error}")
+                self._update(update_id, state=OutboxState.FAILED, error=error)
+            else:
+                delay = min(self.retry_interval * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+                self._update(update_id, state=OutboxState.PENDING, error=error,
+                             next_attempt_at=datetime.utcnow() + timedelta(seconds=delay))
+    
+    def _prune(self):
+        """Delete sent and superseded updates past the retention period."""
+        table = StatusUpdate.__table__
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(
+                    table.delete()
+                    .where(table.c.state.in_([OutboxState.SENT, OutboxState.SUPERSEDED]),
+                           table.c.updated_at < datetime.utcnow() - self.retention)
+                )
+    
+    def _dispatch_loop(self):
+        """Dispatcher thread: push due updates when notified or every poll interval."""
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                while self.dispatch() == DISPATCH_BATCH:
+                    pass
+                if self._pruned_at is None or time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+                    self._prune()
+                    self._pruned_at = time.monotonic()
+            except Exception as e:
+                logger.error(f"Status dispatch failed: {str(e)}", exc_info=True)
+
+
+status_dispatcher = StatusDispatcher()
@@ -0,0 +1,193 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app import db
+from app.models.webhook import WebhookEvent, WebhookStatus
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Events requeued per sweep at most
+SWEEP_BATCH = 500
+
+
+class InvalidWebhook(ValueError):
+    """Raised by the webhook handler for payloads that can never be processed, so they are not retried."""
+
+
+def enqueue_webhook(platform, payload):
+    """
+    Stage the raw payload of a received webhook as a pending event.
+    
+    Runs as a write_queue job, so bursts of webhooks share commits.
+    
+    Args:
+        platform (DeliveryPlatform): The platform the webhook came from
+        payload (str): The raw request body
+        
+    Returns:
+        int: The event ID
+    """
+    now = datetime.utcnow()
+    result = db.session.execute(WebhookEvent.__table__.insert().values(
+        platform=platform,
+        payload=payload,
+        status=WebhookStatus.PENDING,
+        attempts=0,
+        received_at=now,
+        updated_at=now
+    ))
+    return result.inserted_primary_key[0]
+
+
+class WebhookProcessor:
+    """
+    Processes queued delivery platform webhooks on a local thread pool.
+    
+    Webhook requests only verify the signature and store the raw payload
+    (see enqueue_webhook), then answer 202; the ORM work of standardizing,
+    de-duplicating and storing the order happens here, off the platform's
+    HTTP call.
+    
+    The handler is a function ``handler(platform, data)`` that processes one
+    decoded payload and returns the delivery order ID. It raises
+    InvalidWebhook for payloads that will never succeed; any other error is
+    retried up to WEBHOOK_MAX_ATTEMPTS times. A sweeper thread requeues
+    failed attempts and events left behind by a restart every
+    WEBHOOK_RETRY_INTERVAL seconds.
+    """
+    
+    def __init__(self, app=None):
+        self.app = None
+        self._handler = None
+        self._executor = None
+        self._sweeper = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        """Configure the processor and start the sweeper thread."""
+        self.app = app
+        self.max_workers = app.config.get('WEBHOOK_WORKERS', 2)
+        self.max_attempts = app.config.get('WEBHOOK_MAX_ATTEMPTS', 5)
+        self.retry_interval = app.config.get('WEBHOOK_RETRY_INTERVAL', 30)
+        
+        if self.retry_interval and not app.testing and self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep_loop, name='webhook-sweeper', daemon=True)
+            self._sweeper.start()
+    
+    def handler(self, fn):
+        """Decorator registering the function that processes a webhook payload."""
+        self._handler = fn
+        return fn
+    
+    def submit(self, event_id, data=None):
+        """
+        Queue a stored event for processing.
+        
+        Args:
+            event_id (int): The event ID
+            data (dict): The payload, when the caller has already decoded it,
+                so the worker does not decode it again
+        """
+        self._pool().submit(self._run, event_id, data)
+    
+    def _pool(self):
+        """Return the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='webhook')
+            return self._executor
+    
+    def _update(self, event_id, *where, **values):
+        """
+        Write event fields in a short transaction of their own.
+        
+        Returns:
+            int: 1 if the event was updated, 0 if it is missing or did not match where
+        """
+        table = WebhookEvent.__table__
+        with db.engine.begin() as conn:
+            return conn.execute(
+                table.update()
+                .where(table.c.id == event_id, *where)
+                .values(updated_at=datetime.utcnow(), **values)
+            ).rowcount
+    
+    def _run(self, event_id, data=None):
+        """Worker thread: claim an event, run the handler and record the outcome."""
+        table = WebhookEvent.__table__
+        with self.app.app_context():
+            # Claim the event atomically, so a requeued event never runs twice at once
+            if not self._update(event_id, table.c.status == WebhookStatus.PENDING,
+                                status=WebhookStatus.PROCESSING, attempts=table.c.attempts + 1):
+                return
+            
+            event = db.session.get(WebhookEvent, event_id)
+            platform, payload, attempts = event.platform, event.payload, event.attempts
+            
+            try:
+                if data is None:
+                    data = json.loads(payload)
+                delivery_order_id = self._handler(platform, data)
+            except (InvalidWebhook, json.JSONDecodeError) as e:
+                db.session.rollback()
+                logger.error(f"Rejected {platform.value} webhook #{event_id}: {str(e)}")
+                self._update(event_id, status=WebhookStatus.FAILED, error=str(e))
+                return
+            except Exception as e:
+                db.session.rollback()
+                give_up = attempts >= self.max_attempts
+                logger.error(f"Error processing {platform.value} webhook #{event_id} "
+                             f"(attempt {attempts}{', giving up' if give_up else ''}): {str(e)}", exc_info=True)
+                self._update(event_id, status=WebhookStatus.FAILED if give_up else WebhookStatus.PENDING, error=str(e))
+                return
+            
+            self._update(event_id, status=WebhookStatus.PROCESSED, error=None,
+                         delivery_order_id=delivery_order_id, processed_at=datetime.utcnow())
+    
+    def _sweep(self):
+        """
+        Requeue events that are due.
+        
+        Pending events untouched for a retry interval are failed attempts
+        waiting for a retry, or events whose submission was lost in a restart.
+        Events processing for ten intervals belong to a worker that died.
+        """
+        table = WebhookEvent.__table__
+        now = datetime.utcnow()
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(
+                    table.update()
+                    .where(table.c.status == WebhookStatus.PROCESSING,
+                           table.c.updated_at < now - timedelta(seconds=self.retry_interval * 10))
+                    .values(status=WebhookStatus.PENDING, updated_at=now - timedelta(seconds=self.retry_interval))
+                )
+                due = conn.execute(
+                    db.select(table.c.id)
+                    .where(table.c.status == WebhookStatus.PENDING,
+                           table.c.updated_at < now - timedelta(seconds=self.retry_interval))
+                    .order_by(table.c.id)
+                    .limit(SWEEP_BATCH)
+                ).scalars().all()
+        
+        for event_id in due:
+            self.submit(event_id)
+        if due:
+            logger.info(f"Requeued {len(due)} webhook events")
+    
+    def _sweep_loop(self):
+        """Sweeper thread: requeue due events every retry interval."""
+        while True:
+            time.sleep(self.retry_interval)
+            try:
+                self._sweep()
+            except Exception as e:
+                logger.error(f"Webhook sweep failed: {str(e)}", exc_info=True)
+
+
+webhook_processor = WebhookProcessor()
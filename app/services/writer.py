@@ -0,0 +1,134 @@
+from concurrent.futures import Future, TimeoutError
+from app import db
+from app.utils.session import transaction
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class WriteQueue:
+    """
+    Serializes database writes through one dedicated writer thread.
+
+    SQLite allows a single writer at a time, so instead of every request
+    thread competing for the write lock, write jobs are queued and run by one
+    thread that groups whatever is waiting into a single commit.
+
+    A job is a function that stages changes on ``db.session`` and returns
+    plain values (IDs, dicts), never ORM objects, since it runs in the
+    writer's own session. When the queue is disabled, jobs run inline in the
+    caller's session and are committed immediately, so callers behave the
+    same either way.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = False
+        self._queue = queue.Queue()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the queue and start the writer thread if enabled."""
+        self.app = app
+        self.enabled = app.config.get('WRITE_QUEUE_ENABLED', False)
+        self.max_batch = app.config.get('WRITE_QUEUE_MAX_BATCH', 32)
+        self.timeout = app.config.get('WRITE_QUEUE_TIMEOUT', 30)
+
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+            self._thread.start()
+            logger.info(f"Write queue enabled (max batch {self.max_batch})")
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue a write job.
+
+        Returns:
+            Future: Resolves to the job's return value once it is committed
+        """
+        future = Future()
+        if not self.enabled:
+            try:
+                with transaction():
+                    result = fn(*args, **kwargs)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Run a write job and wait for its committed result.
+
+        If the job has not started after WRITE_QUEUE_TIMEOUT seconds it is
+        cancelled, so it can never commit after the caller gave up, and
+        TimeoutError is raised. A job the writer has already started is
+        waited for, since it may commit.
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            if future.cancel():
+                logger.warning(f"Write job {getattr(fn, '__name__', fn)} cancelled after waiting {self.timeout}s")
+                raise
+            return future.result()
+
+    def _run(self):
+        """Writer thread: drain the queue in batches, one commit per batch."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"Write queue batch failed: {str(e)}", exc_info=True)
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, batch):
+        """Run a batch of jobs in one transaction.
+
+        If any job fails, the batch is rolled back and each job is retried in
+        a transaction of its own, so one bad job only fails its own caller.
+        """
+        results = []
+        with self.app.app_context():
+            try:
+                for fn, args, kwargs, future in batch:
+                    # Skip jobs cancelled by a caller that timed out; a started job cannot be cancelled
+                    if future.running() or future.set_running_or_notify_cancel():
+                        results.append((future, fn(*args, **kwargs)))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                if len(batch) == 1:
+                    raise
+                results = None
+
+        if results is None:
+            for job in batch:
+                try:
+                    self._process([job])
+                except Exception as e:
+                    job[3].set_exception(e)
+            return
+
+        for future, result in results:
+            future.set_result(result)
+
+
+write_queue = WriteQueue()
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import abort, flash, redirect, url_for
+from flask import abort, flash, g, redirect, url_for
 from flask_login import current_user
 
 
@@ -22,4 +22,13 @@ def staff_required(f):
             flash('Please log in to access this page.', 'danger')
             return redirect(url_for('auth.login'))
         return f(*args, **kwargs)
-    return decorated_function 
\ No newline at end of file
+    return decorated_function
+
+
+def read_only(f):
+    """Decorator for report and export routes: run their queries on the read-only database."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.read_only = True
+        return f(*args, **kwargs)
+    return decorated_function
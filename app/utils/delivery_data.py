@@ -1,8 +1,226 @@
-import json
+from app.models.delivery import DeliveryPlatform
+from app.models.order import OrderType
+from types import MappingProxyType
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stand-in for missing or null objects inside a payload
+EMPTY = MappingProxyType({})
+
+
+class Field:
+    """A payload value: the keys leading to it and its default when any of them is missing."""
+    
+    def __init__(self, *path, default=None):
+        self.path = path
+        self.default = default
+    
+    def getter(self):
+        """Return a function that reads the value from a payload object."""
+        *parents, key = self.path
+        default = self.default
+        # A list default is copied, so standardized payloads never share it
+        new_default = list if isinstance(default, list) else None
+        
+        def get(data):
+            for parent in parents:
+                data = data.get(parent) or EMPTY
+            return data.get(key, new_default() if new_default else default)
+        return get
+
+
+class Names:
+    """The names of the objects in the first of several keys that holds a list, such as an item's addons."""
+    
+    def __init__(self, *keys):
+        self.keys = keys
+    
+    def getter(self):
+        """Return a function that reads the names from a payload object."""
+        keys = self.keys
+        
+        def get(data):
+            for key in keys:
+                entries = data.get(key)
+                if isinstance(entries, list):
+                    return [entry.get('name', '') for entry in entries]
+            return []
+        return get
+
+
+def build_mapping(spec, many=False):
+    """
+    Build a function that extracts a field mapping from a payload.
+    
+    Each field becomes a getter closure once, so extracting a payload runs
+    plain dict lookups with no per-call platform checks.
+    
+    Args:
+        spec (dict): Output keys mapped to a Field, Names or a nested spec
+        many (bool): Whether the function maps a list of objects instead of a single object
+    
+    Returns:
+        function: fn(data) returning the mapped dict, or list of dicts if
+            many. Raises AttributeError if the payload or a parent of a
+            field is present but not an object.
+    """
+    getters = [(key, build_mapping(value) if isinstance(value, dict) else value.getter())
+               for key, value in spec.items()]
+    
+    def extract(data):
+        return {key: get(data) for key, get in getters}
+    
+    if many:
+        return lambda rows: [extract(data) for data in rows]
+    return extract
+
+
+class PlatformAdapter:
+    """
+    How one delivery platform signs its webhooks and lays out its orders.
+    
+    Each platform declares its field mappings once; they are built into
+    extractor functions when the adapter is created.
+    
+    Args:
+        platform (DeliveryPlatform): The platform
+        order_type (OrderType): Type of the restaurant orders created from its deliveries
+        signature_header (str): Request header carrying the webhook signature
+        order_fields (dict): Mapping of the standardized order, see build_mapping
+        item_fields (dict): Mapping of one standardized item
+    """
+    
+    def __init__(self, platform, order_type, signature_header, order_fields, item_fields):
+        self.platform = platform
+        self.order_type = order_type
+        self.signature_header = signature_header
+        self.secret_key = f'{platform.value}_webhook_secret'
+        self._order = build_mapping(order_fields)
+        self._items = build_mapping(item_fields, many=True)
+    
+    @property
+    def name(self):
+        return self.platform.value.title()
+    
+    def standardize(self, data):
+        """
+        Standardize an order payload.
+        
+        Args:
+            data (dict): The raw data from the delivery platform
+        
+        Returns:
+            dict: Standardized data structure, or an empty dict if the payload is malformed
+        """
+        try:
+            return self._order(data)
+        except (AttributeError, TypeError, KeyError) as e:
+            logger.error(f"Malformed {self.name} order payload: {str(e)}")
+            return {}
+    
+    def extract_items(self, items):
+        """
+        Standardize the items of an order payload.
+        
+        Args:
+            items (list): The items data from the delivery platform
+        
+        Returns:
+            list: Standardized items, or an empty list if they are malformed
+        """
+        if not items or not isinstance(items, list):
+            logger.warning(f"Invalid items data format from {self.platform.value}")
+            return []
+        
+        try:
+            return self._items(items)
+        except (AttributeError, TypeError, KeyError) as e:
+            logger.error(f"Malformed {self.name} items data: {str(e)}")
+            return []
+
+
+# Adapters by platform and by platform value
+ADAPTERS = {}
+
+
+def register_adapter(adapter):
+    """Register a platform adapter, replacing any previous one for its platform."""
+    ADAPTERS[adapter.platform] = ADAPTERS[adapter.platform.value] = adapter
+    return adapter
+
+
+def get_adapter(platform):
+    """
+    Look up the adapter of a platform.
+    
+    Args:
+        platform (DeliveryPlatform or str): The platform or its value, in any case
+    
+    Returns:
+        PlatformAdapter: The adapter, or None for an unknown platform
+    """
+    adapter = ADAPTERS.get(platform)
+    if adapter is None and isinstance(platform, str):
+        adapter = ADAPTERS.get(platform.lower())
+    return adapter
+
+
+register_adapter(PlatformAdapter(
+    DeliveryPlatform.ZOMATO,
+    OrderType.ZOMATO,
+    'X-Zomato-Signature',
+    order_fields={
+        'order_id': Field('order_id'),
+        'customer': {
+            'name': Field('customer', 'name'),
+            'phone': Field('customer', 'phone'),
+        },
+        'address': Field('delivery_address'),
+        'items': Field('items', default=[]),
+        'fees': {
+            'delivery_fee': Field('delivery_fee', default=0),
+            'platform_fee': Field('platform_fee', default=0),
+            'total': Field('total_amount', default=0)
+        }
+    },
+    item_fields={
+        'name': Field('name', default=''),
+        'quantity': Field('quantity', default=1),
+        'price': Field('price', default=0),
+        'notes': Field('special_instructions', default=''),
+        'variations': Names('addons')
+    }
+))
+
+register_adapter(PlatformAdapter(
+    DeliveryPlatform.SWIGGY,
+    OrderType.SWIGGY,
+    'X-Swiggy-Signature',
+    order_fields={
+        'order_id': Field('order_id'),
+        'customer': {
+            'name': Field('customer_details', 'name'),
+            'phone': Field('customer_details', 'phone'),
+        },
+        'address': Field('delivery_address', 'address'),
+        'items': Field('order_items', default=[]),
+        'fees': {
+            'delivery_fee': Field('charges', 'delivery_fee', default=0),
+            'platform_fee': Field('charges', 'platform_fee', default=0),
+            'total': Field('order_total', default=0)
+        }
+    },
+    item_fields={
+        'name': Field('item_name', default=''),
+        'quantity': Field('quantity', default=1),
+        'price': Field('item_price', default=0),
+        'notes': Field('special_instructions', default=''),
+        'variations': Names('addons', 'variations')
+    }
+))
+
+
 def standardize_delivery_data(platform, data):
     """
     Standardize delivery platform data into a consistent format.
@@ -10,47 +228,15 @@ def standardize_delivery_data(platform, data):
     Args:
         platform (str): The delivery platform name ('zomato' or 'swiggy')
         data (dict): The raw data from the delivery platform
-        
+    
     Returns:
         dict: Standardized data structure with consistent field names
     """
-    try:
-        if platform.lower() == 'zomato':
-            return {
-                'order_id': data.get('order_id'),
-                'customer': {
-                    'name': data.get('customer', {}).get('name'),
-                    'phone': data.get('customer', {}).get('phone'),
-                },
-                'address': data.get('delivery_address'),
-                'items': data.get('items', []),
-                'fees': {
-                    'delivery_fee': data.get('delivery_fee', 0),
-                    'platform_fee': data.get('platform_fee', 0),
-                    'total': data.get('total_amount', 0)
-                }
-            }
-        elif platform.lower() == 'swiggy':
-            return {
-                'order_id': data.get('order_id'),
-                'customer': {
-                    'name': data.get('customer_details', {}).get('name'),
-                    'phone': data.get('customer_details', {}).get('phone'),
-                },
-                'address': data.get('delivery_address', {}).get('address'),
-                'items': data.get('order_items', []),
-                'fees': {
-                    'delivery_fee': data.get('charges', {}).get('delivery_fee', 0),
-                    'platform_fee': data.get('charges', {}).get('platform_fee', 0),
-                    'total': data.get('order_total', 0)
-                }
-            }
-        else:
-            logger.error(f"Unknown delivery platform: {platform}")
-            return {}
-    except Exception as e:
-        logger.error(f"Error standardizing delivery data: {str(e)}", exc_info=True)
+    adapter = get_adapter(platform)
+    if adapter is None:
+        logger.error(f"Unknown delivery platform: {platform}")
         return {}
+    return adapter.standardize(data)
 
 
 def extract_items_data(platform, items):
@@ -60,54 +246,15 @@ def extract_items_data(platform, items):
     Args:
         platform (str): The delivery platform name ('zomato' or 'swiggy')
         items (list): The items data from the delivery platform
-        
+    
     Returns:
         list: Standardized items data with consistent field names
     """
-    try:
-        standardized_items = []
-        
-        if not items or not isinstance(items, list):
-            logger.warning(f"Invalid items data format from {platform}")
-            return []
-        
-        for item in items:
-            if platform.lower() == 'zomato':
-                # Extract variations if they exist
-                variations = []
-                if 'addons' in item and isinstance(item['addons'], list):
-                    for addon in item['addons']:
-                        variations.append(addon.get('name', ''))
-                
-                standardized_items.append({
-                    'name': item.get('name', ''),
-                    'quantity': item.get('quantity', 1),
-                    'price': item.get('price', 0),
-                    'notes': item.get('special_instructions', ''),
-                    'variations': variations
-                })
-            elif platform.lower() == 'swiggy':
-                # Extract variations if they exist
-                variations = []
-                if 'addons' in item and isinstance(item['addons'], list):
-                    for addon in item['addons']:
-                        variations.append(addon.get('name', ''))
-                elif 'variations' in item and isinstance(item['variations'], list):
-                    for variation in item['variations']:
-                        variations.append(variation.get('name', ''))
-                
-                standardized_items.append({
-                    'name': item.get('item_name', ''),
-                    'quantity': item.get('quantity', 1),
-                    'price': item.get('item_price', 0),
-                    'notes': item.get('special_instructions', ''),
-                    'variations': variations
-                })
-        
-        return standardized_items
-    except Exception as e:
-        logger.error(f"Error extracting items data: {str(e)}", exc_info=True)
+    adapter = get_adapter(platform)
+    if adapter is None:
+        logger.error(f"Unknown delivery platform: {platform}")
         return []
+    return adapter.extract_items(items)
 
 
 def validate_delivery_data(data):
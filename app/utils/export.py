@@ -0,0 +1,233 @@
+from flask import Response, stream_template, stream_with_context
+import csv
+import io
+import tempfile
+
+# Make xlsxwriter optional
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# Rows fetched from the database cursor per round trip
+YIELD_PER = 1000
+
+# Rows buffered before a chunk is sent to the client
+CHUNK_ROWS = 500
+
+# Bytes read per chunk when sending a finished file
+CHUNK_BYTES = 64 * 1024
+
+# Rows per table in paginated HTML reports; each table starts a new printed page
+PAGE_ROWS = 1000
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def iter_rows(query, yield_per=YIELD_PER):
+    """
+    Iterate over a query's rows without loading the whole result.
+    
+    Args:
+        query: A SQLAlchemy query selecting plain columns (not entities)
+        yield_per (int): Rows fetched per cursor round trip
+        
+    Returns:
+        iterator: The query rows, fetched from a server-side cursor where supported
+    """
+    return query.yield_per(yield_per)
+
+
+def iter_csv(headers, rows):
+    """
+    Yield a CSV document in chunks.
+    
+    The header line is yielded before the first row is requested. With a
+    lazy row source, such as a generator over a query, the client therefore
+    receives data before the query has even started; a list of rows has
+    already been fetched by the time it is passed in.
+    
+    Args:
+        headers (list): Column headers
+        rows (iterable): Row sequences, read only after the header is yielded
+        
+    Returns:
+        iterator: CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    writer.writerow(headers)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+def iter_xlsx(sheet_name, headers, rows, money_columns=()):
+    """
+    Yield an XLSX workbook in chunks.
+    
+    The workbook is written in xlsxwriter's constant_memory mode, which
+    flushes each row to a temporary file as soon as the next one starts, and
+    the finished file is then read back from disk piece by piece.
+    
+    Args:
+        sheet_name (str): Worksheet name
+        headers (list): Column headers
+        rows (iterable): Row sequences
+        money_columns (iterable): Indexes of columns to format with two decimals
+        
+    Returns:
+        iterator: XLSX file chunks
+    """
+    with tempfile.TemporaryFile() as output:
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        # Column formats must be set before any row is written in constant_memory mode
+        money_format = workbook.add_format({'num_format': '0.00'})
+        for column in money_columns:
+            worksheet.set_column(column, column, 12, money_format)
+        
+        worksheet.write_row(0, 0, headers, workbook.add_format({'bold': True}))
+        for row_number, row in enumerate(rows, 1):
+            worksheet.write_row(row_number, 0, row)
+        
+        workbook.close()
+        output.seek(0)
+        while True:
+            chunk = output.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def iter_pages(rows, size=PAGE_ROWS):
+    """Group rows into lists of at most size rows."""
+    page = []
+    for row in rows:
+        page.append(row)
+        if len(page) == size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+class Report:
+    """
+    A tabular report over a column query, exportable as CSV, XLSX or paginated HTML.
+    
+    Rows are read from the database in chunks and written out as they
+    arrive, so memory stays bounded whatever the date range.
+    """
+    
+    # Export format -> (file extension, mimetype)
+    FORMATS = {
+        'csv': ('csv', 'text/csv'),
+        'excel': ('xlsx', XLSX_MIMETYPE),
+        'pdf': ('html', 'text/html'),
+    }
+    
+    # Paginated HTML template, printed or saved as PDF by the browser
+    TEMPLATE = 'billing/export_pdf.html'
+    
+    def __init__(self, title, filename, headers, query, format_row, money_columns=(), summarize=None):
+        """
+        Args:
+            title (str): Report and worksheet title
+            filename (str): Download file name without extension
+            headers (list): Column headers
+            query: A SQLAlchemy query selecting plain columns
+            format_row (callable): Turns a query row into a list of cell values
+            money_columns (iterable): Indexes of the columns holding amounts
+            summarize (callable): Returns the 'details' and 'summary' label/value
+                lists shown above and below the HTML report
+        """
+        self.title = title
+        self.filename = filename
+        self.headers = headers
+        self.query = query
+        self.format_row = format_row
+        self.money_columns = tuple(money_columns)
+        self.summarize = summarize
+    
+    def count(self):
+        """Count the report rows."""
+        return self.query.order_by(None).count()
+    
+    def rows(self, on_progress=None):
+        """
+        Iterate over the formatted report rows.
+        
+        Args:
+            on_progress (callable): Called with the number of rows produced so far, every CHUNK_ROWS rows
+        """
+        for count, row in enumerate(iter_rows(self.query), 1):
+            yield self.format_row(row)
+            if on_progress and count % CHUNK_ROWS == 0:
+                on_progress(count)
+    
+    def pages(self, size=PAGE_ROWS, on_progress=None):
+        """Iterate over the formatted report rows in pages."""
+        return iter_pages(self.rows(on_progress), size)
+    
+    def download_name(self, format):
+        """Return the file name of the report in an export format."""
+        return f'{self.filename}.{self.FORMATS[format][0]}'
+    
+    def chunks(self, format, on_progress=None, **context):
+        """
+        Generate the report file piece by piece.
+        
+        Args:
+            format (str): One of FORMATS
+            on_progress (callable): See rows()
+            **context: Extra template variables for the HTML format
+            
+        Returns:
+            iterator: Text (CSV, HTML) or bytes (XLSX) chunks
+        """
+        if format == 'csv':
+            return iter_csv(self.headers, self.rows(on_progress))
+        if format == 'excel':
+            return iter_xlsx(self.title[:31], self.headers, self.rows(on_progress), self.money_columns)
+        if format == 'pdf':
+            if self.summarize:
+                context.update(self.summarize())
+            return stream_template(self.TEMPLATE, report=self, on_progress=on_progress, **context)
+        raise ValueError(f'Unknown export format: {format}')
+    
+    def response(self, format, **context):
+        """
+        Build a streamed download of the report.
+        
+        The request context stays open while the body is generated, so
+        queries run on the same bind (e.g. the read-only one) as the view.
+        
+        Args:
+            format (str): One of FORMATS
+            **context: Extra template variables for the HTML format
+            
+        Returns:
+            Response: A streamed response; HTML is shown inline, other formats download
+        """
+        chunks = stream_with_context(self.chunks(format, **context))
+        mimetype = self.FORMATS[format][1]
+        if format == 'pdf':
+            return Response(chunks, mimetype=mimetype)
+        return Response(
+            chunks,
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={self.download_name(format)}'}
+        )
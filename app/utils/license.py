@@ -0,0 +1,110 @@
+import datetime
+import json
+import os
+import threading
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+
+PUBLIC_KEY_PATH = 'public.pem'
+
+_lock = threading.Lock()
+_license_path = None
+_license_path_key = None
+_license_info = None
+_license_info_key = None
+
+
+def _mtime(path):
+    """Return the modification time of a path, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _find_license_file():
+    """Find the first license_*.lic file, rescanning only when the directory changes."""
+    global _license_path, _license_path_key
+
+    dir_mtime = _mtime('.')
+    if dir_mtime != _license_path_key or dir_mtime is None:
+        _license_path = None
+        for f in os.listdir('.'):
+            if f.startswith('license_') and f.endswith('.lic'):
+                _license_path = f
+                break
+        _license_path_key = dir_mtime
+    return _license_path
+
+
+def _verify_license(license_path):
+    """Verify the license signature and work out how many days are left."""
+    license_days_left = None
+    license_expiry_date = None
+    license_error = None
+
+    try:
+        if not license_path:
+            license_error = "License file not found."
+        else:
+            with open(license_path, 'r') as lic_file:
+                license_data = json.load(lic_file)
+
+            with open(PUBLIC_KEY_PATH, 'rb') as key_file:
+                public_key = serialization.load_pem_public_key(key_file.read())
+
+            license_json = json.dumps(license_data["license"], separators=(',', ':')).encode()
+            signature = bytes.fromhex(license_data["signature"])
+
+            # Verify signature
+            public_key.verify(
+                signature,
+                license_json,
+                padding.PSS(
+                    mgf=padding.MGF1(hashes.SHA256()),
+                    salt_length=padding.PSS.MAX_LENGTH,
+                ),
+                hashes.SHA256()
+            )
+
+            expiry_date = datetime.datetime.strptime(license_data["license"]["expiry_date"], "%Y-%m-%d").date()
+            license_expiry_date = expiry_date.strftime("%Y-%m-%d")
+            days_left = (expiry_date - datetime.date.today()).days
+            license_days_left = days_left
+
+            if days_left < 0:
+                license_error = "License expired."
+    except Exception as e:
+        license_error = f"License verification failed: {str(e)}"
+
+    return dict(
+        license_days_left=license_days_left,
+        license_expiry_date=license_expiry_date,
+        license_error=license_error
+    )
+
+
+def get_license_info():
+    """Return the verified license details for templates.
+
+    The result is cached in memory and only re-verified when the license file
+    or public key changes on disk, or when the date rolls over.
+
+    Returns:
+        dict: license_days_left, license_expiry_date and license_error
+    """
+    global _license_info, _license_info_key
+
+    with _lock:
+        license_path = _find_license_file()
+        key = (
+            datetime.date.today(),
+            license_path,
+            _mtime(license_path) if license_path else None,
+            _mtime(PUBLIC_KEY_PATH)
+        )
+        if key != _license_info_key:
+            _license_info = _verify_license(license_path)
+            _license_info_key = key
+        return dict(_license_info)
@@ -0,0 +1,93 @@
+from app import db
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+import binascii
+
+# Default and maximum page sizes for history lists
+PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+
+def encode_cursor(created_at, id):
+    """Encode a row's sort key as an opaque URL-safe cursor."""
+    return urlsafe_b64encode(f'{created_at.isoformat()}|{id}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor.
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, id = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().split('|')
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+
+class KeysetPage:
+    """One page of rows, newest first, and the cursor of the page after it."""
+
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def keyset_page(query, model, cursor=None, per_page=PER_PAGE):
+    """
+    Fetch one page of a query ordered by (created_at, id), newest first.
+
+    Instead of an OFFSET, which makes the database walk past every skipped
+    row, each page starts right after the last row of the previous one, so
+    old pages are as cheap as the first when (created_at, id) is indexed.
+
+    Args:
+        query: Query over model, without ordering or limit
+        model: Model with created_at and id columns
+        cursor (str): next_cursor of the previous page, or None for the first page
+        per_page (int): Number of rows per page
+
+    Returns:
+        KeysetPage: The rows and the cursor of the next page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        # The first condition alone bounds the index range scan
+        query = query.filter(
+            model.created_at <= created_at,
+            db.or_(model.created_at < created_at, model.id < id)
+        )
+
+    # One extra row tells whether there is a next page
+    items = query.order_by(model.created_at.desc(), model.id.desc()).limit(per_page + 1).all()
+    if len(items) <= per_page:
+        return KeysetPage(items)
+
+    items = items[:per_page]
+    return KeysetPage(items, encode_cursor(items[-1].created_at, items[-1].id))
+
+
+def page_args(args):
+    """
+    Read the cursor and page size from request arguments.
+
+    Returns:
+        tuple: (cursor, per_page), with per_page clamped to 1..MAX_PER_PAGE
+
+    Raises:
+        ValueError: If per_page is not a number
+    """
+    per_page = min(max(int(args.get('per_page', PER_PAGE)), 1), MAX_PER_PAGE)
+    return args.get('cursor') or None, per_page
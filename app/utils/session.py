@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+
+# SQLALCHEMY_BINDS key of the read-only engine used by reports and exports
+READ_ONLY_BIND = 'reports'
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the read-only engine while a view marked with
+    ``read_only`` is running, or to the primary one if there is no such bind.
+    
+    Flushes always go to the primary engine, so a report that accidentally
+    writes still behaves correctly instead of failing on the read-only bind.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_app_context()
+            and g.get('read_only')
+        ):
+            engine = self._db.engines.get(READ_ONLY_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def transaction():
+    """
+    Commit the session when the block finishes, or roll it back if anything in it fails.
+    
+    Model methods only stage their changes; views and write jobs wrap the
+    calls that form one unit of work in this block, so it is committed
+    exactly once, and a failure never leaves half of it in the session.
+    
+    Yields:
+        Session: The scoped session
+    """
+    from app import db
+    try:
+        yield db.session
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
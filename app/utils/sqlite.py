@@ -0,0 +1,57 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Applied first, since it changes how the database file is opened
+_PRAGMA_ORDER = ['journal_mode', 'busy_timeout']
+
+
+def configure_sqlite_engine(engine, pragmas):
+    """
+    Apply PRAGMA settings to every new connection of a SQLite engine.
+    
+    Args:
+        engine: The SQLAlchemy engine
+        pragmas (dict): PRAGMA names mapped to their values
+        
+    Returns:
+        bool: True if the engine is SQLite and the pragmas were registered
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return False
+    
+    ordered = sorted(pragmas.items(), key=lambda item: (
+        _PRAGMA_ORDER.index(item[0]) if item[0] in _PRAGMA_ORDER else len(_PRAGMA_ORDER)
+    ))
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in ordered:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+    
+    logger.info(f"SQLite pragmas: {', '.join(f'{name}={value}' for name, value in ordered)}")
+    return True
+
+
+def is_memory_database(url):
+    """
+    Tell whether a database URL names an in-memory SQLite database.
+    
+    Every engine opened on such a URL gets a new, empty database of its own.
+    
+    Args:
+        url (str): SQLAlchemy database URL
+        
+    Returns:
+        bool: True for sqlite://, sqlite:///:memory: and mode=memory URIs
+    """
+    url = make_url(url)
+    if url.get_backend_name() != 'sqlite':
+        return False
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
@@ -0,0 +1,109 @@
+"""
+Benchmark the NumPy order analytics over a year of history.
+
+Seeds a throwaway SQLite database with a year of completed orders and paid
+bills, then prints how long OrderHistory takes to load the year and to
+compute each metric.
+
+Usage:
+    python benchmarks/bench_analytics.py [orders]    (default: 300000)
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.config import Config
+from app.services.analytics import ANALYTICS, OrderHistory
+
+CATEGORIES = 8
+MENU_ITEMS = 120
+ITEMS_PER_ORDER = 3
+BATCH_SIZE = 50000
+
+
+def seed(path, orders):
+    """Fill the database with a year of completed orders, each with a paid bill."""
+    conn = sqlite3.connect(path)
+    now = datetime.utcnow()
+    span = int(timedelta(days=365).total_seconds())
+
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role, is_active) "
+                 "VALUES (1, 'bench', 'bench@example.com', 'x', 'admin', 1)")
+    conn.executemany("INSERT INTO categories (id, name) VALUES (?, ?)",
+                     [(i, f'Category {i}') for i in range(1, CATEGORIES + 1)])
+    # Every other item has a cost price
+    conn.executemany("INSERT INTO menu_items (id, name, full_price, cost_price, category_id, is_available) "
+                     "VALUES (?, ?, ?, ?, ?, 1)",
+                     [(i, f'Item {i}', 5.0 + i, (2.0 + i / 2) if i % 2 else None, i % CATEGORIES + 1)
+                      for i in range(1, MENU_ITEMS + 1)])
+
+    # Orders are numbered in time order, as they are when placed live
+    offsets = sorted((random.randrange(span) for _ in range(orders)), reverse=True)
+
+    item_id = 0
+    for start in range(1, orders + 1, BATCH_SIZE):
+        order_rows, item_rows, bill_rows = [], [], []
+        for order_id in range(start, min(start + BATCH_SIZE, orders + 1)):
+            created_at = now - timedelta(seconds=offsets[order_id - 1])
+            subtotal = 0.0
+            for _ in range(ITEMS_PER_ORDER):
+                item_id += 1
+                menu_item_id = random.randint(1, MENU_ITEMS)
+                quantity = random.randint(1, 3)
+                subtotal += (5.0 + menu_item_id) * quantity
+                item_rows.append((item_id, order_id, menu_item_id, quantity, random.random() < 0.2,
+                                  5.0 + menu_item_id, created_at))
+            order_rows.append((order_id, created_at))
+            bill_rows.append((order_id, order_id, f'BILL{order_id:07d}', subtotal, subtotal * 0.05,
+                              subtotal * 1.05, created_at))
+        conn.executemany("INSERT INTO orders (id, user_id, status, order_type, created_at) "
+                         "VALUES (?, 1, 'COMPLETED', 'DINE_IN', ?)", order_rows)
+        conn.executemany("INSERT INTO order_items (id, order_id, menu_item_id, quantity, is_half, price, created_at) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", item_rows)
+        conn.executemany("INSERT INTO bills (id, order_id, bill_number, subtotal, tax_amount, discount, "
+                         "total_amount, payment_method, payment_status, created_at) "
+                         "VALUES (?, ?, ?, ?, ?, 0.0, ?, 'CASH', 1, ?)", bill_rows)
+        conn.commit()
+    conn.close()
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+
+        print(f'Seeding {orders} orders over a year into {path} ...')
+        started = time.perf_counter()
+        seed(path, orders)
+        print(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+        end = datetime.utcnow().date()
+        start = end - timedelta(days=364)
+
+        started = time.perf_counter()
+        history = OrderHistory.load(start, end)
+        print(f'Loaded {len(history.orders["id"])} orders, {len(history.items["order_id"])} items and '
+              f'{len(history.bills["total_amount"])} bills in {time.perf_counter() - started:.2f}s')
+
+        for name, metric in ANALYTICS.items():
+            started = time.perf_counter()
+            metric(history)
+            print(f'{name:>12}: {(time.perf_counter() - started) * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark paging deep into bill history with OFFSET versus keyset cursors.
+
+Seeds a throwaway SQLite database with a year of bills, then prints the
+median latency of fetching one page at increasing depths, first with
+LIMIT/OFFSET and then with keyset_page on (created_at, id).
+
+Usage:
+    python benchmarks/bench_history_pages.py [bills]    (default: 500000)
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.config import Config
+from app.models.bill import Bill
+from app.utils.pagination import PER_PAGE, encode_cursor, keyset_page
+
+BATCH_SIZE = 50000
+RUNS = 5
+DEPTHS = [0, 100, 1000, 5000]
+
+
+def seed(path, bills):
+    """Fill the database with a year of paid bills, one order each."""
+    conn = sqlite3.connect(path)
+    now = datetime.utcnow()
+    span = int(timedelta(days=365).total_seconds())
+
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role, is_active) "
+                 "VALUES (1, 'bench', 'bench@example.com', 'x', 'admin', 1)")
+    for start in range(1, bills + 1, BATCH_SIZE):
+        order_rows, bill_rows = [], []
+        for bill_id in range(start, min(start + BATCH_SIZE, bills + 1)):
+            created_at = now - timedelta(seconds=random.randrange(span))
+            order_rows.append((bill_id, created_at))
+            bill_rows.append((bill_id, bill_id, f'BILL{bill_id:07d}', created_at))
+        conn.executemany("INSERT INTO orders (id, user_id, status, order_type, created_at) "
+                         "VALUES (?, 1, 'COMPLETED', 'DINE_IN', ?)", order_rows)
+        conn.executemany("INSERT INTO bills (id, order_id, bill_number, subtotal, tax_amount, discount, "
+                         "total_amount, payment_method, payment_status, created_at) "
+                         "VALUES (?, ?, ?, 100.0, 5.0, 0.0, 105.0, 'CASH', 1, ?)", bill_rows)
+        conn.commit()
+    conn.close()
+
+
+def offset_page(page):
+    """A page of bills the way billing.index would fetch it with OFFSET."""
+    return Bill.query.order_by(Bill.created_at.desc(), Bill.id.desc()) \
+        .offset(page * PER_PAGE).limit(PER_PAGE).all()
+
+
+def median_ms(fn):
+    """Return the median wall time of fn in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    bills = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+
+        print(f'Seeding {bills} bills into {path} ...')
+        started = time.perf_counter()
+        seed(path, bills)
+        print(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+        for page in DEPTHS:
+            if page * PER_PAGE >= bills:
+                break
+            # The cursor a client holds after reading the pages before this one
+            cursor = None
+            if page:
+                last = offset_page(page - 1)[-1]
+                cursor = encode_cursor(last.created_at, last.id)
+
+            expected = [bill.id for bill in offset_page(page)]
+            assert [bill.id for bill in keyset_page(Bill.query, Bill, cursor).items] == expected
+
+            offset_ms = median_ms(lambda: offset_page(page))
+            keyset_ms = median_ms(lambda: keyset_page(Bill.query, Bill, cursor))
+            print(f'page {page:>5}:  offset {offset_ms:8.2f} ms   keyset {keyset_ms:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark the hot order, bill and delivery queries with and without indexes.
+
+Seeds a throwaway SQLite database, then prints the query plan and median
+latency of each query before and after the model indexes are created.
+
+Usage:
+    python benchmarks/bench_indexes.py [orders]    (default: 1000000)
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.config import Config
+
+TABLES = 40
+MENU_ITEMS = 50
+ITEMS_PER_ORDER = 2
+BATCH_SIZE = 50000
+RUNS = 5
+
+QUERIES = [
+    ('active orders (order.index)',
+     "SELECT id FROM orders WHERE status = 'ACTIVE' ORDER BY created_at DESC"),
+    ('active order for table',
+     "SELECT id FROM orders WHERE table_id = 7 AND status = 'ACTIVE' LIMIT 1"),
+    ('completed orders, last 50',
+     "SELECT id FROM orders WHERE status = 'COMPLETED' ORDER BY created_at DESC LIMIT 50"),
+    ("today's paid sales",
+     "SELECT SUM(total_amount) FROM bills WHERE created_at BETWEEN :start AND :end AND payment_status = 1"),
+    ('items of one order',
+     "SELECT id FROM order_items WHERE order_id = :order_id"),
+    ('pending delivery orders',
+     "SELECT id FROM delivery_orders WHERE status IN ('PENDING', 'ACCEPTED', 'PREPARING') ORDER BY created_at DESC"),
+    ('completed delivery orders, last 50',
+     "SELECT id FROM delivery_orders WHERE status IN ('DELIVERED', 'PICKED_UP') ORDER BY updated_at DESC LIMIT 50"),
+]
+
+
+def seed(path, orders):
+    """Fill the database with a realistic mix of orders, items, bills and deliveries."""
+    conn = sqlite3.connect(path)
+    now = datetime.utcnow()
+    span = int(timedelta(days=730).total_seconds())
+
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role, is_active) "
+                 "VALUES (1, 'bench', 'bench@example.com', 'x', 'admin', 1)")
+    conn.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+    conn.executemany("INSERT INTO tables (id, name, capacity, is_occupied) VALUES (?, ?, 4, 1)",
+                     [(i, f'Table {i}') for i in range(1, TABLES + 1)])
+    conn.executemany("INSERT INTO menu_items (id, name, full_price, category_id, is_available) VALUES (?, ?, ?, 1, 1)",
+                     [(i, f'Item {i}', 5.0 + i) for i in range(1, MENU_ITEMS + 1)])
+
+    item_id = 0
+    for start in range(1, orders + 1, BATCH_SIZE):
+        order_rows, item_rows, bill_rows = [], [], []
+        for order_id in range(start, min(start + BATCH_SIZE, orders + 1)):
+            created_at = now - timedelta(seconds=random.randrange(span))
+            # One active order per table, all older orders completed
+            active = order_id > orders - TABLES
+            table_id = (order_id % TABLES) + 1
+            total = 0.0
+            for _ in range(ITEMS_PER_ORDER):
+                item_id += 1
+                menu_item_id = random.randint(1, MENU_ITEMS)
+                price = 5.0 + menu_item_id
+                total += price
+                item_rows.append((item_id, order_id, menu_item_id, 1, 0, price, created_at))
+            order_rows.append((order_id, table_id, 'ACTIVE' if active else 'COMPLETED',
+                               ITEMS_PER_ORDER, total, created_at))
+            if not active:
+                bill_rows.append((order_id, order_id, f'BILL{order_id:06d}', total, 0.0, total,
+                                  random.random() < 0.95, created_at))
+        conn.executemany("INSERT INTO orders (id, table_id, user_id, status, order_type, items_count, total_amount, created_at) "
+                         "VALUES (?, ?, 1, ?, 'DINE_IN', ?, ?, ?)", order_rows)
+        conn.executemany("INSERT INTO order_items (id, order_id, menu_item_id, quantity, is_half, price, created_at) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", item_rows)
+        conn.executemany("INSERT INTO bills (id, order_id, bill_number, subtotal, tax_amount, total_amount, payment_status, created_at) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", bill_rows)
+        conn.commit()
+
+    statuses = ['DELIVERED'] * 8 + ['PICKED_UP', 'CANCELLED']
+    delivery_rows = []
+    for i in range(1, orders // 10 + 1):
+        created_at = now - timedelta(seconds=random.randrange(span))
+        delivery_rows.append((i, random.choice(['ZOMATO', 'SWIGGY']), f'P{i}', random.choice(statuses),
+                              created_at, created_at + timedelta(minutes=40)))
+    delivery_rows += [(len(delivery_rows) + i, 'ZOMATO', f'PENDING{i}', 'PENDING', now, now) for i in range(1, 11)]
+    conn.executemany("INSERT INTO delivery_orders (id, platform, platform_order_id, status, customer_name, customer_phone, "
+                     "customer_address, created_at, updated_at) VALUES (?, ?, ?, ?, 'A', '1', 'X', ?, ?)", delivery_rows)
+    conn.commit()
+    conn.close()
+
+
+def measure(path, params):
+    """Return (plan, median milliseconds) for each benchmark query."""
+    conn = sqlite3.connect(path)
+    results = []
+    for label, sql in QUERIES:
+        plan = ' | '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params))
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append((label, plan, statistics.median(timings)))
+    conn.close()
+    return results
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        indexes = [index for table in db.metadata.sorted_tables for index in table.indexes]
+        for index in indexes:
+            index.drop(db.engine)
+
+        print(f'Seeding {orders} orders into {path} ...')
+        started = time.perf_counter()
+        seed(path, orders)
+        print(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+        today = datetime.utcnow().date()
+        params = {
+            'start': datetime.combine(today, datetime.min.time()),
+            'end': datetime.combine(today, datetime.max.time()),
+            'order_id': orders // 2,
+        }
+        before = measure(path, params)
+
+        for index in indexes:
+            index.create(db.engine)
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql('ANALYZE')
+        after = measure(path, params)
+
+    for (label, plan_before, ms_before), (_, plan_after, ms_after) in zip(before, after):
+        print(f'\n{label}')
+        print(f'  before: {ms_before:9.2f} ms  {plan_before}')
+        print(f'  after:  {ms_after:9.2f} ms  {plan_after}')
+
+
+if __name__ == '__main__':
+    main()
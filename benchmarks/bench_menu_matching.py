@@ -0,0 +1,119 @@
+"""
+Benchmark resolving delivery order lines to menu items with queries versus the menu index.
+
+Seeds a throwaway SQLite database with a menu, then prints the median time
+and query count to resolve a 15-line delivery order the way accept_order
+used to (exact name query, then an ILIKE scan, then the first menu item)
+and with the in-memory MenuIndex, plus the time to build the index.
+
+Usage:
+    python benchmarks/bench_menu_matching.py [menu_items]    (default: 2000)
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g
+from sqlalchemy import event
+
+from app import create_app, db
+from app.config import Config
+from app.models.delivery import DeliveryPlatform
+from app.models.menu import MenuItem
+from app.services.menu_matcher import menu_matcher
+
+RUNS = 20
+ORDER_LINES = 15
+WORDS = ['chicken', 'paneer', 'butter', 'masala', 'tikka', 'garlic', 'naan', 'dal', 'makhani', 'veg',
+         'biryani', 'mutton', 'rogan', 'josh', 'aloo', 'gobi', 'palak', 'jeera', 'rice', 'lassi']
+
+
+def seed(path, items):
+    """Fill the database with menu items named from a small vocabulary."""
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO categories (id, name) VALUES (1, 'Mains')")
+    conn.executemany("INSERT INTO menu_items (id, name, full_price, category_id, is_available) VALUES (?, ?, ?, 1, 1)",
+                     [(i, f"{' '.join(random.sample(WORDS, 3)).title()} {i}", 100.0) for i in range(1, items + 1)])
+    conn.commit()
+    conn.close()
+
+
+def order_lines(names):
+    """Delivery item names as platforms send them: exact, reworded, misspelt or unknown."""
+    lines = []
+    for name in random.sample(names, ORDER_LINES):
+        kind = random.randrange(4)
+        if kind == 1:
+            name = f'{name} (Full)'
+        elif kind == 2:
+            name = name.replace('a', 'e', 1)
+        elif kind == 3:
+            name = 'Chef Special Platter'
+        lines.append(name)
+    return lines
+
+
+def with_queries(lines):
+    """The per-line lookups accept_order used to make."""
+    for item_name in lines:
+        menu_item = MenuItem.query.filter(MenuItem.name == item_name).first()
+        if not menu_item:
+            menu_item = MenuItem.query.filter(MenuItem.name.ilike(f'%{item_name}%')).first()
+        if not menu_item:
+            menu_item = MenuItem.query.first()
+
+
+def with_index(lines):
+    g.pop('_menu_index_checked', None)  # Check the menu is unchanged, as a new request would
+    index = menu_matcher.index()
+    for item_name in lines:
+        index.match(DeliveryPlatform.ZOMATO, item_name)
+
+
+def measure(fn, lines):
+    """Median milliseconds and the query count of one call."""
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    timings = []
+    for _ in range(RUNS):
+        queries.clear()
+        started = time.perf_counter()
+        fn(lines)
+        timings.append(time.perf_counter() - started)
+        db.session.rollback()
+    event.remove(db.engine, 'before_cursor_execute', listener)
+    return statistics.median(timings) * 1000, len(queries)
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        seed(path, items)
+
+        started = time.perf_counter()
+        menu_matcher.index()
+        print(f'Built the index of {items} menu items in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+        lines = order_lines([name for name, in db.session.query(MenuItem.name)])
+        for label, fn in [('queries', with_queries), ('index', with_index)]:
+            elapsed, queries = measure(fn, lines)
+            print(f'{label:>8}: {elapsed:7.2f} ms per {ORDER_LINES}-line order, {queries} queries')
+
+
+if __name__ == '__main__':
+    main()
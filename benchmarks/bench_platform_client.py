@@ -0,0 +1,64 @@
+"""
+Benchmark pushing order status updates to a delivery platform with and without connection pooling.
+
+Starts the stub platform API, then pushes status updates from several
+threads the way the delivery services used to (a bare requests.put, which
+opens a new connection per call) and through a pooled PlatformClient.
+Prints the wall time, updates per second and the connections the stub
+accepted. The stub speaks plain HTTP on localhost, so this only counts
+TCP setup; against a real platform each new connection also pays a TLS
+handshake and a network round trip or two.
+
+Usage:
+    python benchmarks/bench_platform_client.py [updates] [threads]    (default: 2000 8)
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from app.services.platform_client import PlatformClient
+from benchmarks.stub_platform import StubPlatform
+
+HEADERS = {'Content-Type': 'application/json', 'Authorization': 'Bearer bench'}
+
+
+def push(stub, updates, threads, send):
+    """Send updates status pushes from threads threads; return seconds taken and connections opened."""
+    stub.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        responses = list(pool.map(send, range(updates)))
+    elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    assert stub.requests == updates
+    return elapsed, stub.connections
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with StubPlatform() as stub:
+        def unpooled(i):
+            return requests.put(f'{stub.url}/orders/Z{i}/status', json={'status': 'preparing'},
+                                headers=HEADERS, timeout=10)
+
+        client = PlatformClient('Stub', stub.url, pool_size=threads)
+
+        def pooled(i):
+            return client.request('PUT', f'/orders/Z{i}/status', json={'status': 'preparing'}, headers=HEADERS)
+
+        print(f'{updates} status updates from {threads} threads')
+        for label, send in [('unpooled', unpooled), ('pooled', pooled)]:
+            elapsed, connections = push(stub, updates, threads, send)
+            print(f'{label:>9}: {elapsed:6.2f} s, {updates / elapsed:7.0f} updates/s, {connections} connections')
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark concurrent order writes and dashboard reads under each SQLite profile.
+
+For every profile in app.config.SQLITE_PROFILES, a fresh database is
+created and several writer threads place orders while reader threads run
+the admin dashboard queries. Throughput, latency percentiles and
+"database is locked" errors are reported per profile.
+
+Usage:
+    python benchmarks/bench_sqlite_profiles.py [seconds] [writers] [readers]
+    (defaults: 5 seconds, 4 writers, 4 readers)
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+from app.config import Config, SQLITE_PROFILES
+from app.models import Bill, Category, MenuItem, Order, OrderItem, OrderStatus, Table, User
+
+
+def percentile(values, pct):
+    """Return the given percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def setup(app):
+    """Create the schema plus the users, tables and menu items orders refer to."""
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', role='admin')
+        user.set_password('bench')
+        category = Category(name='Bench')
+        db.session.add_all([user, category])
+        db.session.flush()
+        db.session.add_all([Table(name=f'Table {i}') for i in range(1, 41)])
+        db.session.add_all([MenuItem(name=f'Item {i}', full_price=5.0 + i, category_id=category.id)
+                            for i in range(1, 51)])
+        db.session.commit()
+
+
+def writer(app, stop, latencies, errors):
+    """Place dine-in orders with three items and bill them, as fast as possible."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                order = Order(user_id=1, table_id=None, status=OrderStatus.ACTIVE)
+                db.session.add(order)
+                order.add_items([
+                    {'menu_item_id': i, 'quantity': 1, 'is_half': False, 'price': 5.0 + i, 'notes': ''}
+                    for i in (1, 2, 3)
+                ])
+                db.session.add(Bill(order_id=order.id, bill_number=Bill.generate_bill_number(),
+                                    subtotal=order.total_amount, tax_amount=0.0,
+                                    total_amount=order.total_amount, payment_status=True))
+                order.complete()
+                db.session.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            errors.append(str(e.orig))
+
+
+def reader(app, stop, latencies, errors):
+    """Run the admin dashboard queries in a loop."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with app.app_context():
+                today = datetime.utcnow().date()
+                start_of_day = datetime.combine(today, datetime.min.time())
+                end_of_day = datetime.combine(today, datetime.max.time())
+                db.session.query(db.func.sum(Bill.total_amount)).filter(
+                    Bill.created_at.between(start_of_day, end_of_day),
+                    Bill.payment_status == True
+                ).scalar()
+                Order.query.filter(Order.created_at.between(start_of_day, end_of_day)).count()
+                Order.query.filter(Order.status == OrderStatus.ACTIVE) \
+                    .order_by(Order.created_at.desc()).limit(10).all()
+                db.session.query(OrderItem.menu_item_id, db.func.sum(OrderItem.quantity)) \
+                    .group_by(OrderItem.menu_item_id).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            errors.append(str(e.orig))
+
+
+def run_profile(profile, seconds, writers, readers):
+    """Run the mixed workload against a fresh database using one profile."""
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SQLITE_PROFILE = profile
+
+    app = create_app(BenchConfig)
+    setup(app)
+
+    stop = threading.Event()
+    write_latencies, read_latencies, errors = [], [], []
+    threads = [threading.Thread(target=writer, args=(app, stop, write_latencies, errors)) for _ in range(writers)]
+    threads += [threading.Thread(target=reader, args=(app, stop, read_latencies, errors)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'writes/s': len(write_latencies) / seconds,
+        'write p50': statistics.median(write_latencies) if write_latencies else 0.0,
+        'write p99': percentile(write_latencies, 99),
+        'reads/s': len(read_latencies) / seconds,
+        'read p50': statistics.median(read_latencies) if read_latencies else 0.0,
+        'read p99': percentile(read_latencies, 99),
+        'locked errors': sum(1 for error in errors if 'locked' in error),
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    print(f'{seconds:.0f}s per profile, {writers} writer and {readers} reader threads; latencies in ms')
+    print(f"{'profile':<10}{'writes/s':>10}{'w p50':>9}{'w p99':>9}{'reads/s':>10}{'r p50':>9}{'r p99':>9}{'locked':>8}")
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile, seconds, writers, readers)
+        print(f"{profile:<10}{result['writes/s']:>10.1f}{result['write p50']:>9.1f}{result['write p99']:>9.1f}"
+              f"{result['reads/s']:>10.1f}{result['read p50']:>9.1f}{result['read p99']:>9.1f}"
+              f"{result['locked errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
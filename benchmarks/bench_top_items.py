@@ -0,0 +1,126 @@
+"""
+Benchmark the top-selling items query on raw order items versus the item_sales rollup.
+
+Seeds a throwaway SQLite database with years of completed orders, backfills
+the rollup, then prints the median latency of each approach for several
+date ranges.
+
+Usage:
+    python benchmarks/bench_top_items.py [orders]    (default: 1000000)
+"""
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.config import Config
+from app.models.menu import MenuItem
+from app.models.order import Order, OrderItem
+from app.models.sales import ItemSales
+
+YEARS = 3
+MENU_ITEMS = 120
+ITEMS_PER_ORDER = 3
+BATCH_SIZE = 50000
+RUNS = 5
+RANGES = [('last 7 days', 7), ('last 30 days', 30), ('last year', 365), ('all history', 365 * YEARS)]
+
+
+def seed(path, orders):
+    """Fill the database with completed orders spread over several years."""
+    conn = sqlite3.connect(path)
+    now = datetime.utcnow()
+    span = int(timedelta(days=365 * YEARS).total_seconds())
+
+    conn.execute("INSERT INTO users (id, username, email, password_hash, role, is_active) "
+                 "VALUES (1, 'bench', 'bench@example.com', 'x', 'admin', 1)")
+    conn.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench')")
+    conn.executemany("INSERT INTO menu_items (id, name, full_price, category_id, is_available) VALUES (?, ?, ?, 1, 1)",
+                     [(i, f'Item {i}', 5.0 + i) for i in range(1, MENU_ITEMS + 1)])
+
+    item_id = 0
+    for start in range(1, orders + 1, BATCH_SIZE):
+        order_rows, item_rows = [], []
+        for order_id in range(start, min(start + BATCH_SIZE, orders + 1)):
+            created_at = now - timedelta(seconds=random.randrange(span))
+            for _ in range(ITEMS_PER_ORDER):
+                item_id += 1
+                # Skewed popularity, so the top items are stable
+                menu_item_id = min(int(random.expovariate(1 / 20)) + 1, MENU_ITEMS)
+                item_rows.append((item_id, order_id, menu_item_id, random.randint(1, 3), 5.0 + menu_item_id, created_at))
+            order_rows.append((order_id, created_at))
+        conn.executemany("INSERT INTO orders (id, user_id, status, order_type, created_at) "
+                         "VALUES (?, 1, 'COMPLETED', 'DINE_IN', ?)", order_rows)
+        conn.executemany("INSERT INTO order_items (id, order_id, menu_item_id, quantity, is_half, price, created_at) "
+                         "VALUES (?, ?, ?, ?, 0, ?, ?)", item_rows)
+        conn.commit()
+    conn.close()
+
+
+def raw_top(start, end, limit=10):
+    """The popular-items query as admin.reports ran it before the rollup."""
+    return db.session.query(
+        MenuItem.name,
+        db.func.sum(OrderItem.quantity).label('total_quantity')
+    ).join(OrderItem, MenuItem.id == OrderItem.menu_item_id) \
+        .join(Order, OrderItem.order_id == Order.id) \
+        .filter(Order.created_at.between(datetime.combine(start, datetime.min.time()),
+                                         datetime.combine(end, datetime.max.time()))) \
+        .group_by(MenuItem.name) \
+        .order_by(db.func.sum(OrderItem.quantity).desc()) \
+        .limit(limit).all()
+
+
+def median_ms(fn):
+    """Return the median wall time of fn in milliseconds."""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+
+        print(f'Seeding {orders} orders over {YEARS} years into {path} ...')
+        started = time.perf_counter()
+        seed(path, orders)
+        print(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+        started = time.perf_counter()
+        ItemSales.rebuild()
+        db.session.commit()
+        rows = ItemSales.query.count()
+        print(f'Backfilled {rows} item_sales rows in {time.perf_counter() - started:.1f}s')
+
+        today = datetime.utcnow().date()
+        for label, days in RANGES:
+            start = today - timedelta(days=days - 1)
+            raw = raw_top(start, today)
+            rollup = ItemSales.top(start, today, limit=10)
+            assert [row.name for row in raw][:3] == [row.name for row in rollup][:3]
+            raw_ms = median_ms(lambda: raw_top(start, today))
+            rollup_ms = median_ms(lambda: ItemSales.top(start, today, limit=10))
+            print(f'{label:>14}:  raw {raw_ms:9.2f} ms   rollup {rollup_ms:7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+A local stand-in for the Zomato and Swiggy partner APIs.
+
+Answers order status updates and order detail requests the way the
+delivery services expect, over HTTP/1.1 keep-alive, and counts the
+connections it accepts so callers can check that connections are reused.
+Failures and latency can be injected to exercise retries and the circuit
+breaker.
+
+Usage from Python:
+    with StubPlatform() as stub:
+        app.config['SWIGGY_API_URL'] = stub.url
+        ...
+        stub.connections, stub.requests
+
+Usage from a shell, e.g. to point a development server at it:
+    python benchmarks/stub_platform.py [port]    (default: 8099)
+    ZOMATO_API_URL=http://127.0.0.1:8099 SWIGGY_API_URL=http://127.0.0.1:8099 flask run
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import sys
+import threading
+import time
+
+ORDER_PATH = re.compile(r'^/orders/([^/]+)(/status)?$')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep connections open between requests
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def do_GET(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def _handle(self):
+        stub = self.server.stub
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        match = ORDER_PATH.match(self.path)
+        status = stub.take_failure()
+
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        with stub.lock:
+            stub.requests += 1
+            if status is None and match and match.group(2):
+                stub.statuses.append((match.group(1), body.get('status')))
+
+        if status is not None:
+            self._reply(status, {'error': 'Injected failure'})
+        elif not match:
+            self._reply(404, {'error': 'Not found'})
+        elif match.group(2):
+            self._reply(200, {'id': match.group(1), 'status': body.get('status')})
+        else:
+            self._reply(200, {'id': match.group(1), 'status': 'accepted', 'items': []})
+
+    def _reply(self, status, data):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request = super().get_request()
+        with self.stub.lock:
+            self.stub.connections += 1
+        return request
+
+
+class StubPlatform:
+    """
+    The stub API served from a background thread on 127.0.0.1.
+
+    Args:
+        port (int): Port to listen on, 0 for any free port
+        latency (float): Seconds to wait before each response
+    """
+
+    def __init__(self, port=0, latency=0.0):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.statuses = []
+        self._failures = []
+        self.server = StubServer(('127.0.0.1', port), StubHandler)
+        self.server.stub = self
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self._thread = None
+
+    def fail(self, count, status=503):
+        """Answer the next count requests with an error status."""
+        with self.lock:
+            self._failures.extend([status] * count)
+
+    def take_failure(self):
+        with self.lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def reset(self):
+        """Zero the counters and drop pending failures."""
+        with self.lock:
+            self.connections = self.requests = 0
+            self.statuses = []
+            self._failures = []
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='stub-platform', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    stub = StubPlatform(int(sys.argv[1]) if len(sys.argv) > 1 else 8099)
+    print(f'Stub platform API listening on {stub.url}')
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -38,10 +38,12 @@ with app.app_context():
     # Create default settings if they don't exist
     if not Settings.get('tax_rate'):
         print("Creating default settings...")
-        Settings.set('tax_rate', '5')
-        Settings.set('restaurant_name', 'Restaurant Name')
-        Settings.set('restaurant_phone', '+1234567890')
-        Settings.set('restaurant_address', '123 Main St, City, Country')
+        Settings.set_many({
+            'tax_rate': '5',
+            'restaurant_name': 'Restaurant Name',
+            'restaurant_phone': '+1234567890',
+            'restaurant_address': '123 Main St, City, Country'
+        })
     
     # Create sample categories if none exist
     if Category.query.count() == 0:
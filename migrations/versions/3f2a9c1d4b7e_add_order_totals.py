@@ -0,0 +1,53 @@
+"""Add denormalized items_count and total_amount to orders
+
+Revision ID: 3f2a9c1d4b7e
+Revises: 7ca48f8058c1
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d4b7e'
+down_revision = '7ca48f8058c1'
+branch_labels = None
+depends_on = None
+
+# Number of orders backfilled per UPDATE statement
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('items_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_amount', sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill existing orders in id ranges so no single statement touches the whole table
+    conn = op.get_bind()
+    min_id, max_id = conn.execute(sa.text('SELECT MIN(id), MAX(id) FROM orders')).one()
+    if min_id is None:
+        return
+
+    backfill = sa.text("""
+        UPDATE orders SET
+            items_count = (
+                SELECT COUNT(*) FROM order_items
+                WHERE order_items.order_id = orders.id
+            ),
+            total_amount = (
+                SELECT COALESCE(SUM(order_items.price * order_items.quantity), 0)
+                FROM order_items
+                WHERE order_items.order_id = orders.id
+            )
+        WHERE orders.id >= :start AND orders.id < :end
+    """)
+    for start in range(min_id, max_id + 1, BATCH_SIZE):
+        conn.execute(backfill, {'start': start, 'end': start + BATCH_SIZE})
+
+
+def downgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_column('total_amount')
+        batch_op.drop_column('items_count')
@@ -0,0 +1,70 @@
+"""Add indexes for hot order, bill and delivery queries
+
+Revision ID: 8b41e6d2a5c3
+Revises: 3f2a9c1d4b7e
+Create Date: 2026-10-18 10:03:27.551390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import logging
+
+
+# revision identifiers, used by Alembic.
+revision = '8b41e6d2a5c3'
+down_revision = '3f2a9c1d4b7e'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.env')
+
+# Dialects that support partial (filtered) indexes
+PARTIAL_INDEX_DIALECTS = ('sqlite', 'postgresql')
+
+
+def upgrade():
+    op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'])
+    op.create_index('ix_orders_table_id_status', 'orders', ['table_id', 'status'])
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+    op.create_index('ix_order_items_menu_item_id', 'order_items', ['menu_item_id'])
+    op.create_index('ix_bills_created_at_payment_status', 'bills', ['created_at', 'payment_status'])
+    op.create_index('ix_delivery_orders_status_created_at', 'delivery_orders', ['status', 'created_at'])
+    op.create_index('ix_delivery_orders_status_updated_at', 'delivery_orders', ['status', 'updated_at'])
+
+    conn = op.get_bind()
+    if conn.dialect.name not in PARTIAL_INDEX_DIALECTS:
+        logger.info('Skipping uq_orders_active_table: %s has no partial indexes', conn.dialect.name)
+        return
+
+    duplicates = conn.execute(sa.text("""
+        SELECT table_id FROM orders
+        WHERE status = 'ACTIVE' AND table_id IS NOT NULL
+        GROUP BY table_id HAVING COUNT(*) > 1
+    """)).scalars().all()
+    if duplicates:
+        logger.warning(
+            'Skipping uq_orders_active_table: tables %s have more than one active order. '
+            'Complete or cancel the extra orders, then downgrade and upgrade this revision.',
+            ', '.join(str(table_id) for table_id in duplicates)
+        )
+        return
+
+    op.create_index(
+        'uq_orders_active_table', 'orders', ['table_id'], unique=True,
+        sqlite_where=sa.text("status = 'ACTIVE'"),
+        postgresql_where=sa.text("status = 'ACTIVE'")
+    )
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name in PARTIAL_INDEX_DIALECTS:
+        op.execute('DROP INDEX IF EXISTS uq_orders_active_table')
+
+    op.drop_index('ix_delivery_orders_status_updated_at', table_name='delivery_orders')
+    op.drop_index('ix_delivery_orders_status_created_at', table_name='delivery_orders')
+    op.drop_index('ix_bills_created_at_payment_status', table_name='bills')
+    op.drop_index('ix_order_items_menu_item_id', table_name='order_items')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_table_id_status', table_name='orders')
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
@@ -0,0 +1,54 @@
+"""Add (created_at, id) indexes for keyset pagination of history lists
+
+Cursors are built from created_at, so the paged tables get it backfilled
+and made non-nullable first.
+
+Revision ID: a8d5c0f3e621
+Revises: f7c3e2a95d18
+Create Date: 2026-10-18 20:12:44.907316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d5c0f3e621'
+down_revision = 'f7c3e2a95d18'
+branch_labels = None
+depends_on = None
+
+# Tables paged by (created_at, id)
+PAGED_TABLES = ('bills', 'delivery_orders', 'orders')
+
+
+def upgrade():
+    conn = op.get_bind()
+    # A bill is as old as its order; anything else without a time sorts with the oldest rows
+    conn.execute(sa.text("""
+        UPDATE bills SET created_at = (SELECT orders.created_at FROM orders WHERE orders.id = bills.order_id)
+        WHERE created_at IS NULL
+    """))
+    for table in PAGED_TABLES:
+        conn.execute(sa.text(f"""
+            UPDATE {table} SET created_at = COALESCE((SELECT MIN(created_at) FROM {table}), CURRENT_TIMESTAMP)
+            WHERE created_at IS NULL
+        """))
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_bills_created_at_id', 'bills', ['created_at', 'id'])
+    op.create_index('ix_delivery_orders_created_at_id', 'delivery_orders', ['created_at', 'id'])
+    # Extends (status, created_at), which still serves every query that used it
+    op.create_index('ix_orders_status_created_at_id', 'orders', ['status', 'created_at', 'id'])
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
+
+
+def downgrade():
+    op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'])
+    op.drop_index('ix_orders_status_created_at_id', table_name='orders')
+    op.drop_index('ix_delivery_orders_created_at_id', table_name='delivery_orders')
+    op.drop_index('ix_bills_created_at_id', table_name='bills')
+    for table in PAGED_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,26 @@
+"""Add cost_price to menu_items
+
+Revision ID: b3f1d7e9c245
+Revises: a8d5c0f3e621
+Create Date: 2026-10-18 20:31:05.118262
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1d7e9c245'
+down_revision = 'a8d5c0f3e621'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('menu_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cost_price', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('menu_items', schema=None) as batch_op:
+        batch_op.drop_column('cost_price')
@@ -0,0 +1,45 @@
+"""Add sequences table and bill number sequence
+
+Revision ID: c5d7e0a91f24
+Revises: 8b41e6d2a5c3
+Create Date: 2026-10-18 10:41:05.207733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d7e0a91f24'
+down_revision = '8b41e6d2a5c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sequences',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('next_value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    # Continue numbering after the highest existing bill
+    conn = op.get_bind()
+    last_number = conn.execute(sa.text(
+        'SELECT MAX(CAST(SUBSTR(bill_number, 5) AS INTEGER)) FROM bills'
+    )).scalar() or 0
+
+    if conn.dialect.name == 'postgresql':
+        op.execute(sa.schema.CreateSequence(sa.Sequence('bill_number_seq', start=last_number + 1)))
+    else:
+        op.execute(
+            sa.text("INSERT INTO sequences (name, next_value) VALUES ('bill_number', :next_value)")
+            .bindparams(next_value=last_number + 1)
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute(sa.schema.DropSequence(sa.Sequence('bill_number_seq')))
+    op.drop_table('sequences')
@@ -0,0 +1,46 @@
+"""Add webhook_events queue table
+
+Revision ID: c9e4a2b7f813
+Revises: b3f1d7e9c245
+Create Date: 2026-10-18 21:02:37.284915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e4a2b7f813'
+down_revision = 'b3f1d7e9c245'
+branch_labels = None
+depends_on = None
+
+DELIVERY_PLATFORMS = ('ZOMATO', 'SWIGGY')
+
+
+def upgrade():
+    op.create_table('webhook_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.Enum(*DELIVERY_PLATFORMS, name='deliveryplatform').with_variant(
+            # The type already exists for delivery_orders.platform
+            postgresql.ENUM(*DELIVERY_PLATFORMS, name='deliveryplatform', create_type=False), 'postgresql'
+        ), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'PROCESSED', 'FAILED', name='webhookstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('delivery_order_id', sa.Integer(), nullable=True),
+        sa.Column('received_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['delivery_order_id'], ['delivery_orders.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_webhook_events_status_updated_at', 'webhook_events', ['status', 'updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_webhook_events_status_updated_at', table_name='webhook_events')
+    op.drop_table('webhook_events')
+    sa.Enum(name='webhookstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,51 @@
+"""Add daily_sales rollup table
+
+Revision ID: d2e8b4f61a07
+Revises: c5d7e0a91f24
+Create Date: 2026-10-18 14:05:31.662019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8b4f61a07'
+down_revision = 'c5d7e0a91f24'
+branch_labels = None
+depends_on = None
+
+PAYMENT_METHODS = ('CASH', 'CREDIT_CARD', 'DEBIT_CARD', 'UPI', 'ONLINE')
+
+
+def upgrade():
+    op.create_table('daily_sales',
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('payment_method', sa.Enum(*PAYMENT_METHODS, name='paymentmethod').with_variant(
+            # The type already exists for bills.payment_method
+            postgresql.ENUM(*PAYMENT_METHODS, name='paymentmethod', create_type=False), 'postgresql'
+        ), nullable=False),
+        sa.Column('bills_count', sa.Integer(), nullable=False),
+        sa.Column('subtotal', sa.Float(), nullable=False),
+        sa.Column('tax_amount', sa.Float(), nullable=False),
+        sa.Column('discount', sa.Float(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('date', 'payment_method')
+    )
+
+    # Backfill from the bills paid so far
+    conn = op.get_bind()
+    day = 'DATE(created_at)' if conn.dialect.name == 'sqlite' else 'CAST(created_at AS DATE)'
+    op.execute(sa.text(f"""
+        INSERT INTO daily_sales (date, payment_method, bills_count, subtotal, tax_amount, discount, total_amount)
+        SELECT {day}, payment_method, COUNT(id), SUM(subtotal), SUM(tax_amount),
+               SUM(COALESCE(discount, 0)), SUM(total_amount)
+        FROM bills
+        WHERE payment_status = :paid AND payment_method IS NOT NULL
+        GROUP BY {day}, payment_method
+    """).bindparams(paid=True))
+
+
+def downgrade():
+    op.drop_table('daily_sales')
@@ -0,0 +1,39 @@
+"""Add delivery_item_mappings table
+
+Revision ID: d4f2a8c6e193
+Revises: c9e4a2b7f813
+Create Date: 2026-10-18 22:14:09.531662
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f2a8c6e193'
+down_revision = 'c9e4a2b7f813'
+branch_labels = None
+depends_on = None
+
+DELIVERY_PLATFORMS = ('ZOMATO', 'SWIGGY')
+
+
+def upgrade():
+    op.create_table('delivery_item_mappings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.Enum(*DELIVERY_PLATFORMS, name='deliveryplatform').with_variant(
+            # The type already exists for delivery_orders.platform
+            postgresql.ENUM(*DELIVERY_PLATFORMS, name='deliveryplatform', create_type=False), 'postgresql'
+        ), nullable=False),
+        sa.Column('item_name', sa.String(length=200), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('platform', 'item_name', name='uq_delivery_item_mappings_platform_item_name')
+    )
+
+
+def downgrade():
+    op.drop_table('delivery_item_mappings')
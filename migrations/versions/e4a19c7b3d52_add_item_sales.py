@@ -0,0 +1,45 @@
+"""Add item_sales rollup table
+
+Revision ID: e4a19c7b3d52
+Revises: d2e8b4f61a07
+Create Date: 2026-10-18 15:22:08.370945
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a19c7b3d52'
+down_revision = 'd2e8b4f61a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('item_sales',
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+        sa.PrimaryKeyConstraint('date', 'menu_item_id'),
+        sqlite_with_rowid=False
+    )
+
+    # Backfill from the orders completed so far
+    conn = op.get_bind()
+    day = 'DATE(orders.created_at)' if conn.dialect.name == 'sqlite' else 'CAST(orders.created_at AS DATE)'
+    op.execute(sa.text(f"""
+        INSERT INTO item_sales (date, menu_item_id, quantity, revenue)
+        SELECT {day}, order_items.menu_item_id, SUM(order_items.quantity),
+               SUM(order_items.price * order_items.quantity)
+        FROM order_items
+        JOIN orders ON orders.id = order_items.order_id
+        WHERE orders.status = 'COMPLETED'
+        GROUP BY {day}, order_items.menu_item_id
+    """))
+
+
+def downgrade():
+    op.drop_table('item_sales')
@@ -0,0 +1,54 @@
+"""Add status_outbox table
+
+Revision ID: e6a3f9b2c571
+Revises: d4f2a8c6e193
+Create Date: 2026-10-18 23:41:52.807316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a3f9b2c571'
+down_revision = 'd4f2a8c6e193'
+branch_labels = None
+depends_on = None
+
+DELIVERY_PLATFORMS = ('ZOMATO', 'SWIGGY')
+DELIVERY_STATUSES = ('PENDING', 'ACCEPTED', 'PREPARING', 'READY', 'PICKED_UP', 'DELIVERED', 'CANCELLED')
+
+
+def upgrade():
+    op.create_table('status_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('delivery_order_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.Enum(*DELIVERY_PLATFORMS, name='deliveryplatform').with_variant(
+            # The type already exists for delivery_orders.platform
+            postgresql.ENUM(*DELIVERY_PLATFORMS, name='deliveryplatform', create_type=False), 'postgresql'
+        ), nullable=False),
+        sa.Column('platform_order_id', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.Enum(*DELIVERY_STATUSES, name='deliverystatus').with_variant(
+            # The type already exists for delivery_orders.status
+            postgresql.ENUM(*DELIVERY_STATUSES, name='deliverystatus', create_type=False), 'postgresql'
+        ), nullable=False),
+        sa.Column('state', sa.Enum('PENDING', 'SENDING', 'SENT', 'SUPERSEDED', 'FAILED', name='outboxstate'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['delivery_order_id'], ['delivery_orders.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_status_outbox_state_next_attempt_at', 'status_outbox', ['state', 'next_attempt_at'])
+    op.create_index('ix_status_outbox_delivery_order_id_id', 'status_outbox', ['delivery_order_id', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_status_outbox_delivery_order_id_id', table_name='status_outbox')
+    op.drop_index('ix_status_outbox_state_next_attempt_at', table_name='status_outbox')
+    op.drop_table('status_outbox')
+    sa.Enum(name='outboxstate').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,44 @@
+"""Add jobs table for background exports
+
+Revision ID: f7c3e2a95d18
+Revises: e4a19c7b3d52
+Create Date: 2026-10-18 16:40:12.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c3e2a95d18'
+down_revision = 'e4a19c7b3d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='jobstatus'), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('result_path', sa.String(length=255), nullable=True),
+        sa.Column('result_name', sa.String(length=255), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_user_id_created_at', 'jobs', ['user_id', 'created_at'])
+    op.create_index('ix_jobs_status_updated_at', 'jobs', ['status', 'updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_updated_at', table_name='jobs')
+    op.drop_index('ix_jobs_user_id_created_at', table_name='jobs')
+    op.drop_table('jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.user import User
+
+
+class InMemoryConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLITE_PROFILE = 'default'
+    RATELIMIT_ENABLED = False
+
+
+@pytest.fixture
+def app():
+    app = create_app(InMemoryConfig)
+    with app.app_context():
+        # Every table lives on the primary database; a 'reports' bind left
+        # registered by an app on a database file has no tables of its own
+        db.create_all(bind_key=None)
+        admin = User(username='admin', email='admin@example.com', role='admin')
+        admin.set_password('admin123')
+        db.session.add(admin)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def client(app):
+    """A test client logged in as the admin."""
+    client = app.test_client()
+    response = client.post('/auth/login', data={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """Call count_queries(fn) to run fn and return the number of SQL statements it executed."""
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def count(fn):
+        statements.clear()
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return len(statements)
+
+    return count
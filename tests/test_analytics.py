@@ -0,0 +1,46 @@
+from datetime import date
+
+import numpy as np
+
+from app import db
+from app.models.menu import Category
+from app.services.analytics import OrderHistory
+
+
+def history(item_menu_ids):
+    """Two orders of two items each, against a menu of items 10 and 20."""
+    orders = {'id': np.array([2, 1]), 'hour': np.array([19, 12], dtype=np.int8),
+              'weekday': np.array([5, 1], dtype=np.int8)}
+    items = {
+        'order_id': np.array([1, 1, 2, 2]),
+        'menu_item_id': np.array(item_menu_ids),
+        'quantity': np.array([2, 1, 1, 1], dtype=np.int32),
+        'price': np.array([100.0, 50.0, 30.0, 80.0]),
+        'is_half': np.array([False, False, False, False]),
+    }
+    menu = {'id': np.array([10, 20]), 'category_id': np.array([1, 2]), 'cost_price': np.array([40.0, np.nan])}
+    bills = {name: np.empty(0) for name in ('subtotal', 'discount', 'tax_amount', 'total_amount')}
+    return OrderHistory(date(2026, 10, 1), date(2026, 10, 7), orders, items, menu, bills)
+
+
+def test_categories_split_revenue_and_margin(app):
+    db.session.add_all([Category(id=1, name='Mains'), Category(id=2, name='Desserts')])
+    db.session.commit()
+
+    rows = history([10, 10, 20, 20]).categories()
+
+    assert [(row['name'], row['revenue'], row['quantity'], row['margin'], row['margin_rate']) for row in rows] == [
+        ('Mains', 250.0, 3, 130.0, 0.52),
+        ('Desserts', 110.0, 2, 0.0, None),
+    ]
+
+
+def test_items_of_deleted_menu_items_are_left_out_of_categories(app):
+    # 15 sorts between the menu ids and 99 after them
+    item_history = history([10, 15, 99, 20])
+
+    rows = item_history.categories()
+
+    assert [(row['category_id'], row['revenue'], row['quantity']) for row in rows] == [(1, 200.0, 2), (2, 80.0, 1)]
+    assert item_history.basket()['revenue'] == 360.0
+    assert item_history.hourly()['revenue'][12] == 250.0
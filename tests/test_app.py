@@ -0,0 +1,12 @@
+import pytest
+
+from app import create_app
+from tests.conftest import InMemoryConfig
+
+
+def test_unknown_sqlite_profile_is_rejected():
+    class BadProfileConfig(InMemoryConfig):
+        SQLITE_PROFILE = 'fast'
+
+    with pytest.raises(ValueError, match="Unknown SQLITE_PROFILE 'fast', expected one of: default, wal, durable"):
+        create_app(BadProfileConfig)
@@ -0,0 +1,88 @@
+from app.models.delivery import DeliveryPlatform
+from app.utils.delivery_data import get_adapter
+
+ZOMATO_ORDER = {
+    'order_id': 'Z100',
+    'customer': {'name': 'Asha', 'phone': '9000000001'},
+    'delivery_address': '12 MG Road',
+    'items': [{'name': 'Paneer Tikka', 'quantity': 2, 'price': 250, 'addons': [{'name': 'Extra cheese'}]}],
+    'delivery_fee': 30,
+    'total_amount': 530,
+}
+
+SWIGGY_ORDER = {
+    'order_id': 'S200',
+    'customer_details': {'name': 'Ravi', 'phone': '9000000002'},
+    'delivery_address': {'address': '4 Park Street'},
+    'order_items': [{'item_name': 'Dal Makhani', 'item_price': 180, 'variations': [{'name': 'Half'}]}],
+    'charges': {'delivery_fee': 25, 'platform_fee': 5},
+    'order_total': 210,
+}
+
+
+def test_standardizes_zomato_order():
+    adapter = get_adapter('zomato')
+
+    data = adapter.standardize(ZOMATO_ORDER)
+
+    assert data == {
+        'order_id': 'Z100',
+        'customer': {'name': 'Asha', 'phone': '9000000001'},
+        'address': '12 MG Road',
+        'items': ZOMATO_ORDER['items'],
+        'fees': {'delivery_fee': 30, 'platform_fee': 0, 'total': 530},
+    }
+    assert adapter.extract_items(data['items']) == [{
+        'name': 'Paneer Tikka', 'quantity': 2, 'price': 250, 'notes': '', 'variations': ['Extra cheese'],
+    }]
+
+
+def test_standardizes_swiggy_order():
+    adapter = get_adapter(DeliveryPlatform.SWIGGY)
+
+    data = adapter.standardize(SWIGGY_ORDER)
+
+    assert data['customer'] == {'name': 'Ravi', 'phone': '9000000002'}
+    assert data['address'] == '4 Park Street'
+    assert data['fees'] == {'delivery_fee': 25, 'platform_fee': 5, 'total': 210}
+    assert adapter.extract_items(data['items']) == [{
+        'name': 'Dal Makhani', 'quantity': 1, 'price': 180, 'notes': '', 'variations': ['Half'],
+    }]
+
+
+def test_get_adapter_ignores_case():
+    assert get_adapter('SWIGGY') is get_adapter(DeliveryPlatform.SWIGGY)
+    assert get_adapter('ubereats') is None
+
+
+def test_missing_list_default_is_not_shared():
+    adapter = get_adapter('zomato')
+
+    first = adapter.standardize({'order_id': 'Z1'})
+    first['items'].append('x')
+
+    assert adapter.standardize({'order_id': 'Z2'})['items'] == []
+
+
+def test_null_nested_object_falls_back_to_defaults():
+    adapter = get_adapter('swiggy')
+
+    data = adapter.standardize(dict(SWIGGY_ORDER, customer_details=None, charges=None))
+
+    assert data['customer'] == {'name': None, 'phone': None}
+    assert data['fees'] == {'delivery_fee': 0, 'platform_fee': 0, 'total': 210}
+
+
+def test_malformed_order_payload_is_rejected():
+    adapter = get_adapter('zomato')
+
+    assert adapter.standardize(42) == {}
+    assert adapter.standardize(dict(ZOMATO_ORDER, customer='Asha')) == {}
+
+
+def test_malformed_items_are_rejected():
+    adapter = get_adapter('swiggy')
+
+    assert adapter.extract_items([42]) == []
+    assert adapter.extract_items([{'item_name': 'Dal', 'addons': [None]}]) == []
+    assert adapter.extract_items({'item_name': 'Dal'}) == []
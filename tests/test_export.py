@@ -0,0 +1,139 @@
+import csv
+import io
+import zipfile
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+
+import pytest
+
+from app.models.bill import Bill
+from app.models.order import Order
+from app.utils.export import CHUNK_ROWS, XLSX_MIMETYPE, iter_csv
+from tests.test_orders import add_active_orders, add_menu
+
+
+def bill_orders(client):
+    """Bill every active order without a discount."""
+    for order in Order.query.order_by(Order.id).all():
+        response = client.post(f'/billing/generate/{order.id}', data={'discount': '0'})
+        assert response.status_code == 302
+
+
+def test_iter_csv_yields_header_before_reading_rows():
+    read = []
+
+    def rows():
+        for i in range(CHUNK_ROWS + 1):
+            read.append(i)
+            yield [i, f'row {i}']
+
+    chunks = iter_csv(['#', 'Name'], rows())
+
+    assert next(chunks) == '#,Name\r\n'
+    assert read == []
+    body = ''.join(chunks)
+    assert len(read) == CHUNK_ROWS + 1
+    assert body.count('\r\n') == CHUNK_ROWS + 1
+
+
+def test_bills_csv_export_lists_every_bill(app, client):
+    add_active_orders(3, add_menu())
+    bill_orders(client)
+
+    response = client.get('/billing/export/csv')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'] == 'attachment; filename=bills_report.csv'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == ['Bill #', 'Date', 'Customer', 'Subtotal', 'Tax', 'Discount', 'Total',
+                       'Payment Status', 'Payment Method']
+    assert len(rows) == 4
+    assert {row[3] for row in rows[1:]} == {'66.0'}
+    assert {row[7] for row in rows[1:]} == {'Unpaid'}
+
+
+def xlsx_rows(data):
+    """Read the cell values of the first worksheet of an XLSX file, as text, with '' for blank cells."""
+    ns = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+    with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+        shared = [''.join(item.itertext()) for item in
+                  ElementTree.fromstring(workbook.read('xl/sharedStrings.xml')).iterfind('x:si', ns)] \
+            if 'xl/sharedStrings.xml' in workbook.namelist() else []
+        sheet = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+    rows = []
+    for row in sheet.iterfind('.//x:row', ns):
+        values = {}
+        for cell in row.iterfind('x:c', ns):
+            # xlsxwriter leaves empty strings out, so place cells by their reference
+            column = ord(cell.get('r').rstrip('0123456789')) - ord('A')
+            if cell.get('t') == 's':
+                values[column] = shared[int(cell.find('x:v', ns).text)]
+            elif cell.get('t') == 'inlineStr':
+                values[column] = ''.join(cell.find('x:is', ns).itertext())
+            else:
+                values[column] = cell.find('x:v', ns).text
+        rows.append(values)
+    width = len(rows[0])
+    return [[values.get(column, '') for column in range(width)] for values in rows]
+
+
+class TableParser(HTMLParser):
+    """Collect the header and body cells of the report page tables of an HTML export."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows, self.in_page, self.cell = [], False, None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.in_page = ('class', 'page') in attrs
+        elif self.in_page and tag == 'tr':
+            self.rows.append([])
+        elif self.in_page and tag in ('th', 'td'):
+            self.cell = []
+
+    def handle_endtag(self, tag):
+        if tag == 'table':
+            self.in_page = False
+        elif self.cell is not None and tag in ('th', 'td'):
+            self.rows[-1].append(''.join(self.cell).strip())
+            self.cell = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def html_rows(html):
+    parser = TableParser()
+    parser.feed(html)
+    return parser.rows
+
+
+def normalize(rows, money_columns):
+    """Render amounts the same way whichever format they came from."""
+    return [
+        [f"{float(value.lstrip('₹')):.2f}" if i in money_columns and n else value for i, value in enumerate(row)]
+        for n, row in enumerate(rows)
+    ]
+
+
+@pytest.mark.parametrize('url', ['/billing/export/{format}', '/admin/export-report/{format}'])
+def test_csv_and_excel_exports_match_the_html_report(app, client, url):
+    # Subtotal, tax, discount and total in both the bills and the sales report
+    money_columns = (3, 4, 5, 6)
+    add_active_orders(3, add_menu())
+    bill_orders(client)
+    for bill in Bill.query.order_by(Bill.id).limit(2):
+        client.post(f'/billing/pay/{bill.id}', data={'payment_method': 'cash'})
+
+    # Read each streamed body before the next request
+    csv_rows = list(csv.reader(io.StringIO(client.get(url.format(format='csv')).get_data(as_text=True))))
+    excel_response = client.get(url.format(format='excel'))
+    assert excel_response.headers['Content-Type'] == XLSX_MIMETYPE
+    excel_rows = xlsx_rows(excel_response.get_data())
+    html = html_rows(client.get(url.format(format='pdf')).get_data(as_text=True))
+
+    assert len(html) > 1
+    assert normalize(csv_rows, money_columns) == normalize(html, money_columns)
+    assert normalize(excel_rows, money_columns) == normalize(html, money_columns)
@@ -0,0 +1,168 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.job import Job, JobStatus
+from app.services import reports
+from app.services.jobs import job_runner
+from app.services.reports import export_params, run_export
+from tests.test_export import bill_orders
+from tests.test_orders import add_active_orders, add_menu
+
+
+@pytest.fixture
+def events(app, tmp_path, monkeypatch):
+    """Run jobs into a temporary directory and return the (status, progress) events they emit."""
+    events = []
+    monkeypatch.setattr(job_runner, 'result_dir', str(tmp_path))
+    monkeypatch.setattr(job_runner, '_emit', lambda job_id, status, progress, **data: events.append((status, progress)))
+    return events
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Call handler(fn) to register fn as the handler of 'test' jobs."""
+    return lambda fn: monkeypatch.setitem(job_runner._handlers, 'test', fn)
+
+
+def add_job(kind='test', params=None, age=timedelta(0), **values):
+    at = datetime.utcnow() - age
+    job = Job(kind=kind, params=json.dumps(params or {}), created_at=at, updated_at=at, **values)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def reload(job):
+    db.session.expire_all()
+    return db.session.get(Job, job.id)
+
+
+def test_export_job_writes_the_report(events, client):
+    add_active_orders(2, add_menu())
+    bill_orders(client)
+    job = add_job('export', export_params('bills', 'csv', None, None))
+
+    job_runner._run(job.id)
+
+    job = reload(job)
+    assert (job.status, job.progress, job.result_name) == (JobStatus.COMPLETED, 100, 'bills_report.csv')
+    with open(job.result_path, encoding='utf-8') as result:
+        assert result.read().count('\n') == 3
+    assert events[0] == (JobStatus.RUNNING, 0)
+    assert events[-1] == (JobStatus.COMPLETED, 100)
+
+
+def test_progress_only_moves_forward_and_stops_short_of_done(events, handler):
+    def work(job_id, params, progress, result_dir):
+        for percent in (30, 20, 30, 150):
+            progress(percent)
+        assert reload(job).progress == 99
+        return 'result.txt', 'result.txt'
+
+    handler(work)
+    job = add_job()
+
+    job_runner._run(job.id)
+
+    assert events == [(JobStatus.RUNNING, 0), (JobStatus.RUNNING, 30), (JobStatus.RUNNING, 99),
+                      (JobStatus.COMPLETED, 100)]
+
+
+def test_job_is_claimed_only_once(events, handler):
+    runs = []
+    handler(lambda job_id, *args: runs.append(job_id) or ('result.txt', 'result.txt'))
+    job = add_job()
+
+    job_runner._run(job.id)
+    job_runner._run(job.id)
+
+    assert runs == [job.id]
+    assert reload(job).status == JobStatus.COMPLETED
+
+
+def test_failed_job_records_the_error(events, handler):
+    def work(job_id, params, progress, result_dir):
+        progress(40)
+        raise ValueError('Report is empty')
+
+    handler(work)
+    job = add_job()
+
+    job_runner._run(job.id)
+
+    job = reload(job)
+    assert (job.status, job.error, job.progress) == (JobStatus.FAILED, 'Report is empty', 40)
+    assert job.finished_at is not None
+    assert events[-1] == (JobStatus.FAILED, 40)
+
+
+def test_failed_export_leaves_no_file(app, tmp_path, monkeypatch):
+    report = reports.bills_report()
+
+    def chunks(*args, **kwargs):
+        yield 'Bill #\r\n'
+        raise RuntimeError('Database went away')
+
+    monkeypatch.setattr(report, 'chunks', chunks)
+    monkeypatch.setitem(reports.REPORTS, 'bills', lambda start_date, end_date: report)
+
+    with pytest.raises(RuntimeError, match='Database went away'):
+        run_export(1, export_params('bills', 'csv', None, None), lambda percent: None, str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+
+def test_export_that_cannot_create_its_file_raises_the_real_error(app, tmp_path, monkeypatch):
+    def no_space(path, mode):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(reports, 'open', no_space, raising=False)
+
+    with pytest.raises(OSError, match='No space left'):
+        run_export(1, export_params('bills', 'csv', None, None), lambda percent: None, str(tmp_path))
+
+
+def test_sweep_fails_stale_jobs_and_requeues_forgotten_ones(app, monkeypatch):
+    queued = []
+
+    class Pool:
+        def submit(self, fn, job_id):
+            queued.append(job_id)
+
+    monkeypatch.setattr(job_runner, '_pool', Pool)
+    stale = job_runner.stale_after + timedelta(minutes=1)
+    interrupted = add_job(status=JobStatus.RUNNING, age=stale)
+    running = add_job(status=JobStatus.RUNNING)
+    forgotten = add_job(age=stale)
+    waiting = add_job()
+
+    job_runner._sweep()
+    db.session.commit()
+
+    assert reload(interrupted).status == JobStatus.FAILED
+    assert reload(interrupted).error == 'Interrupted before it finished'
+    assert reload(running).status == JobStatus.RUNNING
+    assert queued == [forgotten.id]
+    assert reload(waiting).status == JobStatus.PENDING
+
+
+def test_sweep_deletes_expired_results(app, tmp_path):
+    expired_path = tmp_path / 'expired.csv'
+    recent_path = tmp_path / 'recent.csv'
+    expired_path.write_text('old')
+    recent_path.write_text('new')
+    now = datetime.utcnow()
+    expired = add_job(status=JobStatus.COMPLETED, result_path=str(expired_path),
+                      finished_at=now - job_runner.retention - timedelta(hours=1))
+    recent = add_job(status=JobStatus.COMPLETED, result_path=str(recent_path), finished_at=now)
+
+    job_runner._sweep()
+    db.session.commit()
+
+    assert reload(expired) is None
+    assert not expired_path.exists()
+    assert reload(recent) is not None
+    assert recent_path.exists()
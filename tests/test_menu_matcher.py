@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from app import db
+from app.models.delivery import DeliveryItemMapping, DeliveryOrder, DeliveryPlatform
+from app.models.menu import Category, MenuItem
+from app.models.order import Order
+from app.services.menu_matcher import EXACT, MAPPED, TOKEN, TRIGRAM, MenuEntry, MenuIndex, menu_matcher
+
+ZOMATO = DeliveryPlatform.ZOMATO
+
+MENU = [
+    MenuEntry(1, 'Paneer Tikka', 250.0, True),
+    MenuEntry(2, 'Paneer Tikka Masala', 300.0, True),
+    MenuEntry(3, 'Dal Makhani', 180.0, True),
+]
+
+
+def test_exact_name_wins_over_mapping():
+    index = MenuIndex(MENU, [(ZOMATO, 'paneer tikka', 3)])
+
+    assert index.match(ZOMATO, 'Paneer Tikka!') == (MENU[0], EXACT)
+
+
+def test_mapping_wins_over_fuzzy_match():
+    index = MenuIndex(MENU, [(ZOMATO, 'paneer tika 3', 2)])
+
+    assert index.match(ZOMATO, 'Paneer Tika 3') == (MENU[1], MAPPED)
+    assert index.match(DeliveryPlatform.SWIGGY, 'Paneer Tika 3') == (MENU[0], TRIGRAM)
+
+
+def test_fuzzy_matches_fall_back_from_words_to_trigrams():
+    index = MenuIndex(MENU, [])
+
+    assert index.match(ZOMATO, 'Tikka Masala Paneer') == (MENU[1], TOKEN)
+    assert index.match(ZOMATO, 'Dal Makhni') == (MENU[2], TRIGRAM)
+    assert index.match(ZOMATO, 'Garlic Naan') == (None, None)
+
+
+@pytest.fixture
+def delivery_order(app):
+    menu_matcher.invalidate()
+    category = Category(name='Mains')
+    db.session.add_all([MenuItem(name=entry.name, full_price=entry.full_price, category=category) for entry in MENU])
+    delivery_order = DeliveryOrder(platform=ZOMATO, platform_order_id='Z1', customer_name='Asha',
+                                   customer_phone='9000000001', customer_address='12 MG Road',
+                                   items_data=json.dumps([{'name': 'Paneer Tika 3', 'quantity': 1, 'price': 250}]))
+    db.session.add(delivery_order)
+    db.session.commit()
+    yield delivery_order
+    menu_matcher.invalidate()
+
+
+def map_item(client, delivery_order, menu_item_id):
+    return client.post(f'/delivery/order/{delivery_order.id}/map-item',
+                       data={'item_name': 'Paneer Tika 3', 'menu_item_id': menu_item_id})
+
+
+def test_accepting_order_does_not_learn_fuzzy_matches(client, delivery_order):
+    response = client.post(f'/delivery/order/{delivery_order.id}/accept')
+
+    assert response.status_code == 302
+    order = db.session.get(Order, delivery_order.order_id)
+    assert [item.menu_item_id for item in order.items] == [1]
+    assert DeliveryItemMapping.query.count() == 0
+
+
+def test_staff_confirm_correct_and_delete_mappings(client, delivery_order):
+    assert b'Guessed' in client.get(f'/delivery/order/{delivery_order.id}').data
+
+    map_item(client, delivery_order, 1)
+    assert [(m.item_name, m.menu_item_id) for m in DeliveryItemMapping.query] == [('paneer tika 3', 1)]
+    assert menu_matcher.index().match(ZOMATO, 'Paneer Tika 3')[1] == MAPPED
+
+    map_item(client, delivery_order, 2)
+    mapping = DeliveryItemMapping.query.one()
+    assert mapping.menu_item_id == 2
+    assert menu_matcher.index().match(ZOMATO, 'Paneer Tika 3')[0].id == 2
+
+    assert b'paneer tika 3' in client.get('/delivery/item-mappings').data
+    client.post(f'/delivery/item-mappings/{mapping.id}/delete')
+    assert DeliveryItemMapping.query.count() == 0
+    assert menu_matcher.index().match(ZOMATO, 'Paneer Tika 3') == (menu_matcher.index().items[1], TRIGRAM)
+
+
+def test_mapping_requires_a_menu_item(client, delivery_order):
+    response = map_item(client, delivery_order, '')
+
+    assert response.status_code == 302
+    assert DeliveryItemMapping.query.count() == 0
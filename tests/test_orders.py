@@ -0,0 +1,82 @@
+from app import db
+from app.models.menu import Category, MenuItem
+from app.models.order import Order, OrderItem, OrderStatus, OrderType
+from app.models.table import Table
+
+
+def add_menu(count=3):
+    """Add a category with count menu items and return the items."""
+    category = Category(name='Mains')
+    menu_items = [MenuItem(name=f'Dish {i}', full_price=10.0 + i, category=category) for i in range(count)]
+    db.session.add_all([category, *menu_items])
+    db.session.commit()
+    return menu_items
+
+
+def add_active_orders(count, menu_items):
+    """Open an active order with one line per menu item on each of count new tables."""
+    for i in range(count):
+        table = Table(name=f'T{Table.query.count() + 1}', is_occupied=True)
+        order = Order(table=table, user_id=1, status=OrderStatus.ACTIVE, order_type=OrderType.DINE_IN)
+        db.session.add(order)
+        order.add_items([
+            {'menu_item_id': menu_item.id, 'quantity': 2, 'is_half': False, 'price': menu_item.full_price, 'notes': ''}
+            for menu_item in menu_items
+        ])
+    db.session.commit()
+
+
+def test_active_orders_api_lists_items(app, client):
+    add_active_orders(2, add_menu())
+
+    orders = client.get('/orders/api/active').get_json()['orders']
+
+    assert len(orders) == 2
+    assert [len(order['items']) for order in orders] == [3, 3]
+    assert orders[0]['items'][0]['name'] == 'Dish 0'
+    assert orders[0]['total_amount'] == sum(item['subtotal'] for item in orders[0]['items'])
+
+
+def test_active_orders_api_query_count_does_not_grow_with_orders(app, client, count_queries):
+    menu_items = add_menu()
+    add_active_orders(1, menu_items)
+    one_order = count_queries(lambda: client.get('/orders/api/active'))
+
+    add_active_orders(9, menu_items)
+    ten_orders = count_queries(lambda: client.get('/orders/api/active'))
+
+    assert len(client.get('/orders/api/active').get_json()['orders']) == 10
+    assert ten_orders == one_order
+
+
+def test_order_totals_follow_added_and_removed_items(app):
+    menu_items = add_menu()
+    add_active_orders(1, menu_items)
+    order = Order.query.one()
+    assert (order.items_count, order.total_amount) == (3, 66.0)
+
+    order.add_item(OrderItem(menu_item_id=menu_items[0].id, quantity=3, price=10.0))
+    db.session.commit()
+    assert (order.items_count, order.total_amount) == (4, 96.0)
+
+    order.remove_item(order.items.filter_by(quantity=3).one())
+    order.remove_item(order.items.filter_by(menu_item_id=menu_items[2].id).one())
+    db.session.commit()
+    assert (order.items_count, order.total_amount) == (2, 42.0)
+
+
+def test_order_totals_keep_concurrent_changes(app):
+    menu_items = add_menu()
+    add_active_orders(1, menu_items)
+    order = Order.query.one()
+    assert order.items_count == 3
+
+    # Another worker adds two items after this order was loaded
+    db.session.execute(
+        db.update(Order).values(items_count=Order.items_count + 2, total_amount=Order.total_amount + 20.0)
+        .execution_options(synchronize_session=False)
+    )
+    order.add_items([{'menu_item_id': menu_items[0].id, 'quantity': 1, 'is_half': False, 'price': 10.0, 'notes': ''}])
+    db.session.commit()
+
+    assert (order.items_count, order.total_amount) == (6, 96.0)
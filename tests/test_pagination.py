@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models.bill import Bill
+from app.utils.pagination import decode_cursor, encode_cursor
+from tests.test_export import bill_orders
+from tests.test_orders import add_active_orders, add_menu
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2026, 10, 18, 20, 15, 30, 123456)
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', 'bm8tc2VwYXJhdG9y', encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor)
+
+
+def test_bills_api_pages_through_every_bill_once(app, client):
+    add_active_orders(5, add_menu(1))
+    bill_orders(client)
+    # Bills made in the same instant are told apart by id
+    db.session.execute(db.update(Bill).where(Bill.id.in_([2, 3, 4])).values(created_at=datetime(2026, 10, 18, 12)))
+    db.session.execute(db.update(Bill).where(Bill.id.in_([1, 5])).values(created_at=datetime(2026, 10, 17, 12)))
+    db.session.commit()
+
+    pages, cursor = [], None
+    while True:
+        response = client.get('/billing/api/bills', query_string={'per_page': 2, 'cursor': cursor or ''})
+        assert response.status_code == 200
+        pages.append([bill['id'] for bill in response.get_json()['bills']])
+        cursor = response.get_json()['next_cursor']
+        if cursor is None:
+            break
+
+    assert pages == [[4, 3], [2, 5], [1]]
+
+
+def test_bills_api_rejects_malformed_cursor(app, client):
+    response = client.get('/billing/api/bills', query_string={'cursor': 'not a cursor'})
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
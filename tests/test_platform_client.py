@@ -0,0 +1,99 @@
+import time
+
+import pytest
+import requests
+
+from app.services.platform_client import CircuitBreaker, CircuitOpenError, PlatformClient
+from benchmarks.stub_platform import StubPlatform
+
+
+@pytest.fixture
+def stub():
+    with StubPlatform() as stub:
+        yield stub
+
+
+def make_client(stub, retries=3, threshold=5, reset_timeout=30):
+    return PlatformClient('Stub', stub.url, pool_size=2, timeout=5, retries=retries, backoff=0,
+                          circuit=CircuitBreaker(threshold, reset_timeout))
+
+
+def push(client, order_id='Z1'):
+    return client.request('PUT', f'/orders/{order_id}/status', json={'status': 'ready'})
+
+
+def test_calls_reuse_one_pooled_connection(stub):
+    client = make_client(stub)
+
+    for i in range(20):
+        assert push(client, f'Z{i}').status_code == 200
+
+    assert stub.requests == 20
+    assert stub.connections == 1
+
+
+def test_retries_503_until_success(stub):
+    client = make_client(stub)
+    stub.fail(2)
+
+    response = push(client)
+
+    assert response.status_code == 200
+    assert stub.requests == 3
+    assert client.circuit.state == 'closed'
+
+
+def test_circuit_opens_after_threshold_failures(stub):
+    client = make_client(stub, retries=0, threshold=2)
+    stub.fail(10)
+
+    assert push(client).status_code == 503
+    assert push(client).status_code == 503
+    assert client.circuit.state == 'open'
+
+    with pytest.raises(CircuitOpenError):
+        push(client)
+    assert stub.requests == 2
+
+
+def test_half_open_trial_success_closes_circuit(stub):
+    client = make_client(stub, retries=0, threshold=1, reset_timeout=0.1)
+    stub.fail(1)
+    assert push(client).status_code == 503
+    assert client.circuit.state == 'open'
+
+    time.sleep(0.15)
+    assert client.circuit.state == 'half-open'
+    assert push(client).status_code == 200
+    assert client.circuit.state == 'closed'
+
+
+def test_half_open_trial_failure_reopens_circuit(stub):
+    client = make_client(stub, retries=0, threshold=1, reset_timeout=0.1)
+    stub.fail(1)
+    push(client)
+    time.sleep(0.15)
+
+    stub.fail(1)
+    assert push(client).status_code == 503
+    assert client.circuit.state == 'open'
+
+
+def test_unexpected_error_in_half_open_trial_does_not_wedge_circuit(stub, monkeypatch):
+    client = make_client(stub, retries=0, threshold=1, reset_timeout=0.1)
+    stub.fail(1)
+    push(client)
+    time.sleep(0.15)
+
+    def broken(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError('Connection broken')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(client.session, 'request', broken)
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            push(client)
+    assert client.circuit.state == 'open'
+
+    time.sleep(0.15)
+    assert push(client).status_code == 200
+    assert client.circuit.state == 'closed'
@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+from app import db
+from app.models.bill import Bill, PaymentMethod
+from app.models.order import Order, OrderItem
+from app.models.sales import DailySales, ItemSales
+from tests.test_export import bill_orders
+from tests.test_orders import add_active_orders, add_menu
+
+
+def pay(client, bill, payment_method):
+    response = client.post(f'/billing/pay/{bill.id}', data={'payment_method': payment_method})
+    assert response.status_code == 302
+
+
+def rollup(model, *columns):
+    db.session.expire_all()
+    return sorted((tuple(getattr(row, column) for column in columns) for row in model.query), key=str)
+
+
+def rebuild(app):
+    result = app.test_cli_runner().invoke(args=['rollups', 'rebuild'])
+    assert result.exit_code == 0, result.output
+
+
+def test_paying_bills_adds_them_to_daily_sales(app, client):
+    add_active_orders(3, add_menu(1))
+    bill_orders(client)
+    cash, card, unpaid = Bill.query.order_by(Bill.id).all()
+
+    pay(client, cash, 'cash')
+    pay(client, card, 'upi')
+    pay(client, card, 'cash')
+
+    today = cash.created_at.date()
+    assert rollup(DailySales, 'date', 'payment_method', 'bills_count', 'total_amount') == [
+        (today, PaymentMethod.CASH, 1, cash.total_amount),
+        (today, PaymentMethod.UPI, 1, card.total_amount),
+    ]
+    assert DailySales.total_between(today, today) == cash.total_amount + card.total_amount
+    assert DailySales.total_between(today + timedelta(days=1), today + timedelta(days=7)) == 0
+
+
+def test_rebuilt_daily_sales_match_incremental_totals(app, client):
+    add_active_orders(3, add_menu(2))
+    bill_orders(client)
+    for bill, payment_method in zip(Bill.query.order_by(Bill.id), ['cash', 'cash', 'credit_card']):
+        pay(client, bill, payment_method)
+    columns = ('date', 'payment_method', 'bills_count', 'subtotal', 'tax_amount', 'discount', 'total_amount')
+    incremental = rollup(DailySales, *columns)
+
+    rebuild(app)
+
+    assert rollup(DailySales, *columns) == incremental
+
+
+def test_completed_orders_add_their_items_to_item_sales(app, client):
+    menu_items = add_menu(2)
+    add_active_orders(3, menu_items)
+    first, _, cancelled = Order.query.order_by(Order.id).all()
+    first.add_item(OrderItem(menu_item_id=menu_items[1].id, quantity=1, price=11.0))
+    db.session.commit()
+    client.post(f'/orders/{cancelled.id}/cancel')
+    bill_orders(client)
+
+    today = Order.query.first().created_at.date()
+    assert rollup(ItemSales, 'date', 'menu_item_id', 'quantity', 'revenue') == [
+        (today, menu_items[0].id, 4, 40.0),
+        (today, menu_items[1].id, 5, 55.0),
+    ]
+
+    response = client.get('/admin/api/top-items', query_string={
+        'start_date': today.isoformat(), 'end_date': today.isoformat(), 'limit': 1
+    })
+    assert response.get_json()['items'] == [
+        {'menu_item_id': menu_items[1].id, 'name': 'Dish 1', 'quantity': 5, 'revenue': 55.0}
+    ]
+
+    rebuild(app)
+    assert rollup(ItemSales, 'date', 'menu_item_id', 'quantity', 'revenue') == [
+        (today, menu_items[0].id, 4, 40.0),
+        (today, menu_items[1].id, 5, 55.0),
+    ]
+
+
+def test_top_items_ignore_sales_outside_the_range(app, client):
+    add_active_orders(1, add_menu(1))
+    bill_orders(client)
+    yesterday = Order.query.one().created_at.date() - timedelta(days=1)
+
+    response = client.get('/admin/api/top-items', query_string={
+        'start_date': date(2020, 1, 1).isoformat(), 'end_date': yesterday.isoformat()
+    })
+
+    assert response.get_json()['items'] == []
@@ -0,0 +1,51 @@
+import pytest
+from flask import g
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+from app.models.settings import Settings
+from app.utils.session import READ_ONLY_BIND
+from app.utils.sqlite import is_memory_database
+from tests.conftest import InMemoryConfig
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('sqlite://', True),
+    ('sqlite:///:memory:', True),
+    ('sqlite:///file:pos?mode=memory&cache=shared&uri=true', True),
+    ('sqlite:///restaurant_pos.db', False),
+    ('postgresql://pos@localhost/pos', False),
+])
+def test_is_memory_database(url, expected):
+    assert is_memory_database(url) is expected
+
+
+def test_in_memory_database_reads_reports_from_primary(app):
+    db.session.add(Settings(key='restaurant_name', value='Spice Route'))
+    db.session.commit()
+
+    assert READ_ONLY_BIND not in db.engines
+    g.read_only = True
+    assert db.session.get_bind() is db.engine
+    assert db.session.query(Settings.value).filter_by(key='restaurant_name').scalar() == 'Spice Route'
+
+
+def test_file_database_reads_reports_from_read_only_bind(tmp_path):
+    class FileConfig(InMemoryConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "pos.db"}'
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        db.session.add(Settings(key='restaurant_name', value='Spice Route'))
+        db.session.commit()
+
+        g.read_only = True
+        assert db.session.get_bind() is db.engines[READ_ONLY_BIND]
+        assert db.session.query(Settings.value).filter_by(key='restaurant_name').scalar() == 'Spice Route'
+        with pytest.raises(OperationalError, match='readonly'):
+            db.session.execute(db.update(Settings).values(value='Curry House'))
+        db.session.rollback()
+        db.session.remove()
+        db.engine.dispose()
+        db.engines[READ_ONLY_BIND].dispose()
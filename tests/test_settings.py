@@ -0,0 +1,43 @@
+import pytest
+
+from app import db
+from app.models import settings as settings_module
+from app.models.settings import Settings
+from app.utils.session import transaction
+
+
+@pytest.fixture
+def tax_rate(app):
+    with transaction():
+        Settings.set('tax_rate', '5')
+    assert Settings.get('tax_rate') == '5'
+
+
+def test_staged_change_is_cached_only_after_commit(tax_rate):
+    Settings.set('tax_rate', '12')
+
+    assert Settings.get('tax_rate') == '12'
+    assert settings_module._cache['tax_rate'] == '5'
+
+    db.session.commit()
+
+    assert Settings.get('tax_rate') == '12'
+    assert settings_module._cache['tax_rate'] == '12'
+
+
+def test_rolled_back_change_is_never_cached(tax_rate):
+    with pytest.raises(RuntimeError):
+        with transaction():
+            Settings.set_many({'tax_rate': '12', 'restaurant_name': 'Spice Route'})
+            raise RuntimeError('Form handling failed')
+
+    assert Settings.get('tax_rate') == '5'
+    assert Settings.get('restaurant_name') is None
+    assert Settings.query.filter_by(key='tax_rate').one().value == '5'
+
+
+def test_settings_form_commits_and_refreshes_cache(client, tax_rate):
+    response = client.post('/admin/settings/tax-settings', data={'tax_rate': '18'})
+
+    assert response.status_code == 302
+    assert Settings.get('tax_rate') == '18'
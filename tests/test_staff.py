@@ -0,0 +1,97 @@
+from sqlalchemy import event
+
+from app import db
+from app.controllers.staff import place_order
+from app.models.order import Order, OrderStatus, OrderType
+from app.models.table import Table
+from app.utils.session import transaction
+from tests.test_orders import add_menu
+
+
+def items_of(menu_items):
+    return [{'menu_item_id': item.id, 'quantity': 1, 'is_half': False, 'price': item.full_price, 'notes': ''}
+            for item in menu_items]
+
+
+def test_create_order_adds_to_the_tables_active_order(client):
+    menu_items = add_menu()
+    table = Table(name='T1')
+    db.session.add(table)
+    db.session.commit()
+
+    for menu_item in menu_items:
+        response = client.post('/staff/orders/create', json={
+            'table_id': table.id,
+            'items': [{'menu_item_id': menu_item.id, 'quantity': 2}]
+        })
+        assert response.status_code == 200
+
+    order = Order.query.one()
+    assert order.items_count == 3
+    assert table.is_occupied
+
+
+def test_place_order_joins_an_order_opened_concurrently(app):
+    menu_items = add_menu()
+    table = Table(name='T1')
+    db.session.add(table)
+    db.session.commit()
+    rival = []
+
+    def another_worker_opens_order(state):
+        # Let the lookup find nothing, then open the order before place_order inserts its own
+        if state.is_select and not rival and Order in [mapper.class_ for mapper in state.all_mappers]:
+            result = state.invoke_statement()
+            rival.append(state.session.connection().execute(db.insert(Order).values(
+                table_id=table.id, user_id=1, status=OrderStatus.ACTIVE, order_type=OrderType.DINE_IN
+            )).inserted_primary_key[0])
+            return result
+
+    event.listen(db.session, 'do_orm_execute', another_worker_opens_order)
+    try:
+        with transaction():
+            order_id = place_order(table.id, 1, items_of(menu_items))
+    finally:
+        event.remove(db.session, 'do_orm_execute', another_worker_opens_order)
+
+    assert order_id == rival[0]
+    order = Order.query.one()
+    assert order.items.count() == 3
+    assert order.items_count == 3
+
+
+def test_is_half_is_coerced_to_a_bool(client):
+    menu_item = add_menu(1)[0]
+    menu_item.half_price = 6.0
+    table = Table(name='T1')
+    db.session.add(table)
+    db.session.commit()
+
+    response = client.post('/staff/orders/create', json={'table_id': table.id, 'items': [
+        {'menu_item_id': menu_item.id, 'is_half': 'no'},
+        {'menu_item_id': menu_item.id, 'is_half': 'Yes'},
+        {'menu_item_id': menu_item.id, 'is_half': 0},
+    ]})
+    order = db.session.get(Order, response.get_json()['order_id'])
+    response = client.post(f'/staff/orders/{order.id}/add_item',
+                           json={'menu_item_id': menu_item.id, 'is_half': 'false'})
+    assert response.status_code == 200
+
+    assert [(item.is_half, item.price) for item in order.items.order_by('id')] == [
+        (False, 10.0), (True, 6.0), (False, 10.0), (False, 10.0)
+    ]
+
+
+def test_unknown_is_half_value_is_rejected(client):
+    menu_item = add_menu(1)[0]
+    table = Table(name='T1')
+    db.session.add(table)
+    db.session.commit()
+
+    response = client.post('/staff/orders/create', json={'table_id': table.id, 'items': [
+        {'menu_item_id': menu_item.id, 'is_half': 'maybe'}
+    ]})
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid is_half: maybe'
+    assert Order.query.count() == 0
@@ -0,0 +1,76 @@
+import pytest
+
+from app import db
+from app.models.delivery import DeliveryOrder, DeliveryPlatform, DeliveryStatus
+from app.models.outbox import OutboxState, StatusUpdate
+from app.models.settings import Settings
+from app.services.platform_client import platform_clients
+from app.services.status_sync import queue_status_update, status_dispatcher
+from benchmarks.stub_platform import StubPlatform
+
+
+@pytest.fixture
+def stub(app):
+    with StubPlatform() as stub:
+        app.config['ZOMATO_API_URL'] = stub.url
+        platform_clients.init_app(app)
+        yield stub
+        platform_clients.close()
+
+
+@pytest.fixture
+def delivery_order(app):
+    Settings.set_many({'zomato_enabled': 'true', 'zomato_api_key': 'key'})
+    delivery_order = DeliveryOrder(platform=DeliveryPlatform.ZOMATO, platform_order_id='Z1',
+                                   customer_name='Asha', customer_phone='9000000001',
+                                   customer_address='12 MG Road')
+    db.session.add(delivery_order)
+    db.session.commit()
+    return delivery_order
+
+
+def change_status(delivery_order, status):
+    delivery_order.update_status(status)
+    update = queue_status_update(delivery_order)
+    db.session.commit()
+    return update
+
+
+def states():
+    db.session.expire_all()
+    return [(update.status, update.state) for update in StatusUpdate.query.order_by(StatusUpdate.id)]
+
+
+def test_unmapped_status_is_not_queued(delivery_order):
+    assert change_status(delivery_order, DeliveryStatus.PENDING) is None
+    assert StatusUpdate.query.count() == 0
+
+
+def test_disabled_integration_queues_nothing(delivery_order):
+    Settings.set('zomato_enabled', 'false')
+
+    assert change_status(delivery_order, DeliveryStatus.ACCEPTED) is None
+
+
+def test_newer_status_supersedes_pending_one(stub, delivery_order):
+    change_status(delivery_order, DeliveryStatus.ACCEPTED)
+    change_status(delivery_order, DeliveryStatus.PREPARING)
+
+    assert status_dispatcher.dispatch() == 1
+
+    assert states() == [(DeliveryStatus.ACCEPTED, OutboxState.SUPERSEDED),
+                        (DeliveryStatus.PREPARING, OutboxState.SENT)]
+    assert stub.statuses == [('Z1', 'preparing')]
+
+
+def test_client_error_becomes_dead_letter_until_retried(stub, delivery_order):
+    change_status(delivery_order, DeliveryStatus.READY)
+    stub.fail(1, status=400)
+
+    status_dispatcher.dispatch()
+    assert states() == [(DeliveryStatus.READY, OutboxState.FAILED)]
+
+    assert status_dispatcher.retry() == 1
+    status_dispatcher.dispatch()
+    assert states() == [(DeliveryStatus.READY, OutboxState.SENT)]
+    assert stub.statuses == [('Z1', 'ready')]
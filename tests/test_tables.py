@@ -0,0 +1,27 @@
+from app import db
+from app.models.order import Order, OrderStatus
+from app.models.table import Table
+from tests.test_orders import add_active_orders, add_menu
+
+
+def test_all_with_active_orders_can_be_called_again_in_a_session(app):
+    db.session.add(Table(name='Patio'))
+    add_active_orders(2, add_menu())
+
+    first = Table.all_with_active_orders()
+    assert [table.status for table in first] == ['Available', 'Occupied - Order #1', 'Occupied - Order #2']
+
+    db.session.get(Order, 1).status = OrderStatus.COMPLETED
+    db.session.flush()
+    second = Table.all_with_active_orders()
+
+    assert [table.name for table in second] == ['Patio', 'T2', 'T3']
+    assert [table.status for table in second] == ['Available', 'Occupied', 'Occupied - Order #2']
+
+
+def test_all_with_active_orders_renders_without_queries(app, count_queries):
+    add_active_orders(3, add_menu())
+
+    tables = Table.all_with_active_orders()
+
+    assert count_queries(lambda: [table.status for table in tables]) == 0
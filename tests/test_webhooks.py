@@ -0,0 +1,76 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from app import db
+from app.models.delivery import DeliveryOrder
+from app.models.settings import Settings
+from app.models.webhook import WebhookEvent, WebhookStatus
+from app.services.webhooks import webhook_processor
+from app.utils.delivery_data import get_adapter
+from tests.test_delivery_data import ZOMATO_ORDER
+
+SECRET = 'webhook-secret'
+
+
+@pytest.fixture
+def zomato(app, monkeypatch):
+    """Accept signed Zomato webhooks and process each one as soon as it is queued."""
+    Settings.set('zomato_webhook_secret', SECRET)
+    monkeypatch.setattr(webhook_processor, 'submit', webhook_processor._run)
+
+
+def post_webhook(client, order, signature=None):
+    body = json.dumps(order).encode()
+    signature = signature or hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return client.post('/delivery/webhook/zomato', data=body, content_type='application/json',
+                       headers={get_adapter('zomato').signature_header: signature})
+
+
+def events():
+    db.session.expire_all()
+    return [(event.status, event.delivery_order_id) for event in WebhookEvent.query.order_by(WebhookEvent.id)]
+
+
+def test_duplicate_webhook_stores_the_order_once(zomato, client):
+    first = post_webhook(client, ZOMATO_ORDER)
+    second = post_webhook(client, ZOMATO_ORDER)
+
+    assert (first.status_code, second.status_code) == (202, 202)
+    assert first.get_json()['event_id'] != second.get_json()['event_id']
+    delivery_order = DeliveryOrder.query.one()
+    assert (delivery_order.platform_order_id, delivery_order.customer_name) == ('Z100', 'Asha')
+    assert events() == [(WebhookStatus.PROCESSED, delivery_order.id)] * 2
+
+
+def test_badly_signed_webhook_is_not_queued(zomato, client):
+    response = post_webhook(client, ZOMATO_ORDER, signature='0' * 64)
+
+    assert response.status_code == 401
+    assert WebhookEvent.query.count() == 0
+
+
+def test_invalid_order_fails_without_retries(zomato, client):
+    response = post_webhook(client, {'customer': {'name': 'Asha'}})
+
+    assert response.status_code == 202
+    assert events() == [(WebhookStatus.FAILED, None)]
+    assert DeliveryOrder.query.count() == 0
+
+
+def test_processing_error_is_retried(zomato, client, monkeypatch):
+    def fail(platform, data):
+        raise RuntimeError('Database is locked')
+
+    handler = webhook_processor._handler
+    monkeypatch.setattr(webhook_processor, '_handler', fail)
+    post_webhook(client, ZOMATO_ORDER)
+    assert events() == [(WebhookStatus.PENDING, None)]
+
+    monkeypatch.setattr(webhook_processor, '_handler', handler)
+    webhook_processor._run(WebhookEvent.query.one().id)
+
+    assert events() == [(WebhookStatus.PROCESSED, DeliveryOrder.query.one().id)]
+    assert WebhookEvent.query.one().attempts == 2
@@ -0,0 +1,34 @@
+from concurrent.futures import TimeoutError
+import threading
+
+import pytest
+
+from app.services.writer import WriteQueue
+
+
+@pytest.fixture
+def queue(app):
+    app.config.update(WRITE_QUEUE_ENABLED=True, WRITE_QUEUE_TIMEOUT=0.2)
+    return WriteQueue(app)
+
+
+def test_job_that_has_not_started_is_cancelled_on_timeout(queue):
+    release = threading.Event()
+    ran = []
+
+    blocker = queue.submit(release.wait)
+    with pytest.raises(TimeoutError):
+        queue.run(ran.append, 'late write')
+
+    release.set()
+    blocker.result(timeout=5)
+    assert queue.run(len, 'ok') == 2  # The writer is still serving jobs
+    assert ran == []
+
+
+def test_job_already_running_is_waited_for(queue):
+    def slow_write():
+        threading.Event().wait(0.4)
+        return 'committed'
+
+    assert queue.run(slow_write) == 'committed'